@@ -0,0 +1,115 @@
+"""
+Speed/accuracy frontier of the Pulser emulator configurations on the analog backends.
+
+Each configuration is compared against a reference run with tight solver tolerances and
+full sampling. The reported infidelity is `1 - |<ref|psi>|^2` on the final state.
+
+Run it with:
+
+    python benchmarks/emulator_frontier.py
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import numpy as np
+from qadence2_ir.types import (
+    Alloc,
+    AllocQubits,
+    Assign,
+    Call,
+    Load,
+    Model,
+    QuInstruct,
+    Support,
+)
+
+from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+from qadence2_platforms.compiler import compile_to_backend
+
+REPEATS = 3
+
+REFERENCE = EmulatorConfig(atol=1e-10, rtol=1e-8)
+
+CONFIGS: dict[str, EmulatorConfig] = {
+    "full-trajectory": EmulatorConfig(evaluation_times="Full"),
+    "final-state": EmulatorConfig(),
+    "no-modulation": EmulatorConfig(evaluation_times="Minimal", with_modulation=False),
+    "loose-tol": EmulatorConfig(evaluation_times="Minimal", atol=1e-5, rtol=1e-3),
+    "rate-0.5": EmulatorConfig(evaluation_times="Minimal", sampling_rate=0.5),
+    "rate-0.2": EmulatorConfig(evaluation_times="Minimal", sampling_rate=0.2),
+    "rate-0.2-loose": EmulatorConfig(
+        evaluation_times="Minimal", sampling_rate=0.2, atol=1e-5, rtol=1e-3
+    ),
+}
+
+
+def rotations_model(num_qubits: int) -> Model:
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits),
+        inputs={"x": Alloc(size=1, trainable=False)},
+        instructions=[
+            Assign("%0", Call("mul", 1.57, Load("x"))),
+            Assign("%1", Call("sin", Load("%0"))),
+            QuInstruct("rx", Support.target_all(), Load("%1")),
+            QuInstruct("ry", Support.target_all(), Load("%0")),
+            QuInstruct("rx", Support.target_all(), Load("%1")),
+        ],
+        directives={},
+    )
+
+
+def dyn_pulse_model(num_qubits: int) -> Model:
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits),
+        inputs={
+            "t": Alloc(size=1, trainable=False),
+            "omega": Alloc(size=1, trainable=False),
+            "delta": Alloc(size=1, trainable=False),
+        },
+        instructions=[
+            QuInstruct(
+                "dyn_pulse", Support.target_all(), Load("t"), Load("omega"), Load("delta"), 0.0
+            ),
+        ],
+        directives={},
+    )
+
+
+SEQUENCES: dict[str, tuple[Model, dict[str, Any]]] = {
+    "rotations-3q": (rotations_model(3), {"x": 0.7}),
+    "dyn-pulse-4q": (dyn_pulse_model(4), {"t": 1.0, "omega": 0.5, "delta": 0.2}),
+}
+
+
+def _timed_run(interface: Any, values: dict[str, Any], config: EmulatorConfig) -> tuple[float, Any]:
+    best = float("inf")
+    state = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        state = interface.run(values=values, emulator_config=config)
+        best = min(best, time.perf_counter() - start)
+    return best, state
+
+
+def main() -> None:
+    print(f"{'sequence':<16}{'config':<18}{'time [ms]':>12}{'speedup':>10}{'infidelity':>14}")
+    for seq_name, (model, values) in SEQUENCES.items():
+        interface = compile_to_backend(model, "analog")
+        ref_time, ref_state = _timed_run(interface, values, REFERENCE)
+        ref = ref_state.full().ravel()
+
+        for cfg_name, config in CONFIGS.items():
+            elapsed, state = _timed_run(interface, values, config)
+            psi = state.full().ravel()
+            infidelity = 1.0 - abs(np.vdot(ref, psi)) ** 2
+            print(
+                f"{seq_name:<16}{cfg_name:<18}{elapsed * 1e3:>12.2f}"
+                f"{ref_time / elapsed:>10.2f}{infidelity:>14.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
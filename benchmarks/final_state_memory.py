@@ -0,0 +1,79 @@
+"""
+Peak memory of the analog backends when storing the full trajectory versus the final
+state only, and when streaming observables through a callback.
+
+Run it with:
+
+    python benchmarks/final_state_memory.py [num_qubits]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from qadence2_expressions import Z
+from qadence2_ir.types import Alloc, AllocQubits, Load, Model, QuInstruct, Support
+
+from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+from qadence2_platforms.compiler import compile_to_backend
+
+
+def long_pulse_model(num_qubits: int) -> Model:
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits, grid_scale=1.5),
+        inputs={
+            "t": Alloc(size=1, trainable=False),
+            "omega": Alloc(size=1, trainable=False),
+            "delta": Alloc(size=1, trainable=False),
+        },
+        instructions=[
+            QuInstruct(
+                "dyn_pulse",
+                Support.target_all(),
+                Load("t"),
+                Load("omega"),
+                Load("delta"),
+                0.0,
+            ),
+        ],
+        directives={},
+    )
+
+
+def measure(fn: Callable[[], Any]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main(num_qubits: int = 10) -> None:
+    interface = compile_to_backend(long_pulse_model(num_qubits), "analog")
+    values = {"t": 2.0, "omega": 0.5, "delta": 0.2}
+    obs = sum(Z(i) for i in range(1, num_qubits)) + Z(0)
+
+    cases: dict[str, Callable[[], Any]] = {
+        "full trajectory": lambda: interface.run(
+            values, emulator_config=EmulatorConfig(evaluation_times="Full")
+        ),
+        "final state": lambda: interface.run(values),
+        "streamed callback": lambda: interface.run(
+            values, observable=obs, callback=lambda t, vals: None
+        ),
+    }
+
+    print(f"{num_qubits} qubits")
+    print(f"{'mode':<20}{'time [s]':>10}{'peak [MiB]':>12}")
+    for name, fn in cases.items():
+        elapsed, peak = measure(fn)
+        print(f"{name:<20}{elapsed:>10.2f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
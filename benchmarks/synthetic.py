@@ -0,0 +1,76 @@
+# synthetic models and parameter grids shared by the benchmarks
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from qadence2_ir.types import Model
+
+from qadence2_platforms.utils.model_generator import feature_map, random_inputs
+
+SEED = 0
+NUM_FEATURES = 2
+
+# backends with a `compile_to_backend` function
+BACKENDS = ("pyqtorch", "fresnel1", "analog")
+ANALOG_BACKENDS = ("fresnel1", "analog")
+
+# problem sizes, kept small for the analog backends since they emulate pulses in time
+DIGITAL_QUBITS = (2, 6, 10)
+ANALOG_QUBITS = (2, 4)
+DEPTHS = (1, 4)
+NUM_ASSIGNS = (1, 8)
+NUM_TERMS = (1, 8)
+
+N_SHOTS = 1000
+
+
+def model_for(backend: str, num_qubits: int, depth: int, num_assigns: int) -> Model:
+    """
+    Feature map with `depth` layers, each angle being computed by a chain of
+    `num_assigns` assignments. The analog backends get its global rotations version.
+    """
+
+    return feature_map(
+        num_qubits,
+        NUM_FEATURES,
+        depth=depth,
+        chain_length=num_assigns,
+        seed=SEED,
+        analog=backend in ANALOG_BACKENDS,
+    )
+
+
+def values_for(backend: str, model: Model) -> dict[str, Any]:
+    values = random_inputs(model, seed=SEED)
+    if backend in ANALOG_BACKENDS:
+        return values
+
+    import torch
+
+    return {name: torch.tensor([value]) for name, value in values.items()}
+
+
+def observable(num_qubits: int, num_terms: int) -> list[Any]:
+    """
+    List of `num_terms` neighbouring `ZZ` terms, cycling around the register. A list of
+    products is the observable form parsed by every built-in backend.
+    """
+
+    from qadence2_expressions import Z
+
+    pairs = max(num_qubits - 1, 1)
+    return [Z(k % pairs) * Z(k % pairs + 1) for k in range(num_terms)]
+
+
+def size_params(backend: str) -> list[tuple[int, int, int]]:
+    qubits = ANALOG_QUBITS if backend in ANALOG_BACKENDS else DIGITAL_QUBITS
+    return [(n, d, a) for n in qubits for d in DEPTHS for a in NUM_ASSIGNS]
+
+
+def backend_size_params() -> list[Any]:
+    return [
+        pytest.param(backend, *size, id=f"{backend}-q{size[0]}-d{size[1]}-a{size[2]}")
+        for backend in BACKENDS
+        for size in size_params(backend)
+    ]
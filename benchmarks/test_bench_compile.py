@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+import pytest
+from pulser.sequence.sequence import Sequence
+from synthetic import (
+    ANALOG_BACKENDS,
+    DEPTHS,
+    DIGITAL_QUBITS,
+    NUM_ASSIGNS,
+    SEED,
+    backend_size_params,
+    model_for,
+    size_params,
+)
+
+from qadence2_platforms.backends._base_analog.sequence import (
+    clear_detuning_maps,
+    detuning_map,
+    from_instructions,
+)
+from qadence2_platforms.backends.instructions import InstructionTable
+from qadence2_platforms.backends.pyqtorch.compiler import Compiler
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import local_shift_schedule, piecewise_schedule
+
+
+@pytest.mark.benchmark(group="compile_to_backend")
+@pytest.mark.parametrize("backend, num_qubits, depth, num_assigns", backend_size_params())
+def test_compile_to_backend(
+    benchmark: Any, backend: str, num_qubits: int, depth: int, num_assigns: int
+) -> None:
+    model = model_for(backend, num_qubits, depth, num_assigns)
+    benchmark(compile_to_backend, model, backend)
+
+
+@pytest.mark.benchmark(group="pyqtorch-compiler")
+@pytest.mark.parametrize("num_qubits, depth, num_assigns", size_params("pyqtorch"))
+def test_pyq_compiler(benchmark: Any, num_qubits: int, depth: int, num_assigns: int) -> None:
+    model = model_for("pyqtorch", num_qubits, depth, num_assigns)
+    benchmark(Compiler().compile, model)
+
+
+@pytest.mark.benchmark(group="instruction-table")
+@pytest.mark.parametrize("lowered", [False, True], ids=["instructions", "table"])
+def test_pyq_compiler_table(benchmark: Any, lowered: bool) -> None:
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), max(DEPTHS), max(NUM_ASSIGNS))
+    table = InstructionTable.from_model(model) if lowered else None
+    benchmark(Compiler().compile, model, table=table)
+
+
+@pytest.mark.benchmark(group="instruction-table")
+def test_lower_instructions(benchmark: Any) -> None:
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), max(DEPTHS), max(NUM_ASSIGNS))
+    # a model with tens of thousands of instructions
+    instructions = model.instructions * 100
+    benchmark(InstructionTable, instructions)
+
+
+@pytest.mark.benchmark(group="from_instructions")
+@pytest.mark.parametrize(
+    "backend, num_qubits, depth, num_assigns",
+    [p for p in backend_size_params() if p.values[0] in ANALOG_BACKENDS],
+)
+def test_from_instructions(
+    benchmark: Any, backend: str, num_qubits: int, depth: int, num_assigns: int
+) -> None:
+    model = model_for(backend, num_qubits, depth, num_assigns)
+    register = import_module(f"qadence2_platforms.backends.{backend}.register").from_model(model)
+    device = (
+        import_module(f"qadence2_platforms.backends.{backend}.sequence")
+        .from_model(model, register)
+        .device
+    )
+
+    def build() -> list:
+        # `from_instructions` declares variables, so it needs a fresh sequence
+        seq = Sequence(register, device)
+        seq.declare_channel("global", "rydberg_global")
+        return from_instructions(seq, model.inputs, model.instructions)
+
+    benchmark(build)
+
+
+@pytest.mark.benchmark(group="compile-schedules")
+@pytest.mark.parametrize("num_pulses", [1, 16])
+def test_compile_local_shift_schedule(benchmark: Any, num_pulses: int) -> None:
+    model = local_shift_schedule(4, num_pulses, seed=SEED)
+    benchmark(compile_to_backend, model, "fresnel1")
+
+
+@pytest.mark.benchmark(group="compile-schedules")
+@pytest.mark.parametrize("num_segments", [1, 16])
+def test_compile_piecewise_schedule(benchmark: Any, num_segments: int) -> None:
+    model = piecewise_schedule(4, num_segments, num_pulses=4, seed=SEED)
+    benchmark(compile_to_backend, model, "analog")
+
+
+@pytest.mark.benchmark(group="compile-incremental")
+@pytest.mark.parametrize("incremental", [False, True], ids=["full", "incremental"])
+def test_compile_directives_change(benchmark: Any, incremental: bool) -> None:
+    from qadence2_platforms.backends.fresnel1.compiler import Compiler
+
+    model = local_shift_schedule(4, 16, seed=SEED)
+    shifts = model.directives["local_shifts"]
+    compiler = Compiler()
+    compiler.compile(model)
+
+    def recompile() -> Any:
+        # new directives at each call, as when tuning them interactively
+        model.directives["local_shifts"] = [shift * 1.01 for shift in shifts]
+        return (compiler if incremental else Compiler()).compile(model)
+
+    benchmark(recompile)
+
+
+@pytest.mark.benchmark(group="detuning-map")
+@pytest.mark.parametrize("cached", [False, True], ids=["uncached", "cached"])
+def test_detuning_map_sweep(benchmark: Any, cached: bool) -> None:
+    from qadence2_platforms.backends.fresnel1.register import from_model
+
+    register = from_model(local_shift_schedule(8, 1, seed=SEED))
+    targets = list(register.qubit_ids)
+    # a sweep over a few local-shift patterns, repeated as in a parameter scan
+    patterns = [[(i + j) % 4 + 1.0 for j in range(len(targets))] for i in range(4)]
+
+    def sweep() -> None:
+        if not cached:
+            clear_detuning_maps()
+        for shifts in patterns:
+            detuning_map(register, targets, shifts)
+
+    benchmark(sweep)
+
+
+@pytest.mark.benchmark(group="register-batch")
+@pytest.mark.parametrize("batched", [False, True], ids=["per-register", "batched"])
+def test_register_candidates(benchmark: Any, batched: bool) -> None:
+    import numpy as np
+    from pulser import AnalogDevice
+
+    from qadence2_platforms.backends._base_analog.register import RegisterTransform
+    from qadence2_platforms.backends.analog.device_settings import AnalogSettings
+
+    # candidates of a layout search: random positions of 8 atoms on a triangular grid
+    candidates = np.random.default_rng(SEED).integers(-4, 5, size=(10_000, 8, 2))
+
+    def generate() -> np.ndarray:
+        if batched:
+            coords = RegisterTransform.transform(candidates, "triangular")
+            return RegisterTransform.check_min_distance(coords, AnalogDevice)
+        valid = []
+        for positions in candidates.tolist():
+            coords = RegisterTransform(AnalogSettings, "triangular", coords=positions).coords
+            deltas = coords[:, np.newaxis] - coords[np.newaxis]
+            distances = np.sqrt((deltas**2).sum(-1))[np.triu_indices(len(coords), k=1)]
+            valid.append(distances.min() >= AnalogDevice.min_atom_distance)
+        return np.array(valid)
+
+    benchmark(generate)
+
+
+@pytest.mark.benchmark(group="register-validation")
+@pytest.mark.parametrize("batched", [False, True], ids=["pulser", "batched"])
+def test_register_validation(benchmark: Any, batched: bool) -> None:
+    import numpy as np
+    from pulser import AnalogDevice, Register
+
+    from qadence2_platforms.backends._base_analog.register import RegisterTransform
+    from qadence2_platforms.backends.analog.device_settings import AnalogSettings
+
+    positions = np.random.default_rng(SEED).integers(-4, 5, size=(2_000, 8, 2))
+    coords = RegisterTransform.transform(positions, "triangular")
+
+    def validate() -> np.ndarray:
+        if batched:
+            return AnalogSettings.validate_registers(coords).valid
+        valid = []
+        for register in coords:
+            try:
+                AnalogDevice.validate_register(Register.from_coordinates(register))
+            except ValueError:
+                valid.append(False)
+            else:
+                valid.append(True)
+        return np.array(valid)
+
+    benchmark(validate)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from synthetic import model_for, size_params, values_for
+
+from qadence2_platforms.backends.pyqtorch.embedding import Embedding
+
+
+@pytest.mark.benchmark(group="pyqtorch-embedding")
+@pytest.mark.parametrize("num_qubits, depth, num_assigns", size_params("pyqtorch"))
+def test_embedding_call(benchmark: Any, num_qubits: int, depth: int, num_assigns: int) -> None:
+    model = model_for("pyqtorch", num_qubits, depth, num_assigns)
+    benchmark(Embedding(model), values_for("pyqtorch", model))
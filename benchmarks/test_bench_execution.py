@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from synthetic import (
+    BACKENDS,
+    DEPTHS,
+    DIGITAL_QUBITS,
+    N_SHOTS,
+    NUM_ASSIGNS,
+    NUM_TERMS,
+    SEED,
+    backend_size_params,
+    model_for,
+    observable,
+    values_for,
+)
+
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.sampling import DEFAULT_CACHE_SIZE, DistributionCache
+
+
+def _observable_params() -> list[Any]:
+    # the number of terms only matters for the largest models of each backend
+    params = []
+    for backend in BACKENDS:
+        largest = [p for p in backend_size_params() if p.values[0] == backend][-1]
+        _, num_qubits, depth, num_assigns = largest.values
+        for num_terms in NUM_TERMS:
+            params.append(
+                pytest.param(
+                    backend,
+                    num_qubits,
+                    depth,
+                    num_assigns,
+                    num_terms,
+                    id=f"{largest.id}-t{num_terms}",
+                )
+            )
+    return params
+
+
+@pytest.mark.benchmark(group="run")
+@pytest.mark.parametrize("backend, num_qubits, depth, num_assigns", backend_size_params())
+def test_run(benchmark: Any, backend: str, num_qubits: int, depth: int, num_assigns: int) -> None:
+    model = model_for(backend, num_qubits, depth, num_assigns)
+    interface = compile_to_backend(model, backend)
+    benchmark(interface.run, values=values_for(backend, model))
+
+
+@pytest.mark.benchmark(group="sample")
+@pytest.mark.parametrize("backend, num_qubits, depth, num_assigns", backend_size_params())
+def test_sample(
+    benchmark: Any, backend: str, num_qubits: int, depth: int, num_assigns: int
+) -> None:
+    model = model_for(backend, num_qubits, depth, num_assigns)
+    interface = compile_to_backend(model, backend)
+    benchmark(interface.sample, values=values_for(backend, model), shots=N_SHOTS)
+
+
+@pytest.mark.benchmark(group="expectation")
+@pytest.mark.parametrize("backend, num_qubits, depth, num_assigns, num_terms", _observable_params())
+def test_expectation(
+    benchmark: Any,
+    backend: str,
+    num_qubits: int,
+    depth: int,
+    num_assigns: int,
+    num_terms: int,
+) -> None:
+    model = model_for(backend, num_qubits, depth, num_assigns)
+    interface = compile_to_backend(model, backend)
+    obs = observable(num_qubits, num_terms)
+    benchmark(interface.expectation, values=values_for(backend, model), observable=obs)
+
+
+@pytest.mark.benchmark(group="pyqtorch-precision")
+@pytest.mark.parametrize("precision", ["double", "single"])
+@pytest.mark.parametrize("batch_size", [1, 256])
+def test_pyq_precision(benchmark: Any, precision: str, batch_size: int) -> None:
+    import torch
+
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), max(DEPTHS), max(NUM_ASSIGNS))
+    interface = compile_to_backend(model, "pyqtorch", precision=precision)
+    values = {name: torch.rand(batch_size) for name in model.inputs}
+    benchmark(interface.run, values=values)
+
+
+@pytest.mark.benchmark(group="pyqtorch-binding")
+@pytest.mark.parametrize("binding", [False, True], ids=["dict", "binding"])
+def test_pyq_input_binding(benchmark: Any, binding: bool) -> None:
+    import torch
+    from qadence2_expressions import Z
+
+    model = model_for("pyqtorch", min(DIGITAL_QUBITS), min(DEPTHS), max(NUM_ASSIGNS))
+    interface = compile_to_backend(model, "pyqtorch")
+    values = {name: torch.rand(1, dtype=torch.float32) for name in model.inputs}
+    if binding:
+        bound = interface.bind(values, observable=Z(0))
+        benchmark(lambda: interface.expectation(bound.update(values)))
+    else:
+        benchmark(interface.expectation, values=values, observable=Z(0))
+
+
+@pytest.mark.benchmark(group="pyqtorch-export")
+@pytest.mark.parametrize("method", ["interface", "eager", "trace", "export", "compile"])
+def test_pyq_export(benchmark: Any, method: str) -> None:
+    import torch
+    from qadence2_expressions import Z
+
+    from qadence2_platforms.backends.pyqtorch.export import export
+
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), min(DEPTHS), max(NUM_ASSIGNS))
+    interface = compile_to_backend(model, "pyqtorch")
+    values = {name: torch.rand(8) for name in model.inputs}
+    with torch.no_grad():
+        if method == "interface":
+            benchmark(interface.expectation, values=values, observable=Z(0))
+            return
+
+        module = export(interface, Z(0), None if method == "eager" else method, batch_size=8)
+        module = module.module() if method == "export" else module
+        inputs = tuple(values[name] for name in model.inputs)
+        # the first call of a compiled module compiles it
+        module(*inputs)
+        benchmark(module, *inputs)
+
+
+@pytest.mark.benchmark(group="pyqtorch-thread-pool")
+@pytest.mark.parametrize("num_workers", [1, 2, 4])
+def test_pyq_thread_pool(benchmark: Any, num_workers: int) -> None:
+    import torch
+    from qadence2_expressions import Z
+
+    from qadence2_platforms.abstracts import RunEnum
+    from qadence2_platforms.executor import ThreadPoolRunner
+
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), min(DEPTHS), min(NUM_ASSIGNS))
+    interface = compile_to_backend(model, "pyqtorch")
+    values = [{name: torch.rand(16) for name in model.inputs} for _ in range(16)]
+    with torch.no_grad(), ThreadPoolRunner(num_workers=num_workers) as runner:
+        benchmark(runner.map, interface, RunEnum.EXPECTATION, values, observable=Z(0))
+
+
+@pytest.mark.benchmark(group="pyqtorch-streaming-sample")
+@pytest.mark.parametrize("streaming", [False, True], ids=["sample", "streaming"])
+def test_pyq_streaming_sample(benchmark: Any, streaming: bool) -> None:
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), min(DEPTHS), min(NUM_ASSIGNS))
+    interface = compile_to_backend(model, "pyqtorch")
+    values = values_for("pyqtorch", model)
+    shots = 1000 * N_SHOTS
+    if streaming:
+        benchmark(lambda: interface.sampler(values).sample(shots, chunk_size=N_SHOTS * 100))
+    else:
+        benchmark(interface.sample, values=values, shots=shots)
+
+
+@pytest.mark.benchmark(group="pyqtorch-cached-sample")
+@pytest.mark.parametrize("maxsize", [0, DEFAULT_CACHE_SIZE], ids=["uncached", "cached"])
+def test_pyq_cached_sample(benchmark: Any, maxsize: int) -> None:
+    model = model_for("pyqtorch", max(DIGITAL_QUBITS), max(DEPTHS), max(NUM_ASSIGNS))
+    interface = compile_to_backend(model, "pyqtorch")
+    interface.distribution_cache = DistributionCache(maxsize)
+    values = values_for("pyqtorch", model)
+    benchmark(interface.sample, values=values, shots=N_SHOTS)
+
+
+@pytest.mark.benchmark(group="analog-blockade-subspace")
+@pytest.mark.parametrize("num_qubits", [8, 12])
+@pytest.mark.parametrize("blockade_subspace", [False, True], ids=["full", "blockade"])
+def test_blockade_subspace(benchmark: Any, num_qubits: int, blockade_subspace: bool) -> None:
+    from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+    from qadence2_platforms.utils.model_generator import piecewise_schedule, random_inputs
+
+    # a chain of atoms 5 µm apart, blockading their neighbours
+    model = piecewise_schedule(num_qubits, 2, seed=SEED)
+    interface = compile_to_backend(model, "analog")
+    values = random_inputs(model, seed=SEED)
+    config = EmulatorConfig(blockade_subspace=blockade_subspace)
+    # the subspace enumeration is done once per interface, and not measured
+    interface.subspace_hamiltonian()
+
+    def sample() -> Any:
+        interface.distribution_cache.clear()
+        return interface.sample(values, shots=N_SHOTS, emulator_config=config)
+
+    benchmark(sample)
+
+
+@pytest.mark.benchmark(group="analog-native-engine")
+@pytest.mark.parametrize("num_qubits", [6, 10])
+@pytest.mark.parametrize("with_modulation", [True, False], ids=["modulated", "programmed"])
+@pytest.mark.parametrize("engine", ["qutip", "native"])
+def test_native_engine(benchmark: Any, num_qubits: int, with_modulation: bool, engine: str) -> None:
+    from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+    from qadence2_platforms.utils.model_generator import piecewise_schedule, random_inputs
+
+    model = piecewise_schedule(num_qubits, 2, seed=SEED)
+    interface = compile_to_backend(model, "analog")
+    values = random_inputs(model, seed=SEED)
+    config = EmulatorConfig(with_modulation=with_modulation, engine=engine)  # type: ignore
+    interface.full_hamiltonian
+
+    def sample() -> Any:
+        interface.distribution_cache.clear()
+        return interface.sample(values, shots=N_SHOTS, emulator_config=config)
+
+    benchmark(sample)
+
+
+@pytest.mark.benchmark(group="analog-propagator-cache")
+@pytest.mark.parametrize(
+    "engine, cache_propagators",
+    [("qutip", False), ("native", False), ("native", True)],
+    ids=["qutip", "native", "native-cached"],
+)
+def test_propagator_cache(benchmark: Any, engine: str, cache_propagators: bool) -> None:
+    import numpy as np
+    from qadence2_ir.types import Alloc, AllocQubits, Load, Model, QuInstruct, Support
+
+    from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+
+    # layers of gate-like pulses, repeating the same constant segments
+    model = Model(
+        register=AllocQubits(num_qubits=8),
+        inputs={"x": Alloc(size=1, trainable=False)},
+        instructions=[
+            QuInstruct(name, Support.target_all(), Load("x"))
+            for _ in range(4)
+            for name in ("rx", "ry")
+        ],
+        directives={},
+    )
+    interface = compile_to_backend(model, "analog")
+    values = {"x": np.array([1.2])}
+    config = EmulatorConfig(
+        with_modulation=False, engine=engine, cache_propagators=cache_propagators  # type: ignore
+    )
+    interface.full_hamiltonian
+    interface.propagator_cache.clear()
+
+    benchmark(interface.run, values, emulator_config=config)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from .abstracts import AbstractInterface, OnEnum
+from .abstracts import AbstractInterface, OnEnum, OutputEnum
 
 PACKAGE_NAME = __name__
 BACKEND_FOLDER_NAME = "backends"
@@ -11,4 +11,10 @@ TEMPLATES_FOLDER_NAME = "templates"
 BASE_BACKEND_MODULE = f"{PACKAGE_NAME}.{BACKEND_FOLDER_NAME}"
 USER_BACKEND_MODULE = f"{PACKAGE_NAME}.{USER_BACKENDS_FOLDER_NAME}"
 
-__all__ = ["AbstractInterface", "OnEnum", "BASE_BACKEND_MODULE", "USER_BACKEND_MODULE"]
+__all__ = [
+    "AbstractInterface",
+    "OnEnum",
+    "OutputEnum",
+    "BASE_BACKEND_MODULE",
+    "USER_BACKEND_MODULE",
+]
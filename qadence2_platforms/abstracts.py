@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from enum import Enum, auto
-from typing import Any, Generic, Iterable, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Iterable, TypeVar
+
+if TYPE_CHECKING:
+    from qadence2_platforms.utils.memory import MemoryEstimate
 
 ArrayType = TypeVar("ArrayType")
 SequenceType = TypeVar("SequenceType")
@@ -33,6 +36,18 @@ class OnEnum(Enum):
     QPU = auto()
 
 
+class OutputEnum(Enum):
+    """
+    Enum class to be used whenever an Interface class method (such as `run`) needs to
+    specify how to output array results: as native backend objects, or stored in shared
+    memory or in memory-mapped files, returning lightweight handles to them.
+    """
+
+    NATIVE = auto()
+    SHARED_MEMORY = auto()
+    MEMMAP = auto()
+
+
 class AbstractInterface(
     ABC,
     Generic[
@@ -157,3 +172,21 @@ class AbstractInterface(
         :return: any result type according to what is expected by the backends `expectation` method
         """
         pass
+
+    def memory_estimate(
+        self,
+        values: dict[str, ArrayType] | None = None,
+        run_type: RunEnum = RunEnum.RUN,
+        **kwargs: Any,
+    ) -> MemoryEstimate:
+        """
+        Estimates the peak memory of a call before running it, so jobs that would not fit
+        in memory can be rejected. Backends should override it; the default raises
+        `NotImplementedError`.
+
+        :param values: dictionary of user-input parameters
+        :param run_type: the kind of call: `run`, `sample` or `expectation`
+        :param kwargs: the other arguments of the call, ex: `observable` or `shots`
+        :return: the `MemoryEstimate` of the call
+        """
+        raise NotImplementedError(f"'{type(self).__name__}' does not provide memory estimates.")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import copy
+import threading
+from types import ModuleType
+from typing import Any, Callable
+
+from pulser.devices import Device
+from pulser.register.base_register import BaseRegister
+from pulser.sequence.sequence import Sequence
+from qadence2_ir.types import AllocQubits, Assign, Model, QuInstruct
+
+from qadence2_platforms.backends._base_analog.interface import Interface
+from qadence2_platforms.backends._base_analog.sequence import (
+    add_pulses,
+    declare_variables,
+    new_sequence,
+    to_pulses,
+)
+from qadence2_platforms.backends.instructions import InstructionTable
+from qadence2_platforms.instrumentation import stage
+
+
+class IncrementalCompiler:
+    """
+    Compiles models into a Pulser-based backend, keeping the reusable products of the last
+    compilation: the register and the instruction tables lowered from the instructions
+    (see `InstructionTable`). When the next model only differs by its directives, its
+    inputs, its register or instructions appended at its end, they are reused:
+
+    - a register change only resolves the register again, and a directives change only
+      configures the new detuning map
+    - appended instructions are lowered on their own, into a new table
+
+    Changing earlier instructions lowers them all again. The directives are checked on
+    every compilation, including when the register is reused.
+
+    Each sequence declares its own variables and converts the tables into its own pulses,
+    so the compiled interfaces share no mutable state and can be used concurrently. The
+    compilations themselves are serialized by a lock, so a compiler can be shared, as the
+    `DEFAULT_COMPILER` of the backends used by their `compile_to_backend`.
+
+    Ex:
+
+    ```
+    compiler = Compiler()
+    interface = compiler.compile(model)
+    model.directives["local_shifts"] = [0.2, 0.4]
+    interface = compiler.compile(model)  # only the detuning map is configured again
+    ```
+
+    register (BaseRegister | None): the register of the last compilation
+    tables (list[InstructionTable]): the lowered instructions of the last compilation, in
+        order
+    reused (frozenset[str]): the products reused by the last compilation, among
+        `"register"` and `"instructions"`
+    """
+
+    def __init__(
+        self,
+        register_fn: Callable[[Model], BaseRegister],
+        device: Device,
+        functions: ModuleType,
+        interface_type: type[Interface] = Interface,
+        allow_time_dependent: bool = False,
+        directives_fn: Callable[[Model], Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            register_fn (Callable[[Model], BaseRegister]): the backend function resolving
+                the register of a model
+            device (Device): the device of the sequences
+            functions (ModuleType): the backend module of the pulse functions
+            interface_type (type[Interface]): the interface class of the backend
+            allow_time_dependent (bool): whether inputs of size larger than 1,
+                interpolated as time-dependent functions, are allowed
+            directives_fn (Callable[[Model], Any] | None): the backend function checking
+                the directives of a model, also called by `register_fn`
+        """
+
+        self._register_fn = register_fn
+        self._directives_fn = directives_fn
+        self._device = device
+        self._functions = functions
+        self._interface_type = interface_type
+        self._allow_time_dependent = allow_time_dependent
+
+        self.register: BaseRegister | None = None
+        self.tables: list[InstructionTable] = []
+        self.reused: frozenset[str] = frozenset()
+        # the parts of the last compiled model the products were computed from
+        self._register_model: AllocQubits | None = None
+        self._instructions: list[Assign | QuInstruct] = []
+        self._lock = threading.Lock()
+
+    def compile(self, model: Model) -> Interface:
+        """
+        Compiles a model, reusing the products of the last compilation when possible.
+
+        Args:
+            model (Model): the IR model
+
+        Returns:
+            The backend `Interface` of the model.
+        """
+
+        with self._lock:
+            return self._compile(model)
+
+    def _compile(self, model: Model) -> Interface:
+        reused = set()
+        register = self.register
+        with stage("compile.register", num_qubits=model.register.num_qubits) as s:
+            if register is None or model.register != self._register_model:
+                register = self._register_fn(model)
+            else:
+                if self._directives_fn is not None:
+                    self._directives_fn(model)
+                reused.add("register")
+            s.set(reused="register" in reused)
+        # the register functions may adjust the model register, ex: its grid type
+        register_model = copy.deepcopy(model.register)
+
+        num_cached = len(self._instructions)
+        with stage("compile.sequence", num_instructions=len(model.instructions)) as s:
+            if self.tables and model.instructions[:num_cached] == self._instructions:
+                tables = list(self.tables)
+                if len(model.instructions) > num_cached:
+                    tables.append(InstructionTable(model.instructions[num_cached:]))
+                reused.add("instructions")
+            else:
+                tables = [InstructionTable(model.instructions)]
+
+            seq: Sequence = new_sequence(register, self._device, model.directives)
+            resolved = declare_variables(seq, model.inputs, self._allow_time_dependent)
+            pulses = [pulse for table in tables for pulse in to_pulses(table, resolved)]
+            add_pulses(seq, pulses, self._functions)
+            s.set(reused=sorted(reused))
+
+        self.register = register
+        self.tables = tables
+        self.reused = frozenset(reused)
+        self._register_model = register_model
+        # copied, so that instructions modified in place are not taken as the cached ones
+        self._instructions = copy.deepcopy(model.instructions)
+
+        non_trainable_parameters = {k for k, v in model.inputs.items() if not v.is_trainable}
+        return self._interface_type(seq, non_trainable_parameters)
+
+    def clear(self) -> None:
+        """Drops the products of the last compilation."""
+
+        with self._lock:
+            self.register = None
+            self.tables = []
+            self.reused = frozenset()
+            self._register_model = None
+            self._instructions = []
@@ -1,9 +1,83 @@
 from __future__ import annotations
 
 from abc import ABC
+from dataclasses import dataclass
 
+import numpy as np
+from numpy.typing import ArrayLike
 from pulser.devices import Device
 
+# tolerance on the atom distances, in µm, as in Pulser's register validation, which
+# rounds the coordinates to 6 decimals
+DISTANCE_TOLERANCE = 1e-6
+
+# number of atom pairs compared at once by the pairwise validation
+MAX_PAIRS_PER_CHUNK = 1 << 22
+
+# number of atoms from which the minimum distance is checked with a grid index
+GRID_INDEX_MIN_ATOMS = 64
+
+
+@dataclass(frozen=True)
+class RegisterValidation:
+    """
+    Result of `DeviceSettings.validate_registers`: the registers respecting each device
+    constraint, as boolean masks, and the details of the violations.
+
+    min_distance (np.ndarray): whether the atoms of each register are far enough apart
+    radial_distance (np.ndarray): whether the atoms of each register are close enough to
+        the center
+    atom_number (np.ndarray): whether each register has few enough atoms
+    num_atoms (np.ndarray): the number of atoms of each register
+    closest_distances (np.ndarray): the distance between the closest atoms of each
+        register; `inf` with less than two atoms or, with the grid index, if no atoms are
+        closer than the minimum distance
+    closest_pairs (np.ndarray): the indices of the closest atoms of each register, of shape
+        `[n_registers, 2]`; `-1` where the distance is `inf`
+    too_far (np.ndarray): the atoms beyond the maximum radial distance, of shape
+        `[n_registers, n_qubits]`
+    radial_distances (np.ndarray): the distance of each atom to the center, of shape
+        `[n_registers, n_qubits]`
+    """
+
+    min_distance: np.ndarray
+    radial_distance: np.ndarray
+    atom_number: np.ndarray
+    num_atoms: np.ndarray
+    closest_distances: np.ndarray
+    closest_pairs: np.ndarray
+    too_far: np.ndarray
+    radial_distances: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Whether each register respects all the constraints."""
+
+        return self.min_distance & self.radial_distance & self.atom_number
+
+    def violations(self, index: int) -> list[str]:
+        """
+        Describes the violations of a register.
+
+        Args:
+            index (int): the index of the register in the batch
+
+        Returns:
+            A message per violated constraint, empty if the register is valid.
+        """
+
+        messages = []
+        if not self.atom_number[index]:
+            messages.append(f"too many atoms: {self.num_atoms[index]}")
+        if not self.min_distance[index]:
+            first, second = self.closest_pairs[index]
+            distance = self.closest_distances[index]
+            messages.append(f"atoms {first} and {second} are too close: {distance:.3f} µm")
+        if not self.radial_distance[index]:
+            atoms = np.flatnonzero(self.too_far[index]).tolist()
+            messages.append(f"atoms {atoms} are too far from the center")
+        return messages
+
 
 class DeviceSettings(ABC):
     """
@@ -64,3 +138,169 @@ class DeviceSettings(ABC):
         """
 
         return self._grid_scale_range[0] <= grid_scale <= self._grid_scale_range[1]
+
+    def validate_registers(
+        self, coords: ArrayLike, center: bool = True, grid_index: bool | None = None
+    ) -> RegisterValidation:
+        """
+        Checks batches of registers against the device limits, the minimum atom distance,
+        the maximum radial distance and the maximum number of atoms, with the tolerances of
+        Pulser's register validation but without creating the registers nor raising.
+
+        Registers of different sizes are stacked by padding their coordinates with `nan`.
+
+        Ex:
+
+        ```
+        coords = RegisterTransform.transform(candidates, "triangular")
+        validation = AnalogSettings.validate_registers(coords)
+        valid_coords = coords[validation.valid]
+        ```
+
+        Args:
+            coords (ArrayLike): the stacked coordinates, in µm, of shape
+                `[n_registers, n_qubits, 2]`
+            center (bool): whether the registers are centered before checking the radial
+                distance, as `Register.from_coordinates` does. Default is `True`
+            grid_index (bool | None): whether the closest atoms are searched in a grid
+                of cells of the minimum distance, comparing only the atoms of neighbouring
+                cells, instead of all the pairs. Default is to use it from
+                `GRID_INDEX_MIN_ATOMS` atoms
+
+        Returns:
+            The `RegisterValidation` of the batch.
+        """
+
+        coords = np.asarray(coords, dtype=float)
+        if coords.ndim != 3 or coords.shape[-1] != 2:
+            raise ValueError("coords should be of shape [n_registers, n_qubits, 2].")
+
+        present = ~np.isnan(coords).any(axis=-1)
+        num_atoms = present.sum(axis=-1)
+        tolerance = DISTANCE_TOLERANCE
+
+        min_atom_distance = self._device.min_atom_distance
+        if grid_index is None:
+            grid_index = coords.shape[1] >= GRID_INDEX_MIN_ATOMS
+        if grid_index and min_atom_distance > tolerance:
+            closest_distances, closest_pairs = _grid_closest(coords, min_atom_distance)
+        else:
+            closest_distances, closest_pairs = pairwise_closest(coords)
+        min_distance = (closest_distances - min_atom_distance >= -tolerance) & (
+            closest_distances >= tolerance
+        )
+
+        if center:
+            centers = np.nanmean(np.where(present[..., np.newaxis], coords, np.nan), axis=1)
+            coords = coords - np.nan_to_num(centers)[:, np.newaxis]
+        radial_distances = np.linalg.norm(coords, axis=-1)
+        max_radial_distance = self._device.max_radial_distance
+        if max_radial_distance is None:
+            too_far = np.zeros(present.shape, dtype=bool)
+        else:
+            too_far = present & (radial_distances > max_radial_distance)
+
+        max_atom_num = self._device.max_atom_num
+        return RegisterValidation(
+            min_distance=min_distance,
+            radial_distance=~too_far.any(axis=-1),
+            atom_number=(
+                np.ones(len(coords), dtype=bool)
+                if max_atom_num is None
+                else num_atoms <= max_atom_num
+            ),
+            num_atoms=num_atoms,
+            closest_distances=closest_distances,
+            closest_pairs=closest_pairs,
+            too_far=too_far,
+            radial_distances=radial_distances,
+        )
+
+
+def pairwise_closest(coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the closest atoms of each register by comparing all the atom pairs, in chunks
+    of registers to bound the memory (see `MAX_PAIRS_PER_CHUNK`).
+
+    Args:
+        coords (np.ndarray): the stacked coordinates, of shape
+            `[n_registers, n_qubits, 2]`, padded with `nan` for absent atoms
+
+    Returns:
+        The distance between the closest atoms of each register, `inf` with less than
+        two atoms, and the indices of these atoms, `[-1, -1]` if there are none.
+    """
+
+    num_registers, num_qubits = coords.shape[:2]
+    first, second = np.triu_indices(num_qubits, k=1)
+    distances = np.full(num_registers, np.inf)
+    pairs = np.full((num_registers, 2), -1, dtype=np.int64)
+    if len(first) == 0:
+        return distances, pairs
+
+    chunk_size = max(1, MAX_PAIRS_PER_CHUNK // len(first))
+    for start in range(0, num_registers, chunk_size):
+        chunk = coords[start : start + chunk_size]
+        deltas = chunk[:, first] - chunk[:, second]
+        squared = np.einsum("rpi,rpi->rp", deltas, deltas)
+        # pairs with padded atoms
+        squared[np.isnan(squared)] = np.inf
+        closest = np.argmin(squared, axis=-1)
+        chunk_distances = np.sqrt(squared[np.arange(len(chunk)), closest])
+        found = np.isfinite(chunk_distances)
+        distances[start : start + chunk_size] = chunk_distances
+        pairs[start : start + chunk_size] = np.where(
+            found[:, np.newaxis], np.stack([first[closest], second[closest]], axis=-1), -1
+        )
+    return distances, pairs
+
+
+def _grid_closest(coords: np.ndarray, cutoff: float) -> tuple[np.ndarray, np.ndarray]:
+    # atoms closer than `cutoff` are in the same or neighbouring cells of size `cutoff`;
+    # the cells of all the registers are sorted together, and each cell is compared with
+    # itself and half of its neighbours, so that every pair of cells is visited once
+    num_registers = len(coords)
+    distances = np.full(num_registers, np.inf)
+    pairs = np.full((num_registers, 2), -1, dtype=np.int64)
+
+    registers, atoms = np.nonzero(~np.isnan(coords).any(axis=-1))
+    points = coords[registers, atoms]
+    if len(points) < 2:
+        return distances, pairs
+    cells = np.floor(points / cutoff).astype(np.int64)
+    # leave an empty border, so that the neighbours of a cell never wrap around
+    cells -= cells.min(axis=0) - 1
+    width, height = cells.max(axis=0) + 2
+    keys = (registers * height + cells[:, 1]) * width + cells[:, 0]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    candidates = []
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        neighbours = keys + dy * width + dx
+        low = np.searchsorted(sorted_keys, neighbours, side="left")
+        counts = np.searchsorted(sorted_keys, neighbours, side="right") - low
+        first = np.repeat(np.arange(len(keys)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = order[np.repeat(low, counts) + offsets]
+        if dx == dy == 0:
+            keep = first < second
+            first, second = first[keep], second[keep]
+        candidates.append((first, second))
+
+    first = np.concatenate([c[0] for c in candidates])
+    second = np.concatenate([c[1] for c in candidates])
+    pair_distances = np.linalg.norm(points[first] - points[second], axis=-1)
+    # only the distances below the cell size are the closest of their register
+    keep = pair_distances < cutoff
+    first, second, pair_distances = first[keep], second[keep], pair_distances[keep]
+    if len(first) == 0:
+        return distances, pairs
+
+    pair_registers = registers[first]
+    closest = np.lexsort((pair_distances, pair_registers))
+    closest = closest[np.r_[True, np.diff(pair_registers[closest]) != 0]]
+    found = pair_registers[closest]
+    distances[found] = pair_distances[closest]
+    pairs[found] = np.sort(np.stack([atoms[first[closest]], atoms[second[closest]]], -1), -1)
+    return distances, pairs
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Literal, Union
+
+import numpy as np
+import qutip
+from numpy.typing import ArrayLike
+from pulser.noise_model import NoiseModel
+from pulser.sequence.sequence import Sequence
+from pulser_simulation.qutip_result import QutipResult
+from pulser_simulation.simconfig import SimConfig
+from pulser_simulation.simresults import CoherentResults
+from pulser_simulation.simulation import QutipEmulator
+
+EvaluationTimesType = Union[float, str, ArrayLike]
+StepCallback = Callable[[float, list[Any]], Any]
+Engine = Literal["qutip", "native"]
+ENGINES = ("qutip", "native")
+
+# noise types that can be emulated by a single (master equation) solver run, thus
+# compatible with step-by-step evolution
+STREAMABLE_NOISES = frozenset({"dephasing", "relaxation", "depolarizing", "eff_noise"})
+
+# noise types emulated by a single solver run, unless their parameters are drawn per run
+# (`amp_sigma` for "amplitude" and `eta` for "SPAM"); the others are averaged over runs
+SINGLE_RUN_NOISES = frozenset(
+    {"dephasing", "relaxation", "SPAM", "depolarizing", "eff_noise", "amplitude", "leakage"}
+)
+
+# noise types emulated with the master equation, whose states are density matrices
+MIXED_STATE_NOISES = frozenset({"dephasing", "relaxation", "depolarizing", "eff_noise"})
+
+# `QutipEmulator` does not expose its solver step by step, so the streaming functions
+# read these attributes of the emulator and of its hamiltonian. They are those of the
+# pinned Pulser version, checked by `check_emulator_internals` and the tests
+EMULATOR_INTERNALS = ("_hamiltonian", "_tot_duration", "_meas_basis")
+HAMILTONIAN_INTERNALS = ("_hamiltonian", "_collapse_ops", "_qdict", "_size")
+
+
+@dataclass(frozen=True)
+class EmulatorConfig:
+    """
+    Configuration of the Pulser emulator used by the analog interfaces. It allows to
+    trade accuracy for speed when simulating a sequence.
+
+    sampling_rate (float): fraction of the sequence samples used to build the
+        hamiltonian, between 0 (exclusive) and 1.0. Default is `1.0`
+    evaluation_times (float | str | ArrayLike | None): times at which the states are
+        stored. `"Full"` keeps the whole trajectory, `"Minimal"` only the initial and final
+        states, a float acts as a sampling rate and an array as explicit times in µs.
+        Default is `None`, which stores only the final state unless a time trace is
+        requested (e.g. through a streaming callback), in which case `"Full"` is used
+    with_modulation (bool): whether to simulate the expected output of the channels
+        (`True`) or the programmed input (`False`). Default is `True`
+    noise (NoiseModel | SimConfig | None): the noise configuration. Default is `None`
+        (noiseless)
+    atol (float | None): absolute tolerance of the solver. `None` uses the solver default
+    rtol (float | None): relative tolerance of the solver. `None` uses the solver default
+    max_step (float | None): maximum step size of the solver in µs. `None` lets Pulser
+        estimate it from the sequence schedule
+    nsteps (int | None): maximum number of internal steps of the solver. `None` lets
+        Pulser estimate it
+    solver_options (dict[str, Any]): any extra option passed directly to the QuTiP solver,
+        ex: `{"method": "bdf"}`
+    engine (Literal["qutip", "native"]): the engine evolving the state. `"qutip"` runs
+        Pulser's `QutipEmulator`; `"native"` integrates the piecewise-constant samples of
+        the sequence with sparse matrices (see `SubspaceHamiltonian`), without QuTiP's
+        solver setup. The native engine only supports noiseless emulations in the
+        ground-rydberg basis, without callbacks, and only evaluates the initial and final
+        states; `atol` bounds the truncation error of its Taylor series, and the other
+        solver options do not apply. Default is `"qutip"`
+    cache_propagators (bool): whether the native engine caches the exact propagators of
+        the long constant segments recurring across calls, ex: the plateaus of repeated
+        gate-like pulses, in the interface's `propagator_cache`. Only used for
+        subspaces of at most `PROPAGATOR_MAX_DIM` states. Default is `False`
+    blockade_subspace (bool): whether to emulate the sequence in the Rydberg-blockade
+        subspace of the register instead of the full Hilbert space. It always uses the
+        native engine. Default is `False`
+    blockade_frequency (float | None): the Rabi frequency, in rad/µs, setting the
+        blockade graph of `blockade_subspace`. Default is the maximum amplitude of the
+        global Rydberg channel of the device
+    """
+
+    sampling_rate: float = 1.0
+    evaluation_times: EvaluationTimesType | None = None
+    with_modulation: bool = True
+    noise: NoiseModel | SimConfig | None = None
+    atol: float | None = None
+    rtol: float | None = None
+    max_step: float | None = None
+    nsteps: int | None = None
+    solver_options: dict[str, Any] = field(default_factory=dict)
+    engine: Engine = "qutip"
+    cache_propagators: bool = False
+    blockade_subspace: bool = False
+    blockade_frequency: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.engine not in ENGINES:
+            raise ValueError(f"engine must be one of {list(ENGINES)}, got '{self.engine}'.")
+
+    @property
+    def native(self) -> bool:
+        """Whether the emulation runs on the native engine."""
+
+        return self.engine == "native" or self.blockade_subspace
+
+    @property
+    def sim_config(self) -> SimConfig | None:
+        """The noise configuration as a Pulser `SimConfig`, if any."""
+
+        if isinstance(self.noise, NoiseModel):
+            return SimConfig.from_noise_model(self.noise)
+        return self.noise
+
+    @property
+    def stochastic(self) -> bool:
+        """
+        Whether the noise is drawn per run, so that Pulser averages the results of several
+        emulations with different noise realizations.
+        """
+
+        sim_config = self.sim_config
+        if sim_config is None:
+            return False
+        noise = set(sim_config.noise)
+        return (
+            not noise <= SINGLE_RUN_NOISES
+            or ("amplitude" in noise and sim_config.amp_sigma != 0.0)
+            or ("SPAM" in noise and sim_config.eta != 0.0)
+        )
+
+    def run_options(self) -> dict[str, Any]:
+        """
+        Gathers the options to be given to `QutipEmulator.run`.
+
+        Returns:
+            A dictionary of the solver options set in this configuration.
+        """
+
+        options = {
+            k: v
+            for k, v in (
+                ("atol", self.atol),
+                ("rtol", self.rtol),
+                ("max_step", self.max_step),
+                ("nsteps", self.nsteps),
+            )
+            if v is not None
+        }
+        return {**options, **self.solver_options}
+
+    def resolve_evaluation_times(self, trajectory: bool = False) -> EvaluationTimesType:
+        """
+        Gets the evaluation times to give to the emulator.
+
+        Args:
+            trajectory (bool): whether the caller needs the states along the evolution.
+                Only used if no explicit `evaluation_times` was set
+
+        Returns:
+            The explicit evaluation times, or `"Full"`/`"Minimal"` depending on
+            `trajectory`.
+        """
+
+        if self.evaluation_times is not None:
+            return self.evaluation_times
+        return "Full" if trajectory else "Minimal"
+
+    def build_emulator(self, sequence: Sequence, trajectory: bool = False) -> QutipEmulator:
+        """
+        Creates the QuTiP emulator for a built sequence using this configuration.
+
+        Args:
+            sequence (Sequence): a built (non-parametrized) Pulser sequence
+            trajectory (bool): whether the states along the evolution are needed. Default
+                is `False`, so only the final state is stored
+
+        Returns:
+            The `QutipEmulator` instance ready to be run.
+        """
+
+        return QutipEmulator.from_sequence(
+            sequence,
+            sampling_rate=self.sampling_rate,
+            config=self.sim_config,
+            evaluation_times=self.resolve_evaluation_times(trajectory),
+            with_modulation=self.with_modulation,
+        )
+
+
+DEFAULT_EMULATOR_CONFIG = EmulatorConfig()
+
+
+def check_emulator_internals(simulation: QutipEmulator) -> None:
+    """
+    Checks that the emulator has the private attributes read by the streaming functions,
+    so that a Pulser version changing them fails loudly instead of emulating wrongly.
+
+    Args:
+        simulation (QutipEmulator): the emulator built from the sequence
+    """
+
+    missing = [name for name in EMULATOR_INTERNALS if not hasattr(simulation, name)]
+    hamiltonian = getattr(simulation, "_hamiltonian", None)
+    missing += [
+        f"_hamiltonian.{name}" for name in HAMILTONIAN_INTERNALS if not hasattr(hamiltonian, name)
+    ]
+    if missing:
+        raise RuntimeError(
+            f"The installed Pulser version is not supported by the step-by-step evolution; "
+            f"QutipEmulator lacks {missing}."
+        )
+
+
+def _solver_options(simulation: QutipEmulator, options: dict[str, Any]) -> dict[str, Any]:
+    """
+    Completes the solver options the same way as `QutipEmulator.run` does, i.e. the
+    maximum step defaults to half of the shortest constant section among the samples.
+    `QutipEmulator.run` does not expose them, so the tests check that both agree.
+    """
+
+    options = dict(options)
+
+    if "max_step" not in options:
+        min_variations: list[int] = []
+        for ch_sample in simulation.samples_obj.samples_list:
+            for sample in (
+                ch_sample.amp.as_array(detach=True),
+                ch_sample.det.as_array(detach=True),
+            ):
+                min_variations.append(
+                    int(
+                        np.min(
+                            np.diff(
+                                np.nonzero(np.diff(sample)),
+                                prepend=-1,
+                                append=ch_sample.duration - 1,
+                            )
+                        )
+                    )
+                )
+        options["max_step"] = min(min_variations) / 1000
+
+    if "nsteps" not in options:
+        options["nsteps"] = max(1000, simulation._tot_duration // options["max_step"])
+
+    return {"normalize_output": False, **options}
+
+
+def iter_states(
+    simulation: QutipEmulator, options: dict[str, Any] | None = None
+) -> Iterator[tuple[float, qutip.Qobj]]:
+    """
+    Evolves the emulator state step by step through its evaluation times, yielding the
+    time (in µs) and the state. Only the current state is kept in memory, so the
+    caller is responsible for storing whatever it needs from it.
+
+    Args:
+        simulation (QutipEmulator): the emulator built from the sequence
+        options (dict[str, Any] | None): solver options, as given to `QutipEmulator.run`
+
+    Returns:
+        An iterator over `(time, state)` pairs, starting at the initial time.
+    """
+
+    noise = set(simulation.config.noise)
+    if not noise.issubset(STREAMABLE_NOISES):
+        raise NotImplementedError(
+            f"step-by-step evolution does not support {noise - STREAMABLE_NOISES} noise."
+        )
+    check_emulator_internals(simulation)
+
+    hamiltonian = simulation._hamiltonian
+    solver_options = _solver_options(simulation, options or dict())
+    solver: qutip.solver.Solver
+    if hamiltonian._collapse_ops:
+        solver = qutip.MESolver(
+            hamiltonian._hamiltonian, hamiltonian._collapse_ops, options=solver_options
+        )
+    else:
+        solver = qutip.SESolver(hamiltonian._hamiltonian, options=solver_options)
+
+    times = simulation.evaluation_times
+    state = simulation.initial_state
+    solver.start(state, times[0])
+    yield times[0], state
+
+    for t in times[1:]:
+        state = solver.step(t, copy=False)
+        yield t, state
+
+
+def stream_expectation(
+    simulation: QutipEmulator,
+    observables: list[qutip.Qobj],
+    options: dict[str, Any] | None = None,
+) -> Iterator[tuple[float, np.ndarray]]:
+    """
+    Computes the expectation values of `observables` incrementally along the evolution.
+    Memory is bounded by a single state, regardless of the number of evaluation times.
+
+    Args:
+        simulation (QutipEmulator): the emulator built from the sequence
+        observables (list[qutip.Qobj]): native observables to evaluate at each time
+        options (dict[str, Any] | None): solver options, as given to `QutipEmulator.run`
+
+    Returns:
+        An iterator over `(time, values)` pairs, where `values` is an array with one
+        expectation value per observable.
+    """
+
+    dtype = np.float64 if all(op.isherm for op in observables) else np.complex128
+    for t, state in iter_states(simulation, options):
+        yield t, np.fromiter((qutip.expect(op, state) for op in observables), dtype=dtype)
+
+
+def run_streaming(
+    simulation: QutipEmulator,
+    observables: list[qutip.Qobj],
+    callback: StepCallback,
+    options: dict[str, Any] | None = None,
+) -> CoherentResults:
+    """
+    Runs the emulator calling `callback(time, values)` at each evaluation time with the
+    expectation values of `observables`. The intermediate states are discarded, and
+    only the final state is stored in the returned results.
+
+    Args:
+        simulation (QutipEmulator): the emulator built from the sequence
+        observables (list[qutip.Qobj]): native observables to evaluate at each time
+        callback (StepCallback): function receiving the time (in µs) and the list of
+            expectation values
+        options (dict[str, Any] | None): solver options, as given to `QutipEmulator.run`
+
+    Returns:
+        The simulation results holding the final state only.
+    """
+
+    t: float = 0.0
+    state: qutip.Qobj = simulation.initial_state
+    for t, state in iter_states(simulation, options):
+        callback(t, [qutip.expect(op, state) for op in observables])
+
+    hamiltonian = simulation._hamiltonian
+    final_result = QutipResult(
+        tuple(hamiltonian._qdict),
+        simulation._meas_basis,
+        state.copy(),
+        simulation._meas_basis in simulation.basis_name,
+        evaluation_time=1.0,
+    )
+    return CoherentResults(
+        [final_result],
+        hamiltonian._size,
+        simulation.basis_name,
+        np.array([t]),
+        simulation._meas_basis,
+    )
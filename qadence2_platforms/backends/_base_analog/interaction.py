@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+from pulser.devices._device_datacls import BaseDevice
+from pulser.register.base_register import BaseRegister
+
+
+def interaction_matrix(register: BaseRegister, device: BaseDevice) -> np.ndarray:
+    """
+    Computes the Van der Waals interaction `C6 / r^6` between every pair of atoms of a
+    register, in rad/µs. Pulser's hamiltonian holds the same terms, as
+    `0.5 * C6 / r^6 * sigma_rr ⊗ sigma_rr` for each pair.
+
+    Args:
+        register (BaseRegister): the register
+        device (BaseDevice): the device, setting the `C6` coefficient
+
+    Returns:
+        The symmetric matrix of the interactions, of shape `[n_qubits, n_qubits]`, in
+        the order of `register.qubit_ids`, with a zero diagonal.
+    """
+
+    coords = np.stack([c.as_array(detach=True) for c in register.qubits.values()]).astype(float)
+    deltas = coords[:, np.newaxis] - coords[np.newaxis]
+    distances = np.linalg.norm(deltas, axis=-1)
+    np.fill_diagonal(distances, np.inf)
+    return device.interaction_coeff / distances**6
+
+
+def blockade_graph(interactions: np.ndarray, rabi_frequency: float) -> np.ndarray:
+    """
+    Finds the pairs of atoms in Rydberg blockade, whose interaction is at least the Rabi
+    frequency, i.e. closer than `device.rydberg_blockade_radius(rabi_frequency)`.
+
+    Args:
+        interactions (np.ndarray): the interaction matrix (see `interaction_matrix`)
+        rabi_frequency (float): the Rabi frequency of the drive, in rad/µs
+
+    Returns:
+        The boolean adjacency matrix of the blockade graph.
+    """
+
+    return interactions >= rabi_frequency
@@ -1,35 +1,250 @@
 from __future__ import annotations
 
 from collections import Counter
-from typing import Any, Union, cast, Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Iterator, Union, cast
 
+import numpy as np
+from numpy.typing import ArrayLike
 from pulser.sequence.sequence import Sequence
 from pulser_simulation.simresults import SimulationResults
 from pulser_simulation.simulation import QutipEmulator
 from qutip import Qobj
 
 from qadence2_platforms import AbstractInterface
-from qadence2_platforms.abstracts import OnEnum, RunEnum
+from qadence2_platforms.abstracts import OnEnum, OutputEnum, RunEnum
+from qadence2_platforms.backends._base_analog.emulator import (
+    DEFAULT_EMULATOR_CONFIG,
+    MIXED_STATE_NOISES,
+    EmulatorConfig,
+    StepCallback,
+    run_streaming,
+    stream_expectation,
+)
 from qadence2_platforms.backends._base_analog.functions import base_parse_native_observables
+from qadence2_platforms.backends._base_analog.interaction import (
+    blockade_graph,
+    interaction_matrix,
+)
+from qadence2_platforms.backends._base_analog.subspace import (
+    DEFAULT_PROPAGATOR_CACHE,
+    TAYLOR_TOLERANCE,
+    PropagatorCache,
+    Subspace,
+    SubspaceHamiltonian,
+    piecewise_constant,
+)
 from qadence2_platforms.backends.utils import InputType
+from qadence2_platforms.instrumentation import stage
+from qadence2_platforms.utils.memory import MemoryEstimate
+from qadence2_platforms.utils.sampling import (
+    DistributionCache,
+    StreamingSampler,
+    parameters_key,
+)
+from qadence2_platforms.utils.shared_memory import ArrayHandle, export_array
 
 RunResult = Union[Counter, Qobj]
 
+# bytes per stored element: complex128 for dense data, plus an index for sparse data
+_DENSE_BYTES = 16
+_SPARSE_BYTES = 24
+
+# state-sized buffers kept by the ODE solver (e.g. the history of the Adams method)
+_SOLVER_WORKSPACE_STATES = 12
+
+# number of shots of `sample` when not given, as in pulser
+DEFAULT_SHOTS = 1000
+
+
+def _has_measurement_errors(config: EmulatorConfig) -> bool:
+    sim_config = config.sim_config
+    return (
+        sim_config is not None
+        and "SPAM" in sim_config.noise
+        and bool(sim_config.epsilon or sim_config.epsilon_prime)
+    )
+
 
 class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qobj]):
-    def __init__(self, sequence: Sequence, non_trainable_parameters: set[str]) -> None:
+    """
+    Interface of the analog backends, running the built pulse sequences on the pulser
+    emulators.
+
+    The final state distributions are cached per resolved parameter set and emulator
+    configuration in `distribution_cache`, so sampling the same parameters again only
+    draws new shots, without emulating the sequence. Emulations with stochastic noise
+    (see `EmulatorConfig.stochastic`) are not cached, as each draws new noise.
+
+    The interaction matrix of the register is computed once, on first use, and shared by
+    `info`, the diagnostics, ex: `blockade_graph`, and the native engine (see
+    `EmulatorConfig.engine`), whose hamiltonians are kept for the full space and per
+    blockade frequency for the Rydberg-blockade subspace. With
+    `EmulatorConfig.cache_propagators`, the native engine keeps the propagators of the
+    recurring segments in `propagator_cache`, shared by default by all the interfaces.
+    """
+
+    def __init__(
+        self,
+        sequence: Sequence,
+        non_trainable_parameters: set[str],
+        emulator_config: EmulatorConfig | None = None,
+    ) -> None:
         self._non_trainable_parameters = non_trainable_parameters
         self._params: dict[str, float] = dict()
         self._sequence = sequence
+        self._emulator_config = emulator_config or DEFAULT_EMULATOR_CONFIG
+        self.distribution_cache = DistributionCache()
+        self.propagator_cache: PropagatorCache = DEFAULT_PROPAGATOR_CACHE
+        self._interaction_matrix: np.ndarray | None = None
+        self._full_hamiltonian: SubspaceHamiltonian | None = None
+        self._subspace_hamiltonians: dict[float, SubspaceHamiltonian] = dict()
 
     @property
     def info(self) -> dict[str, Any]:
-        return {"device": self.sequence.device, "register": self.sequence.register}
+        return {
+            "device": self.sequence.device,
+            "register": self.sequence.register,
+            "interaction_matrix": self.interaction_matrix,
+        }
+
+    @property
+    def interaction_matrix(self) -> np.ndarray:
+        """
+        The `C6 / r^6` interactions between the atoms of the register, in rad/µs, in the
+        order of its qubit ids. The register of a compiled sequence never changes, so the
+        matrix is only computed once.
+        """
+
+        if self._interaction_matrix is None:
+            register = self.sequence.register
+            with stage("interaction.matrix", num_qubits=len(register.qubit_ids)):
+                self._interaction_matrix = interaction_matrix(register, self.sequence.device)
+                # shared by the callers, so it is kept read-only
+                self._interaction_matrix.flags.writeable = False
+        return self._interaction_matrix
+
+    def blockade_graph(self, rabi_frequency: float | None = None) -> np.ndarray:
+        """
+        Finds the pairs of atoms in Rydberg blockade at a given drive amplitude.
+
+        :param rabi_frequency: the Rabi frequency of the drive, in rad/µs. Default is the
+            maximum amplitude of the global Rydberg channel of the device
+        :return: the boolean adjacency matrix of the blockade graph, in the order of the
+            qubit ids
+        """
+        if rabi_frequency is None:
+            channel = self.sequence.device.channels["rydberg_global"]
+            rabi_frequency = channel.max_amp
+        return blockade_graph(self.interaction_matrix, rabi_frequency)
+
+    def subspace_hamiltonian(self, rabi_frequency: float | None = None) -> SubspaceHamiltonian:
+        """
+        Gets the hamiltonian restricted to the Rydberg-blockade subspace, the independent
+        sets of the blockade graph, built once per Rabi frequency.
+
+        :param rabi_frequency: the Rabi frequency setting the blockade graph, in rad/µs.
+            Default is the maximum amplitude of the global Rydberg channel of the device
+        :return: the `SubspaceHamiltonian`
+        """
+        if rabi_frequency is None:
+            rabi_frequency = self.sequence.device.channels["rydberg_global"].max_amp
+        hamiltonian = self._subspace_hamiltonians.get(rabi_frequency)
+        if hamiltonian is None:
+            with stage("subspace.setup", rabi_frequency=rabi_frequency) as s:
+                subspace = Subspace.blockade(self.blockade_graph(rabi_frequency))
+                hamiltonian = SubspaceHamiltonian(subspace, self.interaction_matrix)
+                s.set(num_states=len(subspace))
+            self._subspace_hamiltonians[rabi_frequency] = hamiltonian
+        return hamiltonian
+
+    @property
+    def full_hamiltonian(self) -> SubspaceHamiltonian:
+        """The hamiltonian over the full Hilbert space, evolved by the native engine."""
+
+        if self._full_hamiltonian is None:
+            num_qubits = len(self.sequence.register.qubit_ids)
+            with stage("subspace.setup", num_qubits=num_qubits):
+                subspace = Subspace.full(num_qubits)
+                self._full_hamiltonian = SubspaceHamiltonian(subspace, self.interaction_matrix)
+        return self._full_hamiltonian
+
+    def _native_state(
+        self, values: dict[str, float] | None, config: EmulatorConfig
+    ) -> tuple[Subspace, np.ndarray]:
+        if config.sim_config is not None:
+            raise NotImplementedError("The native engine does not support noise.")
+
+        if config.blockade_subspace:
+            hamiltonian = self.subspace_hamiltonian(config.blockade_frequency)
+        else:
+            hamiltonian = self.full_hamiltonian
+        vals: dict[str, float] = {**(values or dict()), **self._params}
+        with stage("sequence.build", num_parameters=len(vals)) as s:
+            pulse_sequence: Sequence = self.sequence.build(**vals)  # type: ignore
+            s.set(duration=pulse_sequence.get_duration())
+        with stage("subspace.solve", num_states=hamiltonian.shape[0]) as s:
+            segments = piecewise_constant(pulse_sequence, config.with_modulation)
+            s.set(num_segments=len(segments))
+            amplitudes = hamiltonian.evolve(
+                segments,
+                tolerance=config.atol or TAYLOR_TOLERANCE,
+                cache=self.propagator_cache if config.cache_propagators else None,
+            )
+            s.set(cached_propagators=len(self.propagator_cache))
+        return hamiltonian.subspace, amplitudes
+
+    def _on_native(
+        self,
+        run_type: RunEnum,
+        values: dict[str, float] | None,
+        config: EmulatorConfig,
+        observable: list[InputType] | InputType | None = None,
+    ) -> Any:
+        subspace, amplitudes = self._native_state(values, config)
+        match run_type:
+            case RunEnum.RUN:
+                with stage("results.state"):
+                    num_qubits = subspace.num_qubits
+                    return Qobj(
+                        subspace.embed(amplitudes)[:, np.newaxis],
+                        dims=[[2] * num_qubits, [1] * num_qubits],
+                    )
+            case RunEnum.EXPECTATION:
+                if observable is None:
+                    raise ValueError("observable cannot be None or empty on 'expectation' method.")
+                observables = self._native_observables(observable)
+                with stage("results.expectation"):
+                    # the observables are diagonal; only their subspace entries are needed,
+                    # and the initial state is the first subspace state
+                    indices = subspace.indices()
+                    probabilities = np.abs(amplitudes) ** 2
+                    results = []
+                    for op in observables:
+                        diagonal = op.diag()[indices]
+                        diagonal = diagonal.real if op.isherm else diagonal
+                        results.append(np.array([diagonal[0], probabilities @ diagonal]))
+                    return results
+            case _:
+                raise NotImplementedError(f"Run type '{run_type}' not implemented.")
 
     @property
     def sequence(self) -> Sequence:
         return self._sequence
 
+    @property
+    def emulator_config(self) -> EmulatorConfig:
+        return self._emulator_config
+
+    def set_emulator_config(self, config: EmulatorConfig) -> None:
+        """
+        Sets the default emulator configuration used by `run`, `sample` and `expectation`.
+
+        :param config: the `EmulatorConfig` instance to use
+        """
+        self._emulator_config = config
+
     def parameters(self) -> dict[str, float]:
         return self._params
 
@@ -44,6 +259,14 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
     def draw(self, values: dict[str, Any]) -> None:
         self.sequence.build(**values).draw()
 
+    def _native_observables(self, observable: list[InputType] | InputType) -> list[Qobj]:
+        with stage("observables.parse") as s:
+            observables = base_parse_native_observables(
+                num_qubits=len(self.sequence.register.qubit_ids), observable=observable
+            )
+            s.set(num_observables=len(observables))
+        return observables
+
     def _run(
         self,
         run_type: RunEnum,
@@ -71,26 +294,42 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
 
         match run_type:
             case RunEnum.RUN:
-                return platform.get_final_state()
+                with stage("results.state"):
+                    return platform.get_final_state()
             case RunEnum.SAMPLE:
-                return platform.sample_final_state(shots)
+                with stage("results.sample", shots=shots):
+                    return platform.sample_final_state(shots)
             case RunEnum.EXPECTATION:
                 if observable is not None:
-                    return platform.expect(
-                        obs_list=base_parse_native_observables(
-                            num_qubits=len(self.sequence.register.qubit_ids), observable=observable
-                        )
-                    )
+                    observables = self._native_observables(observable)
+                    with stage("results.expectation"):
+                        return platform.expect(obs_list=observables)
                 raise ValueError("observable cannot be None or empty on 'expectation' method.")
             case _:
                 raise NotImplementedError(f"Run type '{run_type}' not implemented.")
 
+    def _build_emulator(
+        self,
+        values: dict[str, float] | None,
+        config: EmulatorConfig,
+        trajectory: bool = False,
+    ) -> QutipEmulator:
+        vals: dict[str, float] = {**(values or dict()), **self._params}
+        with stage("sequence.build", num_parameters=len(vals)) as s:
+            pulse_sequence: Sequence = self.sequence.build(**vals)  # type: ignore
+            s.set(duration=pulse_sequence.get_duration())
+        with stage("emulator.setup", sampling_rate=config.sampling_rate):
+            return config.build_emulator(pulse_sequence, trajectory=trajectory)
+
     def _on_emulator(
         self,
         run_type: RunEnum,
         values: dict[str, float] | None,
         shots: int | None = None,
         observable: list[InputType] | InputType | None = None,
+        emulator_config: EmulatorConfig | None = None,
+        callback: StepCallback | None = None,
+        seed: int | np.random.Generator | None = None,
         **_: Any,
     ) -> Any:
         """
@@ -105,23 +344,65 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
         :param values: dictionary of user-input parameters
         :param shots: int: number of shots; applied only for `sample` option
         :param observable: list of observables; applied only for `expectation` option
-        :param callback: callback function to be used inside the method (if applicable)
+        :param emulator_config: emulator configuration for this call; if `None`, the
+            interface's default configuration is used
+        :param callback: function called as `callback(time, values)` at each evaluation
+            time with the expectation values of `observable`; the intermediate states
+            are not stored. If `None`, only the final state is kept (unless the
+            configuration sets explicit evaluation times)
+        :param seed: seed or generator of the shots; applied only for `sample` option
+            without measurement errors or callback
         :return: the respective result value: `Qobj` for `run`, `Counter` for `sample`,
             and numeric type (`float`, `complex`, `ArrayLike`) for `expectation`
         """
-        vals: dict[str, float] = {**(values or dict()), **self._params}
-        pulse_sequence: Sequence = self.sequence.build(**vals)  # type: ignore
-        simulation: QutipEmulator = QutipEmulator.from_sequence(
-            pulse_sequence, with_modulation=True
-        )
-        result: SimulationResults = simulation.run()
+        config = emulator_config or self._emulator_config
 
-        return self._run(
-            run_type=run_type,
-            platform=result,
-            shots=shots,
-            observable=observable,
-        )
+        with stage(
+            f"interface.{run_type.name.lower()}",
+            device=self.sequence.device.name,
+            num_qubits=len(self.sequence.register.qubit_ids),
+        ):
+            if (
+                run_type == RunEnum.SAMPLE
+                and callback is None
+                and not _has_measurement_errors(config)
+            ):
+                # measurement errors are drawn per shot by pulser, on the emulation results
+                shots = DEFAULT_SHOTS if shots is None else shots
+                with stage("results.sample", shots=shots):
+                    sampler = self._distribution(values, config).spawn(seed)
+                    sampler.sample(shots)
+                return sampler.counters()[0]
+
+            if config.native:
+                if callback is not None:
+                    raise NotImplementedError("The native engine does not support callbacks.")
+                return self._on_native(run_type, values, config, observable)
+
+            simulation = self._build_emulator(values, config, trajectory=callback is not None)
+
+            result: SimulationResults
+            if callback is not None:
+                if observable is None:
+                    raise ValueError("observable cannot be None or empty when using a callback.")
+                observables = self._native_observables(observable)
+                with stage("emulator.solve", streaming=True):
+                    result = run_streaming(
+                        simulation,
+                        observables=observables,
+                        callback=callback,
+                        options=config.run_options(),
+                    )
+            else:
+                with stage("emulator.solve", streaming=False):
+                    result = simulation.run(**config.run_options())
+
+            return self._run(
+                run_type=run_type,
+                platform=result,
+                shots=shots,
+                observable=observable,
+            )
 
     def _on_qpu(
         self,
@@ -151,17 +432,26 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
         values: dict[str, float] | None = None,
         on: OnEnum = OnEnum.EMULATOR,
         shots: int | None = None,
+        emulator_config: EmulatorConfig | None = None,
+        observable: list[InputType] | InputType | None = None,
+        callback: StepCallback | None = None,
+        output: OutputEnum = OutputEnum.NATIVE,
+        output_dir: str | Path | None = None,
         **_: Any,
-    ) -> RunResult:
+    ) -> RunResult | ArrayHandle:
+        result: RunResult
         match on:
             case OnEnum.EMULATOR:
-                return self._on_emulator(
+                result = self._on_emulator(
                     run_type=RunEnum.RUN,
                     values=values,
                     shots=shots,
+                    observable=observable,
+                    emulator_config=emulator_config,
+                    callback=callback,
                 )
             case OnEnum.QPU:
-                return self._on_qpu(
+                result = self._on_qpu(
                     run_type=RunEnum.RUN,
                     values=values,
                     shots=shots,
@@ -169,11 +459,20 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
             case _:
                 raise NotImplementedError(f"Platform '{on}' not implemented.")
 
+        if output == OutputEnum.NATIVE:
+            return result
+        # states are exported as dense arrays; `output_dir` is used by the `MEMMAP` mode
+        return export_array(cast(Qobj, result).full(), output, output_dir)
+
     def sample(
         self,
         values: dict[str, float] | None = None,
         shots: int | None = None,
         on: OnEnum = OnEnum.EMULATOR,
+        emulator_config: EmulatorConfig | None = None,
+        observable: list[InputType] | InputType | None = None,
+        callback: StepCallback | None = None,
+        seed: int | np.random.Generator | None = None,
         **_: Any,
     ) -> Counter:
         match on:
@@ -184,6 +483,10 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
                         run_type=RunEnum.SAMPLE,
                         values=values,
                         shots=shots,
+                        observable=observable,
+                        emulator_config=emulator_config,
+                        callback=callback,
+                        seed=seed,
                     ),
                 )
             case OnEnum.QPU:
@@ -204,6 +507,8 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
         observable: list[InputType] | InputType | None = None,
         on: OnEnum = OnEnum.EMULATOR,
         shots: int | None = None,
+        emulator_config: EmulatorConfig | None = None,
+        callback: StepCallback | None = None,
         **_: Any,
     ) -> Qobj:
         match on:
@@ -213,6 +518,8 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
                     values=values,
                     shots=shots,
                     observable=observable,
+                    emulator_config=emulator_config,
+                    callback=callback,
                 )
             case OnEnum.QPU:
                 return self._on_qpu(
@@ -223,3 +530,219 @@ class Interface(AbstractInterface[float, Sequence, float, RunResult, Counter, Qo
                 )
             case _:
                 raise NotImplementedError(f"Platform '{on}' not implemented.")
+
+    def sampler(
+        self,
+        values: dict[str, float] | None = None,
+        emulator_config: EmulatorConfig | None = None,
+        seed: int | np.random.Generator | None = None,
+        **_: Any,
+    ) -> StreamingSampler:
+        """
+        Runs the emulation once and returns a sampler of its final state, to draw large
+        numbers of shots in bounded-size chunks (see `StreamingSampler`).
+
+        :param values: dictionary of user-input parameters
+        :param emulator_config: emulator configuration for this call; if `None`, the
+            interface's default configuration is used
+        :param seed: seed or generator of the draws
+        :return: the `StreamingSampler` of the final state distribution, with an empty
+            histogram
+        """
+        config = emulator_config or self._emulator_config
+        if _has_measurement_errors(config):
+            raise NotImplementedError("Streaming samplers do not support measurement errors.")
+
+        with stage(
+            "interface.sampler",
+            device=self.sequence.device.name,
+            num_qubits=len(self.sequence.register.qubit_ids),
+        ):
+            return self._distribution(values, config).spawn(seed)
+
+    def _distribution(
+        self, values: dict[str, float] | None, config: EmulatorConfig
+    ) -> StreamingSampler:
+        # stochastic noises are drawn again by each emulation, so a cached distribution
+        # would freeze a single realization of them
+        cached = not config.stochastic
+        key = parameters_key({**(values or dict()), **self._params}, config)
+        sampler = self.distribution_cache.get(key) if cached else None
+        if sampler is not None:
+            return sampler
+        if config.native:
+            subspace, amplitudes = self._native_state(values, config)
+            sampler = StreamingSampler(np.abs(amplitudes) ** 2, outcomes=subspace.bitstrings())
+        else:
+            simulation = self._build_emulator(values, config)
+            with stage("emulator.solve", streaming=False):
+                result = simulation.run(**config.run_options())
+            distribution = result[-1].sampling_dist
+            sampler = StreamingSampler(list(distribution.values()), outcomes=list(distribution))
+        if cached:
+            self.distribution_cache.put(key, sampler)
+        return sampler
+
+    def memory_estimate(
+        self,
+        values: dict[str, float] | None = None,
+        run_type: RunEnum = RunEnum.RUN,
+        observable: list[InputType] | InputType | None = None,
+        shots: int | None = None,
+        emulator_config: EmulatorConfig | None = None,
+        callback: StepCallback | None = None,
+        **_: Any,
+    ) -> MemoryEstimate:
+        """
+        Estimates the peak memory of a `run`, `sample` or `expectation` call on the
+        emulator, without running it. The sequence is built to get its duration, which
+        sets the number of stored states when the full trajectory is kept.
+
+        The estimate accounts for the states (density matrices under noise that needs a
+        master equation), the stored trajectory, the sparse hamiltonian terms, the
+        observables and the solver buffers.
+
+        :param values: dictionary of user-input parameters
+        :param run_type: the kind of call: `run`, `sample` or `expectation`
+        :param observable: list of observables, if applicable
+        :param shots: number of shots, if applicable (`sample` only)
+        :param emulator_config: emulator configuration of the call; if `None`, the
+            interface's default configuration is used
+        :param callback: the streaming callback of the call, if any
+        :return: the `MemoryEstimate` of the call
+        """
+        config = emulator_config or self._emulator_config
+        num_qubits = len(self.sequence.register.qubit_ids)
+        levels = 3 if len(self.sequence.get_addressed_bases()) > 1 else 2
+        dim = levels**num_qubits
+
+        sim_config = config.sim_config
+        mixed = sim_config is not None and bool(set(sim_config.noise) & MIXED_STATE_NOISES)
+        size = dim * dim if mixed else dim
+
+        if callback is not None:
+            # the solver state and the final copy
+            num_states = 2
+        else:
+            times = config.resolve_evaluation_times(trajectory=False)
+            if isinstance(times, str) and times == "Minimal":
+                num_states = 2
+            elif isinstance(times, (str, float, int)):
+                vals = {**(values or dict()), **self._params}
+                seq = (
+                    self.sequence.build(**vals)
+                    if self.sequence.is_parametrized()
+                    else self.sequence
+                )
+                duration = seq.get_duration(include_fall_time=config.with_modulation)
+                num_states = int(duration * config.sampling_rate) + 1
+                if not isinstance(times, str):
+                    num_states = int(num_states * times)
+            else:
+                num_states = len(np.asarray(times)) + 2
+            # the solver's current state
+            num_states += 1
+
+        # drive and detuning terms for each qubit, and the interaction term
+        num_terms = 3 * num_qubits + 1
+        num_observables = 0
+        if run_type == RunEnum.EXPECTATION or callback is not None:
+            if observable is not None:
+                num_observables = len(observable) if isinstance(observable, list) else 1
+
+        workspace = _SOLVER_WORKSPACE_STATES * size * _DENSE_BYTES
+        if run_type == RunEnum.SAMPLE:
+            # probabilities of the final state and the drawn shots
+            workspace += dim * 8 + (shots or 0) * 8
+
+        return MemoryEstimate(
+            state=size * _DENSE_BYTES,
+            num_states=num_states,
+            operators=num_terms * size * _SPARSE_BYTES,
+            observables=num_observables * size * _SPARSE_BYTES,
+            workspace=workspace,
+        )
+
+    def _stream_setup(
+        self,
+        values: dict[str, float] | None,
+        observable: list[InputType] | InputType | None,
+        times: float | ArrayLike | None,
+        emulator_config: EmulatorConfig | None,
+    ) -> tuple[QutipEmulator, list[Qobj], dict[str, Any]]:
+        if observable is None:
+            raise ValueError("observable cannot be None or empty on 'expectation' method.")
+
+        config = emulator_config or self._emulator_config
+        if config.native:
+            raise NotImplementedError("The native engine does not stream states.")
+        if times is not None:
+            config = replace(config, evaluation_times=times)
+
+        simulation = self._build_emulator(values, config, trajectory=True)
+        return simulation, self._native_observables(observable), config.run_options()
+
+    def expectation_stream(
+        self,
+        values: dict[str, float] | None = None,
+        observable: list[InputType] | InputType | None = None,
+        times: float | ArrayLike | None = None,
+        emulator_config: EmulatorConfig | None = None,
+    ) -> Iterator[tuple[float, np.ndarray]]:
+        """
+        Computes the expectation values of the observable(s) incrementally during the
+        evolution, without keeping the intermediate states.
+
+        :param values: dictionary of user-input parameters
+        :param observable: list of observables
+        :param times: time grid of the trace. A float between 0 and 1 downsamples the
+            sequence samples, an array sets explicit times in µs. If `None`, the
+            configuration evaluation times are used (the full grid by default)
+        :param emulator_config: emulator configuration for this call; if `None`, the
+            interface's default configuration is used
+        :return: a generator of `(time, values)` pairs, `values` being an array with
+            one expectation value per observable
+        """
+        simulation, observables, options = self._stream_setup(
+            values, observable, times, emulator_config
+        )
+        return stream_expectation(simulation, observables, options)
+
+    def expectation_trace(
+        self,
+        values: dict[str, float] | None = None,
+        observable: list[InputType] | InputType | None = None,
+        times: float | ArrayLike | None = None,
+        out: np.ndarray | None = None,
+        emulator_config: EmulatorConfig | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Fills an array of shape `(n_observables, n_times)` with the expectation values
+        of the observable(s) over the evolution. Memory scales with the number of
+        observables and times, not with the size of the states.
+
+        :param values: dictionary of user-input parameters
+        :param observable: list of observables
+        :param times: time grid of the trace; see `expectation_stream`
+        :param out: optional preallocated array of shape `(n_observables, n_times)`
+            to write the results into
+        :param emulator_config: emulator configuration for this call; if `None`, the
+            interface's default configuration is used
+        :return: the evaluation times (in µs) and the filled array of expectation values
+        """
+        simulation, observables, options = self._stream_setup(
+            values, observable, times, emulator_config
+        )
+        eval_times = simulation.evaluation_times
+        shape = (len(observables), eval_times.size)
+
+        if out is None:
+            dtype = np.float64 if all(op.isherm for op in observables) else np.complex128
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"`out` must have shape {shape} for this time grid, got {out.shape}.")
+
+        for k, (_, vals) in enumerate(stream_expectation(simulation, observables, options)):
+            out[:, k] = vals
+
+        return eval_times, out
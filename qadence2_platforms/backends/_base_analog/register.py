@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Union, Callable, Any
+from typing import Any, Callable, Union
 
 import numpy as np
 from numpy.typing import ArrayLike
@@ -9,12 +9,23 @@ from pulser.devices import Device
 from pulser.register import RegisterLayout
 from qadence2_ir.types import Model
 
-from qadence2_platforms.backends._base_analog.device_settings import DeviceSettings
+from qadence2_platforms.backends._base_analog.device_settings import (
+    DISTANCE_TOLERANCE,
+    DeviceSettings,
+    pairwise_closest,
+)
 from qadence2_platforms.backends.utils import gridtype_literal
 
 qubits_pos_type = list[tuple[int, int]]
 coords_type = Union[ArrayLike, list[ArrayLike], tuple[ArrayLike]]
 
+# linear maps of the grid types, applied to row vectors of integer positions
+GRID_TRANSFORMS: dict[str, np.ndarray] = {
+    "linear": np.array([[1.0, 0.0], [0.0, 0.0]]),
+    "triangular": np.array([[1.0, 0.0], [0.5, 0.8660254037844386]]),
+    "square": np.eye(2),
+}
+
 
 class RegisterTransform:
     """Transforms register data according to the `grid_type` in the `qadence2_ir.types.Model`"""
@@ -90,13 +101,13 @@ class RegisterTransform:
 
     def linear_coords(self) -> np.ndarray:
         """
-        Transforms coordinates into linear coordinates.
+        Transforms coordinates into linear coordinates, along the x axis.
 
         Returns:
-            np.ndarray of transformed coordinates.
+            np.ndarray of transformed coordinates
         """
 
-        raise NotImplementedError()
+        return self.transform(self._raw_coords, "linear", self._grid_scale, batched=False)
 
     def triangular_coords(self) -> np.ndarray:
         """
@@ -106,9 +117,7 @@ class RegisterTransform:
             np.ndarray of transformed coordinates
         """
 
-        # triangular transformation matrix
-        transform = np.array([[1.0, 0.0], [0.5, 0.8660254037844386]])
-        return np.array(self._raw_coords) * self._grid_scale * self.scale_factor @ transform
+        return self.transform(self._raw_coords, "triangular", self._grid_scale, batched=False)
 
     def square_coords(self) -> np.ndarray:
         """
@@ -118,8 +127,96 @@ class RegisterTransform:
             np.ndarray of transformed coordinates
         """
 
-        # for now, no transformation needed since the coords are list of tuple of ints
-        return np.array(self._raw_coords) * self._grid_scale * self.scale_factor
+        return self.transform(self._raw_coords, "square", self._grid_scale, batched=False)
+
+    @classmethod
+    def transform(
+        cls,
+        coords: ArrayLike,
+        grid_transform: gridtype_literal | None = None,
+        grid_scale: float = 1.0,
+        batched: bool = True,
+    ) -> np.ndarray:
+        """
+        Transforms the integer positions of many registers at once, ex: the candidates of
+        a layout search, with a single matrix product.
+
+        Ex:
+
+        ```
+        candidates = rng.integers(-3, 4, size=(10_000, 6, 2))
+        coords = RegisterTransform.transform(candidates, "triangular")
+        valid = RegisterTransform.min_distances(coords) >= device.min_atom_distance
+        ```
+
+        Args:
+            coords (ArrayLike): the stacked positions, of shape `[n_registers, n_qubits, 2]`,
+                or `[n_registers, n_qubits]` for positions along a line
+            grid_transform (Literal["linear", "triangular", "square"], None): the grid
+                type. If None is provided, it will default to "triangular"
+            grid_scale (float): scale of the grid. Default is `1.0`
+            batched (bool): whether `coords` holds many registers. If `False`, it holds the
+                positions of a single register, of shape `[n_qubits, 2]` or `[n_qubits]`
+
+        Returns:
+            np.ndarray of transformed coordinates, of shape `[n_registers, n_qubits, 2]`,
+            or `[n_qubits, 2]` if not batched.
+        """
+
+        grid = grid_transform if grid_transform is not None else "triangular"
+        if grid not in GRID_TRANSFORMS:
+            cls.invalid_grid_value()
+
+        points = np.asarray(coords, dtype=float)
+        if not batched:
+            points = points[np.newaxis]
+        if points.ndim == 2:
+            points = np.stack([points, np.zeros_like(points)], axis=-1)
+        if points.ndim != 3 or points.shape[-1] != 2:
+            raise ValueError(
+                "coords should be of shape [n_registers, n_qubits, 2] or [n_registers, n_qubits]."
+            )
+        if grid == "linear" and np.any(points[..., 1]):
+            raise ValueError("linear grids only accept positions along the x axis.")
+
+        transformed = points @ (GRID_TRANSFORMS[grid] * (grid_scale * cls.scale_factor))
+        return transformed if batched else transformed[0]
+
+    @staticmethod
+    def min_distances(coords: ArrayLike) -> np.ndarray:
+        """
+        Computes the minimum distance between the atoms of each register. The pairs are
+        compared in chunks of registers, bounding the memory whatever their number.
+
+        Args:
+            coords (ArrayLike): the stacked coordinates, of shape
+                `[n_registers, n_qubits, 2]`
+
+        Returns:
+            np.ndarray of the minimum distance of each register, `inf` for registers of
+            less than two atoms.
+        """
+
+        return pairwise_closest(np.asarray(coords, dtype=float))[0]
+
+    @classmethod
+    def check_min_distance(cls, coords: ArrayLike, device: Device) -> np.ndarray:
+        """
+        Checks the minimum atom distance of the device on many registers at once, with the
+        tolerance of Pulser's register validation.
+
+        Args:
+            coords (ArrayLike): the stacked coordinates, of shape
+                `[n_registers, n_qubits, 2]`
+            device (Device): the device
+
+        Returns:
+            np.ndarray of booleans, whether each register respects the minimum distance.
+        """
+
+        distances = cls.min_distances(coords)
+        tolerance = DISTANCE_TOLERANCE
+        return (distances - device.min_atom_distance >= -tolerance) & (distances >= tolerance)
 
     @classmethod
     def get_calibrated_layout(cls, layout_name: str) -> RegisterLayout:
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from functools import reduce
-from typing import Any
+from types import ModuleType
+from typing import Any, Callable, Optional
 
 import numpy as np
+from pulser.devices import Device
 from pulser.parametrized.variable import VariableItem
+from pulser.register.base_register import BaseRegister
+from pulser.register.weight_maps import DetuningMap
 from pulser.sequence.sequence import Sequence
-from qadence2_ir.types import Alloc, Assign, Call, Load, QuInstruct
+from qadence2_ir.types import Alloc, Assign, QuInstruct
+
+from qadence2_platforms.backends.instructions import ASSIGN, InstructionTable
+
+# detuning maps kept by `detuning_map`
+DETUNING_MAP_CACHE_SIZE = 64
+
+_detuning_maps: OrderedDict[tuple, DetuningMap] = OrderedDict()
+_detuning_maps_lock = threading.Lock()
 
 
 class NamedPulse:
@@ -15,15 +29,100 @@ class NamedPulse:
         self.args = args
 
 
-def from_instructions(
-    sequence: Sequence,
-    inputs: dict[str, Alloc],
-    instructions: list[Assign | QuInstruct],
-    allow_time_dependent: bool = False,
-) -> list[NamedPulse]:
-    variables = dict()
-    temp_vars: dict[str, Any] = dict()
+def new_sequence(register: BaseRegister, device: Device, directives: dict[str, Any]) -> Sequence:
+    """
+    Creates a sequence with the global Rydberg channel and, if the directives set local
+    targets, the detuning map of the `dmm_0` channel.
+
+    Args:
+        register (BaseRegister): the register of the sequence
+        device (Device): the device of the sequence
+        directives (dict[str, Any]): the model directives
+
+    Returns:
+        The sequence, without variables nor pulses.
+    """
+
+    seq = Sequence(register, device)
+    seq.declare_channel("global", "rydberg_global")
+
+    if directives.get("local_targets"):
+        seq.config_detuning_map(
+            detuning_map(register, directives["local_targets"], directives.get("local_shifts")),
+            "dmm_0",
+        )
 
+    return seq
+
+
+def detuning_map(
+    register: BaseRegister, targets: list[Any], shifts: list[float] | None = None
+) -> DetuningMap:
+    """
+    Defines the detuning map of local targets, with the weights `shifts / 2π`, or `1` if
+    there are no shifts. The maps are cached by register coordinates, targets and shifts,
+    so sweeping over local-shift patterns on a fixed register only defines each map once.
+
+    Args:
+        register (BaseRegister): the register of the targets
+        targets (list[Any]): the ids of the targeted qubits
+        shifts (list[float] | None): the local shifts of the targets
+
+    Returns:
+        The `DetuningMap`, shared by the calls with the same arguments.
+    """
+
+    if shifts is not None and len(shifts) == 0:
+        shifts = None
+    # registers are not hashable, their coordinates and ids identify them
+    key = (
+        register.coords_hex_hash(),
+        tuple(register.qubit_ids),
+        tuple(targets),
+        None if shifts is None else tuple(np.asarray(shifts, dtype=float).tolist()),
+    )
+    with _detuning_maps_lock:
+        if key in _detuning_maps:
+            _detuning_maps.move_to_end(key)
+            return _detuning_maps[key]
+
+    if shifts is not None:
+        weights = np.asarray(shifts, dtype=float) / (2 * np.pi)
+    else:
+        weights = np.ones(len(targets))
+    dmm = register.define_detuning_map(dict(zip(targets, weights.tolist())))
+
+    with _detuning_maps_lock:
+        _detuning_maps[key] = dmm
+        while len(_detuning_maps) > DETUNING_MAP_CACHE_SIZE:
+            _detuning_maps.popitem(last=False)
+    return dmm
+
+
+def clear_detuning_maps() -> None:
+    """Drops the detuning maps cached by `detuning_map`."""
+
+    with _detuning_maps_lock:
+        _detuning_maps.clear()
+
+
+def declare_variables(
+    sequence: Sequence, inputs: dict[str, Alloc], allow_time_dependent: bool = False
+) -> dict[str, VariableItem]:
+    """
+    Declares the model inputs as sequence variables.
+
+    Args:
+        sequence (Sequence): the sequence
+        inputs (dict[str, Alloc]): the model inputs
+        allow_time_dependent (bool): whether inputs of size larger than 1, interpolated
+            as time-dependent functions, are allowed
+
+    Returns:
+        The declared variables, by name.
+    """
+
+    variables = dict()
     for var in inputs:
         # inputs[var].size holds the points to interpolate time-dependent functions
         if inputs[var].size > 1:
@@ -33,45 +132,85 @@ def from_instructions(
                 raise TypeError("This platform cannot handle time modulated variables.")
         else:
             variables[var] = sequence.declare_variable(var)
+    return variables
+
+
+def to_pulses(
+    instructions: list[Assign | QuInstruct] | InstructionTable, variables: dict[str, Any]
+) -> list[NamedPulse]:
+    """
+    Converts instructions into named pulses, resolving their arguments.
+
+    Args:
+        instructions (list[Assign | QuInstruct] | InstructionTable): the instructions,
+            or their lowered table
+        variables (dict[str, Any]): the resolved variables: the declared inputs and the
+            variables assigned by previous instructions, if any. The variables assigned
+            by `instructions` are added to it
+
+    Returns:
+        The named pulses of the quantum instructions.
+
+    Raises:
+        ValueError: if an instruction reads a variable that is neither resolved nor
+            assigned by an instruction, ex: an undeclared input.
+    """
+
+    table = (
+        instructions
+        if isinstance(instructions, InstructionTable)
+        else InstructionTable(instructions)
+    )
+    assigned = {table.symbols[slot] for slot in table.outputs.tolist() if slot >= 0}
+    missing = [name for name in table.symbols if name not in variables and name not in assigned]
+    if missing:
+        raise ValueError(f"Undeclared inputs {missing}; declare them in the model inputs.")
+    # resolved value of each argument slot: the variables, followed by the constants
+    values: list[Any] = [variables.get(name) for name in table.symbols] + table.constants
 
     pulses = []
-    for instruction in instructions:
-        if isinstance(instruction, Assign):
-            assign(instruction, temp_vars, variables)
-
-        if isinstance(instruction, QuInstruct):
-            args = (
-                (
-                    (temp_vars.get(arg.variable) or variables[arg.variable])
-                    if isinstance(arg, Load)
-                    else arg
-                )
-                for arg in instruction.args
-            )
-            pulses.append(NamedPulse(instruction.name, *args))
+    for kind, opcode, output, _, _, args in table.rows():
+        if kind == ASSIGN:
+            # inputs and variables assigned earlier are not reassigned
+            if values[output] is None:
+                values[output] = _compute(table.names[opcode], *(values[arg] for arg in args))
+                variables[table.symbols[output]] = values[output]
+        else:
+            pulses.append(NamedPulse(table.names[opcode], *(values[arg] for arg in args)))
 
     return pulses
 
 
-def assign(
-    instruction: Assign, temp_vars: dict[str, Any], variables: dict[str, VariableItem]
-) -> None:
-    var_name = instruction.variable
+def from_instructions(
+    sequence: Sequence,
+    inputs: dict[str, Alloc],
+    instructions: list[Assign | QuInstruct] | InstructionTable,
+    allow_time_dependent: bool = False,
+) -> list[NamedPulse]:
+    variables = declare_variables(sequence, inputs, allow_time_dependent)
+    return to_pulses(instructions, variables)
+
+
+def add_pulses(sequence: Sequence, pulses: list[NamedPulse], functions: ModuleType) -> None:
+    """
+    Adds named pulses to a sequence.
 
-    if var_name in temp_vars or var_name in variables:
-        return
+    Args:
+        sequence (Sequence): the sequence
+        pulses (list[NamedPulse]): the pulses to add
+        functions (ModuleType): the backend module of the pulse functions, mapping the
+            instruction names to their functions in `PULSE_FN_MAP`
+    """
 
-    fn = instruction.value
-    if isinstance(fn, Call):
-        args = (
-            (
-                (temp_vars.get(arg.variable) or variables.get(arg.variable))
-                if isinstance(arg, Load)
-                else arg
-            )
-            for arg in fn.args
+    pulse_fn_map = functions.PULSE_FN_MAP
+    for pulse in pulses:
+        fn: Optional[Callable] = getattr(
+            functions, pulse_fn_map.get(pulse.name) or pulse.name, None
         )
-        temp_vars[var_name] = _compute(fn.identifier, *args)
+        if fn is not None:
+            fn(sequence, *pulse.args)
+        else:
+            raise ValueError(f"current backend does not have pulse '{pulse.name}' implemented.")
 
 
 def _compute(fn: str, *args: Any) -> Any:
@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from pulser.sampler import sample
+from pulser.sequence.sequence import Sequence
+from scipy.sparse import csr_matrix
+
+# registers of more atoms do not fit the bit masks of the states
+MAX_QUBITS = 62
+
+# the largest norm of `-i H dt` integrated by a single Taylor series, the maximum number
+# of its terms and the default truncation tolerance, as chosen by
+# `scipy.sparse.linalg.expm_multiply` for double precision (Al-Mohy and Higham, 2011)
+TAYLOR_THETA = 9.9
+MAX_TAYLOR_TERMS = 55
+TAYLOR_TOLERANCE = 2.0**-53
+
+# subspaces up to this dimension are evolved with dense matrices, whose products with
+# the state cost less than the dispatch of the sparse ones
+DENSE_MAX_DIM = 64
+
+# the number of segment propagators kept by a `PropagatorCache`, the number of segments
+# seen once it remembers, and the largest subspace they are computed for (a propagator
+# of 256 states takes 1 MB)
+PROPAGATOR_CACHE_SIZE = 64
+PROPAGATOR_SEEN_SIZE = 4096
+PROPAGATOR_MAX_DIM = 256
+# segments integrated with fewer products with the hamiltonian are not worth caching,
+# ex: the nanosecond-long samples of modulated ramps
+PROPAGATOR_MIN_PRODUCTS = 32
+
+# duration (in µs), complex drives and detunings of a constant segment
+Segment = tuple[float, np.ndarray, np.ndarray]
+
+
+class Subspace:
+    """
+    A set of basis states of a register in the ground-rydberg basis, in which the
+    evolution is restricted, ex: the states of the Rydberg-blockade subspace.
+
+    Each state is stored as a bit mask of the atoms in the Rydberg state, the bit `q`
+    standing for the qubit `q`. Pulser orders the full basis with the first qubit as the
+    most significant one and `|r>` before `|g>`; `indices` maps the states into it.
+
+    num_qubits (int): the number of qubits of the register
+    states (np.ndarray): the sorted bit masks of the states
+    """
+
+    def __init__(self, num_qubits: int, states: np.ndarray) -> None:
+        if num_qubits > MAX_QUBITS:
+            raise ValueError(f"Subspaces are limited to {MAX_QUBITS} qubits, got {num_qubits}.")
+        self.num_qubits = num_qubits
+        self.states = np.sort(np.asarray(states, dtype=np.int64))
+
+    @classmethod
+    def blockade(cls, graph: np.ndarray) -> Subspace:
+        """
+        Creates the Rydberg-blockade subspace: the states where no two atoms in blockade
+        are both excited, i.e. the independent sets of the blockade graph.
+
+        Args:
+            graph (np.ndarray): the boolean adjacency matrix of the blockade graph
+
+        Returns:
+            The `Subspace` of the independent sets.
+        """
+
+        return cls(len(graph), independent_sets(graph))
+
+    @classmethod
+    def full(cls, num_qubits: int) -> Subspace:
+        """
+        Creates the full Hilbert space of a register, to emulate it without restriction.
+
+        Args:
+            num_qubits (int): the number of qubits of the register
+
+        Returns:
+            The `Subspace` of all the `2^num_qubits` states.
+        """
+
+        return cls(num_qubits, np.arange(2**num_qubits, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    @property
+    def occupations(self) -> np.ndarray:
+        """The Rydberg occupation of each qubit in each state, of shape `[dim, n_qubits]`."""
+
+        return ((self.states[:, np.newaxis] >> np.arange(self.num_qubits)) & 1).astype(np.int8)
+
+    def indices(self) -> np.ndarray:
+        """The index of each state in the full basis, in Pulser's order."""
+
+        weights = 1 << np.arange(self.num_qubits - 1, -1, -1, dtype=np.int64)
+        return (1 - self.occupations).astype(np.int64) @ weights
+
+    def bitstrings(self) -> list[str]:
+        """The bitstring of each state, `1` standing for the Rydberg state as in Pulser."""
+
+        chars = (self.occupations + ord("0")).astype(np.uint8)
+        return [s.decode() for s in chars.view(f"S{self.num_qubits}").ravel()]
+
+    def embed(self, amplitudes: np.ndarray) -> np.ndarray:
+        """
+        Embeds amplitudes of the subspace states into the full space.
+
+        Args:
+            amplitudes (np.ndarray): the amplitudes, in the order of `states`
+
+        Returns:
+            The state vector of size `2^num_qubits`, in Pulser's order.
+        """
+
+        full = np.zeros(2**self.num_qubits, dtype=np.complex128)
+        full[self.indices()] = amplitudes
+        return full
+
+
+def independent_sets(graph: np.ndarray) -> np.ndarray:
+    """
+    Enumerates the independent sets of a graph, adding the vertices one at a time to all
+    the sets found so far that contain none of their neighbours.
+
+    Args:
+        graph (np.ndarray): the boolean adjacency matrix of the graph
+
+    Returns:
+        The sorted bit masks of the independent sets, including the empty set.
+    """
+
+    num_vertices = len(graph)
+    if num_vertices > MAX_QUBITS:
+        raise ValueError(f"Graphs are limited to {MAX_QUBITS} vertices, got {num_vertices}.")
+    weights = 1 << np.arange(num_vertices, dtype=np.int64)
+    neighbours = np.asarray(graph, dtype=bool).astype(np.int64) @ weights
+
+    sets = np.zeros(1, dtype=np.int64)
+    for vertex in range(num_vertices):
+        free = (sets & neighbours[vertex]) == 0
+        sets = np.concatenate([sets, sets[free] | weights[vertex]])
+    return np.sort(sets)
+
+
+class SubspaceHamiltonian:
+    """
+    Pulser's ground-rydberg hamiltonian restricted to a subspace,
+
+    `H = Σ_q Ω_q / 2 (e^{-iφ_q} |g><r|_q + h.c.) - Σ_q δ_q n_q + Σ_{p<q} U_pq n_p n_q`,
+
+    with the sparsity pattern computed once, so that the matrix of a set of drives
+    `Ω e^{-iφ}` and detunings `δ` only fills its values. The drive terms leaving the
+    subspace are dropped; on the full space (see `Subspace.full`), it is the exact
+    hamiltonian emulated by Pulser.
+
+    The evolution through piecewise-constant segments reuses a single sparse matrix,
+    filled in place for each segment, and integrates each segment with truncated Taylor
+    series, as `expm_multiply` does, but bounding the norm of the hamiltonian from the
+    drives instead of estimating it from the matrix, which dominates the cost of the
+    nanosecond-long segments of modulated sequences.
+
+    subspace (Subspace): the subspace
+    interaction_energies (np.ndarray): the interaction energy of each state, in rad/µs
+    key (str): a digest of the interactions and the subspace states, identifying the
+        hamiltonian in a `PropagatorCache`
+    """
+
+    def __init__(self, subspace: Subspace, interactions: np.ndarray) -> None:
+        """
+        Args:
+            subspace (Subspace): the subspace
+            interactions (np.ndarray): the `C6 / r^6` interaction matrix of the register
+        """
+
+        self.subspace = subspace
+        states = subspace.states
+        dim = len(states)
+        self._occupations = subspace.occupations.astype(float)
+        self.interaction_energies = 0.5 * np.einsum(
+            "sp,pq,sq->s", self._occupations, interactions, self._occupations
+        )
+
+        # transitions exciting a qubit within the subspace
+        ground, excited, qubits = [], [], []
+        for q in range(subspace.num_qubits):
+            source = np.flatnonzero((states >> q) & 1 == 0)
+            targets = np.searchsorted(states, states[source] | (1 << q))
+            found = targets < dim
+            found[found] = states[targets[found]] == states[source[found]] | (1 << q)
+            ground.append(source[found])
+            excited.append(targets[found])
+            qubits.append(np.full(found.sum(), q))
+        self._qubits = np.concatenate(qubits)
+        ground_index = np.concatenate(ground)
+        excited_index = np.concatenate(excited)
+
+        # entries: the diagonal, then |g><r| and |r><g| for each transition
+        diagonal = np.arange(dim)
+        rows = np.concatenate([diagonal, ground_index, excited_index])
+        cols = np.concatenate([diagonal, excited_index, ground_index])
+        pattern = csr_matrix(
+            (np.arange(1, len(rows) + 1), (rows, cols)), shape=(dim, dim), dtype=np.int64
+        )
+        self._order = pattern.data - 1
+        self._indices = pattern.indices
+        self._indptr = pattern.indptr
+        self.shape = (dim, dim)
+        # the flat positions of the entries in a dense matrix, in the same order
+        self._flat = np.repeat(np.arange(dim), np.diff(self._indptr)) * dim + self._indices
+        # identifies the register and subspace in the keys of the cached propagators
+        digest = hashlib.sha1(np.ascontiguousarray(interactions, dtype=float).tobytes())
+        digest.update(states.tobytes())
+        self.key = digest.hexdigest()
+
+    @property
+    def num_transitions(self) -> int:
+        return len(self._qubits)
+
+    def matrix(self, drive: np.ndarray, det: np.ndarray) -> csr_matrix:
+        """
+        Fills the hamiltonian matrix.
+
+        Args:
+            drive (np.ndarray): the complex drive `Ω e^{-iφ}` on each qubit, in rad/µs
+            det (np.ndarray): the detuning on each qubit, in rad/µs
+
+        Returns:
+            The sparse hamiltonian matrix, with its diagonal shifted by the centre of its
+            range (the shift only changes the global phase of the evolution).
+        """
+
+        values, _, _ = self._values(drive, det)
+        return csr_matrix((values, self._indices, self._indptr), shape=self.shape)
+
+    def _values(self, drive: np.ndarray, det: np.ndarray) -> tuple[np.ndarray, float, float]:
+        # the diagonal is shifted by the centre of its range, whose phase is applied apart
+        diagonal = self.interaction_energies - self._occupations @ det
+        low, high = diagonal.min(), diagonal.max()
+        shift = 0.5 * (low + high)
+        # each column holds the diagonal term and at most one drive term per qubit
+        norm = 0.5 * (high - low) + 0.5 * np.abs(drive).sum()
+        drive = 0.5 * drive[self._qubits]
+        values = np.concatenate([diagonal - shift, drive, np.conj(drive)])
+        return values[self._order], shift, norm
+
+    def propagator(self, duration: float, drive: np.ndarray, det: np.ndarray) -> np.ndarray:
+        """
+        Computes the exact propagator `exp(-i H t)` of a constant segment, from the
+        eigendecomposition of the dense hamiltonian.
+
+        Args:
+            duration (float): the duration of the segment, in µs
+            drive (np.ndarray): the complex drive `Ω e^{-iφ}` on each qubit, in rad/µs
+            det (np.ndarray): the detuning on each qubit, in rad/µs
+
+        Returns:
+            The dense unitary matrix, in the order of the subspace states.
+        """
+
+        values, shift, _ = self._values(drive, det)
+        matrix = csr_matrix((values, self._indices, self._indptr), shape=self.shape)
+        energies, vectors = np.linalg.eigh(matrix.toarray())
+        # the shift of the diagonal is added back, so the propagator carries the phase
+        return (vectors * np.exp(-1j * (energies + shift) * duration)) @ vectors.conj().T
+
+    def evolve(
+        self,
+        segments: list[Segment],
+        state: np.ndarray | None = None,
+        tolerance: float = TAYLOR_TOLERANCE,
+        cache: PropagatorCache | None = None,
+    ) -> np.ndarray:
+        """
+        Evolves a state through piecewise-constant segments (see `piecewise_constant`).
+
+        Args:
+            segments (list[Segment]): the duration (in µs), drives and detunings of each
+                segment
+            state (np.ndarray | None): the initial amplitudes, in the order of the
+                subspace states. Default is all the atoms in the ground state
+            tolerance (float): the bound on the truncation error of each Taylor series,
+                relative to the norm of the state
+            cache (PropagatorCache | None): a cache of the propagators of the segments
+                recurring across calls, applied with a single product instead of the
+                Taylor series; ignored for subspaces larger than its `max_dim`. Default
+                is `None` (no caching)
+
+        Returns:
+            The final amplitudes, in the order of the subspace states.
+        """
+
+        if state is None:
+            state = np.zeros(self.shape[0], dtype=np.complex128)
+            state[0] = 1.0
+        else:
+            state = np.array(state, dtype=np.complex128)
+
+        num_qubits = self.subspace.num_qubits
+        matrix: csr_matrix | np.ndarray
+        if self.shape[0] <= DENSE_MAX_DIM:
+            matrix = np.zeros(self.shape, dtype=np.complex128)
+            entries = matrix.reshape(-1)
+            positions = self._flat
+        else:
+            matrix = self.matrix(np.zeros(num_qubits, dtype=np.complex128), np.zeros(num_qubits))
+            entries = matrix.data
+            positions = slice(None)
+        if cache is not None and self.shape[0] > cache.max_dim:
+            cache = None
+        for duration, drive, det in segments:
+            key = None
+            if cache is not None:
+                key = (self.key, duration, drive.tobytes(), det.tobytes())
+                propagator = cache.get(key)
+                if propagator is not None:
+                    state = propagator @ state
+                    continue
+
+            entries[positions], shift, norm = self._values(drive, det)
+            steps, num_terms = _taylor_schedule(norm * duration, tolerance)
+            # only the segments costing more products than the propagator are cached
+            if (
+                key is not None
+                and steps * num_terms >= PROPAGATOR_MIN_PRODUCTS
+                and cache.admit(key)  # type: ignore[union-attr]
+            ):
+                propagator = self.propagator(duration, drive, det)
+                cache.put(key, propagator)  # type: ignore[union-attr]
+                state = propagator @ state
+                continue
+
+            state = _taylor_evolve(matrix, state, duration / steps, steps, num_terms)
+            state *= np.exp(-1j * shift * duration)
+        return state
+
+
+class PropagatorCache:
+    """
+    A thread-safe LRU cache of the exact propagators of constant segments (see
+    `SubspaceHamiltonian.propagator`), keyed by the hamiltonian (register and subspace)
+    and the duration, drives and detunings of the segments. Gate-like pulses repeated
+    within and across sequences then cost a product with the state.
+
+    A propagator is only computed when its segment is seen for the second time, and
+    only for the segments whose Taylor series need many products: the segments seen
+    once, ex: the plateaus of pulses with varying parameters, and the short ones, ex:
+    the nanosecond-long samples of modulated ramps, do not pay for a diagonalization.
+
+    maxsize (int): the maximum number of propagators kept; `0` disables the cache
+    max_dim (int): the largest subspace whose propagators are cached
+    """
+
+    def __init__(
+        self, maxsize: int = PROPAGATOR_CACHE_SIZE, max_dim: int = PROPAGATOR_MAX_DIM
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_dim = max_dim
+        self._propagators: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        # the segments missed once
+        self._seen: OrderedDict[tuple, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> np.ndarray | None:
+        with self._lock:
+            propagator = self._propagators.get(key)
+            if propagator is not None:
+                self._propagators.move_to_end(key)
+            return propagator
+
+    def admit(self, key: tuple) -> bool:
+        """
+        Records a miss.
+
+        Args:
+            key (tuple): the key of the segment
+
+        Returns:
+            Whether the segment was missed before, so its propagator should be computed.
+        """
+
+        if self.maxsize <= 0:
+            return False
+        with self._lock:
+            if key in self._seen:
+                del self._seen[key]
+                return True
+            self._seen[key] = None
+            while len(self._seen) > PROPAGATOR_SEEN_SIZE:
+                self._seen.popitem(last=False)
+            return False
+
+    def put(self, key: tuple, propagator: np.ndarray) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._propagators[key] = propagator
+            self._propagators.move_to_end(key)
+            while len(self._propagators) > self.maxsize:
+                self._propagators.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._propagators.clear()
+            self._seen.clear()
+
+    def __len__(self) -> int:
+        return len(self._propagators)
+
+
+# shared by the interfaces, so that the segments recur across compiled sequences
+DEFAULT_PROPAGATOR_CACHE = PropagatorCache()
+
+
+def _taylor_schedule(norm: float, tolerance: float) -> tuple[int, int]:
+    # the number of steps and of Taylor terms per step integrating a generator of a given
+    # norm; the k-th term is at most `x^k / k!` for the norm `x` of each step, so the
+    # terms need not be measured
+    steps = max(int(np.ceil(norm / TAYLOR_THETA)), 1)
+    x = norm / steps
+    num_terms, bound = 0, 1.0
+    while bound > tolerance and num_terms < MAX_TAYLOR_TERMS:
+        num_terms += 1
+        bound *= x / num_terms
+    return steps, num_terms
+
+
+def _taylor_evolve(
+    hamiltonian: csr_matrix | np.ndarray,
+    state: np.ndarray,
+    step: float,
+    steps: int,
+    num_terms: int,
+) -> np.ndarray:
+    # `exp(-i H step)^steps state`, with truncated Taylor series
+    scale = -1j * step
+    for _ in range(steps):
+        result = state.copy()
+        term = state
+        for k in range(1, num_terms + 1):
+            term = hamiltonian @ term
+            term *= scale / k
+            result += term
+        state = result
+    return state
+
+
+def piecewise_constant(sequence: Sequence, with_modulation: bool = True) -> list[Segment]:
+    """
+    Splits the samples of a built sequence into segments where the drive and detuning on
+    every qubit are constant. The samples are given per nanosecond, so the segments are
+    as short as a nanosecond during modulated ramps.
+
+    Args:
+        sequence (Sequence): a built (non-parametrized) Pulser sequence
+        with_modulation (bool): whether to use the expected output of the channels
+            (`True`) or the programmed input (`False`)
+
+    Returns:
+        The duration (in µs), complex drives `Ω e^{-iφ}` and detunings of each segment,
+        per qubit in the order of the register qubit ids.
+    """
+
+    # as sampled by Pulser's emulator, including the fall time of the modulated channels
+    duration = sequence.get_duration(include_fall_time=with_modulation)
+    samples = sample(
+        sequence, modulation=with_modulation, extended_duration=duration
+    ).to_nested_dict()
+    if (set(samples["Global"]) | set(samples["Local"])) - {"ground-rydberg"}:
+        raise NotImplementedError("Only the ground-rydberg basis can be emulated natively.")
+
+    qubit_ids = sequence.register.qubit_ids
+    drive = np.zeros((duration, len(qubit_ids)), dtype=np.complex128)
+    det = np.zeros((duration, len(qubit_ids)))
+    # the global and local terms add up, as in Pulser's hamiltonian
+    global_samples = samples["Global"].get("ground-rydberg")
+    if global_samples:
+        drive += (global_samples["amp"] * np.exp(-1j * global_samples["phase"]))[:, np.newaxis]
+        det += np.asarray(global_samples["det"])[:, np.newaxis]
+    for q, local_samples in samples["Local"].get("ground-rydberg", dict()).items():
+        k = qubit_ids.index(q)
+        drive[:, k] += local_samples["amp"] * np.exp(-1j * local_samples["phase"])
+        det[:, k] += local_samples["det"]
+
+    changes = np.flatnonzero(
+        np.any(np.diff(drive, axis=0) != 0, axis=1) | np.any(np.diff(det, axis=0) != 0, axis=1)
+    )
+    starts = np.concatenate([[0], changes + 1])
+    durations = np.diff(np.concatenate([starts, [duration]])) / 1000
+    return [(float(length), drive[start], det[start]) for length, start in zip(durations, starts)]
@@ -2,12 +2,33 @@ from __future__ import annotations
 
 from qadence2_ir.types import Model
 
-from . import register, sequence
+from qadence2_platforms.backends._base_analog.compiler import IncrementalCompiler
+
+from . import functions, register, sequence
 from .interface import Interface
 
 
+class Compiler(IncrementalCompiler):
+    """
+    Compiles models into Fresnel-1 interfaces, reusing the products of the last compilation
+    when only the directives, the register or the end of the instructions change (see
+    `IncrementalCompiler`).
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            register_fn=register.from_model,
+            device=sequence.Fresnel1,
+            functions=functions,
+            interface_type=Interface,
+            directives_fn=register.check_directives,
+        )
+
+
+# shared by the `compile_to_backend` calls, so that recompiling a model with other
+# directives, another register or appended instructions reuses the last compilation
+DEFAULT_COMPILER = Compiler()
+
+
 def compile_to_backend(model: Model) -> Interface:
-    reg = register.from_model(model)
-    seq = sequence.from_model(model, reg)
-    non_trainable_parameters = {k for k, v in model.inputs.items() if not v.is_trainable}
-    return Interface(seq, non_trainable_parameters)
+    return DEFAULT_COMPILER.compile(model)  # type: ignore [return-value]
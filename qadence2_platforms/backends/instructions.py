@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import numpy as np
+from qadence2_ir.types import Assign, Call, Load, Model, QuInstruct, Support
+
+# kinds of the lowered instructions
+QUANTUM = 0
+ASSIGN = 1
+
+
+class InstructionTable:
+    """
+    The instructions of a model lowered into flat arrays, to be consumed by the backend
+    compilers in tight loops instead of dispatching on the IR objects one by one.
+
+    Every instruction is a row: its kind (`QUANTUM` or `ASSIGN`), its opcode (an index
+    in `names`, shared by the quantum instructions and the called functions), the slot of
+    the assigned variable and the ranges of its target, control and argument slots in
+    the flat index arrays. Arguments are slots in `operands`: the variables (loaded by
+    name) come first, followed by the constants. Assignments of non-call values are not
+    lowered, since none of the backends evaluate them.
+
+    Ex:
+
+    ```
+    table = InstructionTable.from_model(model)
+    for kind, opcode, output, target, control, args in table.rows():
+        ...
+    ```
+
+    names (list[str]): the instruction and function names, indexed by opcode
+    symbols (list[str]): the variable names, indexed by slot
+    constants (list[Any]): the constant arguments, stored after the symbols in `operands`
+    kinds (np.ndarray): the kind of each instruction
+    opcodes (np.ndarray): the opcode of each instruction
+    outputs (np.ndarray): the slot of the assigned variable, `-1` for quantum instructions
+    targets (np.ndarray): the target qubits of all the instructions; an empty range
+        targets all the qubits
+    controls (np.ndarray): the control qubits of all the instructions
+    args (np.ndarray): the argument slots of all the instructions
+    target_offsets, control_offsets, arg_offsets (np.ndarray): the start of the range of
+        each instruction in `targets`, `controls` and `args`, followed by their size
+    attributes (dict[int, dict[str, Any]]): the attributes of the quantum instructions
+        having some, by row
+    """
+
+    __slots__ = (
+        "names",
+        "symbols",
+        "constants",
+        "kinds",
+        "opcodes",
+        "outputs",
+        "targets",
+        "controls",
+        "args",
+        "target_offsets",
+        "control_offsets",
+        "arg_offsets",
+        "attributes",
+    )
+
+    def __init__(self, instructions: list[Assign | QuInstruct]) -> None:
+        """
+        Args:
+            instructions (list[Assign | QuInstruct]): the instructions to lower, in order
+        """
+
+        names: dict[str, int] = dict()
+        symbols: dict[str, int] = dict()
+        # `1`, `1.0` and `True` are equal as keys, so constants are keyed with their type
+        constant_slots: dict[tuple[type, Any], int] = dict()
+        constants: list[Any] = []
+
+        kinds: list[int] = []
+        opcodes: list[int] = []
+        outputs: list[int] = []
+        targets: list[int] = []
+        controls: list[int] = []
+        args: list[int] = []
+        target_offsets = [0]
+        control_offsets = [0]
+        arg_offsets = [0]
+        attributes: dict[int, dict[str, Any]] = dict()
+
+        for instruction in instructions:
+            if isinstance(instruction, QuInstruct):
+                kinds.append(QUANTUM)
+                opcodes.append(names.setdefault(instruction.name, len(names)))
+                outputs.append(-1)
+                targets.extend(instruction.support.target)
+                controls.extend(instruction.support.control)
+                values = instruction.args
+                if instruction.attrs:
+                    attributes[len(kinds) - 1] = instruction.attrs
+            elif isinstance(instruction, Assign) and isinstance(instruction.value, Call):
+                kinds.append(ASSIGN)
+                opcodes.append(names.setdefault(instruction.value.identifier, len(names)))
+                outputs.append(symbols.setdefault(instruction.variable, len(symbols)))
+                values = instruction.value.args
+            else:
+                continue
+
+            for value in values:
+                if isinstance(value, Load):
+                    args.append(symbols.setdefault(value.variable, len(symbols)))
+                    continue
+                # constants are numbered with negative indices, as the number of symbols
+                # is only known at the end
+                try:
+                    key = (type(value), value)
+                    if key not in constant_slots:
+                        constant_slots[key] = len(constants)
+                        constants.append(value)
+                    args.append(~constant_slots[key])
+                except TypeError:
+                    args.append(~len(constants))
+                    constants.append(value)
+
+            target_offsets.append(len(targets))
+            control_offsets.append(len(controls))
+            arg_offsets.append(len(args))
+
+        self.names = list(names)
+        self.symbols = list(symbols)
+        self.constants = constants
+        self.kinds = np.array(kinds, dtype=np.int8)
+        self.opcodes = np.array(opcodes, dtype=np.int32)
+        self.outputs = np.array(outputs, dtype=np.int32)
+        self.targets = np.array(targets, dtype=np.int32)
+        self.controls = np.array(controls, dtype=np.int32)
+        self.args = np.array(args, dtype=np.int32)
+        is_constant = self.args < 0
+        self.args[is_constant] = len(self.symbols) + ~self.args[is_constant]
+        self.target_offsets = np.array(target_offsets, dtype=np.int32)
+        self.control_offsets = np.array(control_offsets, dtype=np.int32)
+        self.arg_offsets = np.array(arg_offsets, dtype=np.int32)
+        self.attributes = attributes
+
+    @classmethod
+    def from_model(cls, model: Model) -> InstructionTable:
+        return cls(model.instructions)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def operands(self) -> list[Any]:
+        """The variable names followed by the constants, indexed by argument slot."""
+
+        return [*self.symbols, *self.constants]
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the index arrays, in bytes."""
+
+        return sum(
+            getattr(self, name).nbytes
+            for name in self.__slots__
+            if isinstance(getattr(self, name), np.ndarray)
+        )
+
+    def rows(
+        self,
+    ) -> Iterator[tuple[int, int, int, tuple[int, ...], tuple[int, ...], tuple[int, ...]]]:
+        """
+        Iterates over the instructions.
+
+        Returns:
+            An iterator over the `(kind, opcode, output, target, control, args)` tuples of
+            the instructions, with plain integers.
+        """
+
+        targets = self.targets.tolist()
+        controls = self.controls.tolist()
+        args = self.args.tolist()
+        target_offsets = self.target_offsets.tolist()
+        control_offsets = self.control_offsets.tolist()
+        arg_offsets = self.arg_offsets.tolist()
+        for i, (kind, opcode, output) in enumerate(
+            zip(self.kinds.tolist(), self.opcodes.tolist(), self.outputs.tolist())
+        ):
+            yield (
+                kind,
+                opcode,
+                output,
+                tuple(targets[target_offsets[i] : target_offsets[i + 1]]),
+                tuple(controls[control_offsets[i] : control_offsets[i + 1]]),
+                tuple(args[arg_offsets[i] : arg_offsets[i + 1]]),
+            )
+
+    def to_instructions(self) -> list[Assign | QuInstruct]:
+        """
+        Converts the table back into IR instructions.
+
+        Returns:
+            The list of `Assign` and `QuInstruct` instructions.
+        """
+
+        operands = [Load(name) for name in self.symbols] + self.constants
+        instructions: list[Assign | QuInstruct] = []
+        for i, (kind, opcode, output, target, control, args) in enumerate(self.rows()):
+            values = [operands[arg] for arg in args]
+            if kind == ASSIGN:
+                call = Call(self.names[opcode], *values)
+                instructions.append(Assign(self.symbols[output], call))
+            else:
+                support = Support(target, control or None)
+                attributes = self.attributes.get(i, dict())
+                instructions.append(QuInstruct(self.names[opcode], support, *values, **attributes))
+        return instructions
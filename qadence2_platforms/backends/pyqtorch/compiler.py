@@ -5,11 +5,14 @@ from logging import getLogger
 import pyqtorch as pyq
 import torch
 from pyqtorch.quantum_operation import QuantumOperation
-from qadence2_ir.types import Alloc, Load, Model, QuInstruct
+from qadence2_ir.types import Alloc, Model
 
+from qadence2_platforms.backends.instructions import QUANTUM, InstructionTable
 from qadence2_platforms.backends.pyqtorch.embedding import Embedding
-from qadence2_platforms.backends.pyqtorch.interface import Interface
+from qadence2_platforms.backends.pyqtorch.interface import Interface, Precision, precision_dtypes
 from qadence2_platforms.backends.pyqtorch.register import RegisterInterface
+from qadence2_platforms.executor import ExecutionPolicy
+from qadence2_platforms.instrumentation import stage
 
 logger = getLogger(__name__)
 
@@ -34,55 +37,71 @@ class Compiler:
     def compile(
         self,
         model: Model,
+        dtype: torch.dtype = torch.complex128,
+        table: InstructionTable | None = None,
     ) -> pyq.QuantumCircuit:
         """
         Compiling IR model data to PyQTorch object function. It transforms model
         `QuInstruct`s into PyQTorch operators, resolving the SSA-form arguments
         into concrete values or valid PyQTorch parameters.
 
+        The instructions are read from their lowered `InstructionTable`, and the native
+        operator of each instruction name is only looked up once.
+
         Args:
             model (Model): IR model to compile
+            dtype (torch.dtype): complex dtype of the operators. Default is
+                `torch.complex128`
+            table (InstructionTable | None): the lowered instructions of the model, if
+                already computed
 
         Returns:
             A PyQTorch quantum circuit object with the model `QuInstruct`s compiled into
             PyQTorch operators
         """
 
+        table = table or InstructionTable.from_model(model)
+        # variables are passed to the operators by name, constants by value
+        operands = table.operands
+        native_ops: dict[int, QuantumOperation] = dict()
         pyq_operations = []
 
-        for instr in model.instructions:
+        for kind, opcode, _, target, control, args in table.rows():
 
-            if isinstance(instr, QuInstruct):
-                native_op: QuantumOperation = getattr(
-                    pyq, instr.name.upper(), self.instruction_mapping.get(instr.name)
-                )
-                control = instr.support.control
-                target = self._get_target(instr.support.target, model.register.num_qubits)
+            if kind == QUANTUM:
+                if opcode not in native_ops:
+                    name = table.names[opcode]
+                    native_ops[opcode] = getattr(
+                        pyq, name.upper(), self.instruction_mapping.get(name)
+                    )
+                native_op = native_ops[opcode]
+                target = self._get_target(target, model.register.num_qubits)
                 native_support = (*control, *target)
 
-                if len(instr.args) > 0:
-                    assert len(instr.args) == 1, "More than one arg not supported"
-                    (maybe_load,) = instr.args
-                    arg = maybe_load.variable if isinstance(maybe_load, Load) else maybe_load
-                    pyq_operations.append(native_op(native_support, arg).to(dtype=torch.complex128))
+                if len(args) > 0:
+                    assert len(args) == 1, "More than one arg not supported"
+                    arg = operands[args[0]]
+                    pyq_operations.append(native_op(native_support, arg).to(dtype=dtype))
 
                 else:
-                    pyq_operations.append(native_op(*native_support).to(dtype=torch.complex128))
+                    pyq_operations.append(native_op(*native_support).to(dtype=dtype))
 
-        return pyq.QuantumCircuit(model.register.num_qubits, pyq_operations).to(
-            dtype=torch.complex128
-        )
+        return pyq.QuantumCircuit(model.register.num_qubits, pyq_operations).to(dtype=dtype)
 
 
-def get_trainable_params(inputs: dict[str, Alloc]) -> dict[str, torch.Tensor]:
+def get_trainable_params(
+    inputs: dict[str, Alloc], dtype: torch.dtype = torch.float64
+) -> dict[str, torch.Tensor]:
     return {
-        param: torch.rand(value.size, requires_grad=True)
+        param: torch.rand(value.size, dtype=dtype, requires_grad=True)
         for param, value in inputs.items()
         if value.is_trainable
     }
 
 
-def compile_to_backend(model: Model) -> Interface:
+def compile_to_backend(
+    model: Model, precision: Precision = "double", policy: ExecutionPolicy | None = None
+) -> Interface:
     """
     Compiles the model data (IR information from expressions) into PyQTorch-compatible data and
     defines an Interface instance to be available to the user to invoke useful methods, such as
@@ -90,6 +109,11 @@ def compile_to_backend(model: Model) -> Interface:
 
     Args:
         model (Model): the IR model data to be compiled to PyQTorch-based backend
+        precision (Precision): `"double"` (complex128/float64, default) or `"single"`
+            (complex64/float32). Single precision halves the memory of the states and
+            speeds up large batches, at the cost of accuracy
+        policy (ExecutionPolicy | None): the execution policy of the interface calls, ex:
+            the number of torch intra-op threads
 
     Returns:
         The `Interface` instance based on PyQTorch backend
@@ -98,7 +122,18 @@ def compile_to_backend(model: Model) -> Interface:
     register_interface = RegisterInterface(
         model.register.num_qubits, model.register.options.get("init_state")
     )
-    embedding = Embedding(model)
-    native_circ = Compiler().compile(model)
-    vparams = get_trainable_params(model.inputs)
-    return Interface(register_interface, embedding, native_circ, vparams=vparams)
+    complex_dtype, real_dtype = precision_dtypes(precision)
+    with stage("compile.embedding", num_inputs=len(model.inputs)):
+        embedding = Embedding(model, dtype=real_dtype)
+    with stage("compile.circuit", num_qubits=model.register.num_qubits) as s:
+        native_circ = Compiler().compile(model, dtype=complex_dtype)
+        s.set(num_gates=len(native_circ.operations))
+    vparams = get_trainable_params(model.inputs, dtype=real_dtype)
+    return Interface(
+        register_interface,
+        embedding,
+        native_circ,
+        vparams=vparams,
+        precision=precision,
+        policy=policy,
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from logging import getLogger
-from typing import Any, Callable
+from typing import Callable
 
 import torch
 from qadence2_ir.types import Assign, Call, Load, Model
@@ -9,11 +9,13 @@ from qadence2_ir.types import Assign, Call, Load, Model
 logger = getLogger(__name__)
 
 
-def torch_call(call: Call) -> Callable[[dict, dict], torch.Tensor]:
+def torch_call(
+    call: Call, dtype: torch.dtype = torch.float64, device: torch.device | None = None
+) -> Callable[[dict, dict], torch.Tensor]:
     """
     Convert a `Call` object into a torchified function which can be evaluated using.
 
-    a vparams and inputs dict.
+    a vparams and inputs dict. Constants are created with `dtype` on `device`.
     """
     fn = getattr(torch, call.identifier)
 
@@ -23,7 +25,7 @@ def torch_call(call: Call) -> Callable[[dict, dict], torch.Tensor]:
             if isinstance(symbol, float):
                 # NOTE we compile constants into each TorchCallable instead of passing
                 # them around in the values dict
-                args.append(torch.tensor(symbol))
+                args.append(torch.tensor(symbol, dtype=dtype, device=device))
             elif isinstance(symbol, Load):
                 args.append({**params, **inputs}[symbol.variable])
         return fn(*args)
@@ -42,11 +44,12 @@ class ParameterBuffer(torch.nn.Module):
         self,
         trainable_vars: list[str],
         non_trainable_vars: list[str],
+        dtype: torch.dtype = torch.float64,
     ) -> None:
         super().__init__()
-        self.vparams = {p: torch.rand(1, requires_grad=True) for p in trainable_vars}
+        self.vparams = {p: torch.rand(1, dtype=dtype, requires_grad=True) for p in trainable_vars}
         self.fparams = {p: None for p in non_trainable_vars}
-        self._dtype = torch.float64
+        self._dtype = dtype
         self._device = torch.device("cpu")
 
     @property
@@ -57,19 +60,25 @@ class ParameterBuffer(torch.nn.Module):
     def dtype(self) -> torch.dtype:
         return self._dtype
 
-    def to(self, *args: Any, **kwargs: Any) -> ParameterBuffer:
-        self.vparams = {p: t.to(*args, **kwargs) for p, t in self.vparams.items()}
-        try:
-            k = next(iter(self.vparams))
-            t = self.vparams[k]
-            self._device = t.device
-            self._dtype = t.dtype
-        except Exception:
-            pass
+    def to(  # type: ignore [override]
+        self,
+        device: torch.device | str | None = None,
+        dtype: torch.dtype | None = None,
+    ) -> ParameterBuffer:
+        """Moves the trainable parameters to a device and/or precision, in place."""
+        if device is not None:
+            self._device = torch.device(device)
+        if dtype is not None:
+            self._dtype = dtype
+        # the moved parameters are kept as leaves, so they can still be trained
+        for p, t in self.vparams.items():
+            if t.device != self._device or t.dtype != self._dtype:
+                moved = t.detach().to(device=self._device, dtype=self._dtype)
+                self.vparams[p] = moved.requires_grad_(t.requires_grad)
         return self
 
     @classmethod
-    def from_model(cls, model: Model) -> ParameterBuffer:
+    def from_model(cls, model: Model, dtype: torch.dtype = torch.float64) -> ParameterBuffer:
         f_p = []
         v_p = []
         for param_name, alloc in model.inputs.items():
@@ -77,7 +86,7 @@ class ParameterBuffer(torch.nn.Module):
                 v_p.append(param_name)
             else:
                 f_p.append(param_name)
-        return ParameterBuffer(v_p, f_p)
+        return ParameterBuffer(v_p, f_p, dtype=dtype)
 
 
 class Embedding(torch.nn.Module):
@@ -89,10 +98,30 @@ class Embedding(torch.nn.Module):
         which can be results of function/expression evaluations.
     """
 
-    def __init__(self, model: Model) -> None:
+    def __init__(self, model: Model, dtype: torch.dtype = torch.float64) -> None:
         super().__init__()
-        self.param_buffer = ParameterBuffer.from_model(model)
-        self.var_to_torchcall: dict[str, Callable] = self.create_var_to_torchcall_mapping(model)
+        self.param_buffer = ParameterBuffer.from_model(model, dtype=dtype)
+        self.assignments: list[Assign] = [
+            instr for instr in model.instructions if isinstance(instr, Assign)
+        ]
+        self.var_to_torchcall: dict[str, Callable] = self.create_var_to_torchcall_mapping(
+            model, dtype
+        )
+
+    def to(  # type: ignore [override]
+        self,
+        device: torch.device | str | None = None,
+        dtype: torch.dtype | None = None,
+    ) -> Embedding:
+        """Moves the trainable parameters and the constants of the torch calls."""
+        self.param_buffer.to(device=device, dtype=dtype)
+        self.var_to_torchcall = {
+            assign.variable: torch_call(
+                assign.value, self.param_buffer.dtype, self.param_buffer.device
+            )
+            for assign in self.assignments
+        }
+        return self
 
     def __call__(self, inputs: dict[str, torch.Tensor]) -> dict[str, torch.Tensor]:
         """
@@ -121,9 +150,10 @@ class Embedding(torch.nn.Module):
     @staticmethod
     def create_var_to_torchcall_mapping(
         model: Model,
+        dtype: torch.dtype = torch.float64,
     ) -> dict[str, Callable[[dict, dict], torch.Tensor]]:
         assign_to_torch = dict()
         for instr in model.instructions:
             if isinstance(instr, Assign):
-                assign_to_torch[instr.variable] = torch_call(instr.value)
+                assign_to_torch[instr.variable] = torch_call(instr.value, dtype)
         return assign_to_torch
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Union, cast
+
+import pyqtorch as pyq
+import torch
+from qadence2_ir.types import Assign, Load
+from torch.nn import Module, ParameterDict
+
+from qadence2_platforms.backends.utils import InputType
+
+from .interface import Interface
+
+# argument of an assignment: a variable name or the index of a constant
+Argument = Union[str, int]
+
+
+class ExportedModel(Module):
+    """
+    A compiled model packaged as a standalone module with tensor-only inputs, to be served
+    with `torch.jit.trace`, `torch.export.export` or `torch.compile`.
+
+    The embedding is lowered into a flat list of torch calls evaluated once per forward,
+    instead of the closures the `Embedding` evaluates for every parametric gate, and the
+    circuit is run without the Python-level plumbing of the `Interface`. `forward` takes
+    the inputs as positional tensors, in the order of `input_names`, and returns the final
+    state or, if the model has an observable, its expectation values.
+
+    The native circuit and observable are kept out of the module tree, since the tracers
+    walk the submodules and pyqtorch's module hashing and cached properties break them;
+    their tensors are captured as constants. They are still moved by `to`.
+
+    input_names (tuple[str, ...]): names of the inputs, in the order of the `forward`
+        arguments
+    vparams (ParameterDict): the trainable parameters, shared with the interface
+    init_state (torch.Tensor): the initial state buffer
+    """
+
+    def __init__(
+        self,
+        circuit: pyq.QuantumCircuit,
+        init_state: torch.Tensor,
+        assignments: list[Assign],
+        input_names: list[str],
+        vparams: ParameterDict,
+        observable: pyq.Observable | None = None,
+        dtype: torch.dtype = torch.float64,
+    ) -> None:
+        super().__init__()
+        self.input_names = tuple(input_names)
+        self._native = (circuit, observable)
+        self.vparams = vparams
+        self.register_buffer("init_state", init_state)
+
+        constants: list[float] = []
+        self._program: list[tuple[str, Callable[..., torch.Tensor], tuple[Argument, ...]]] = []
+        for assign in assignments:
+            args: list[Argument] = []
+            for arg in assign.value.args:
+                if isinstance(arg, Load):
+                    args.append(arg.variable)
+                elif isinstance(arg, (int, float)):
+                    args.append(len(constants))
+                    constants.append(float(arg))
+                else:
+                    raise NotImplementedError(f"Argument '{arg}' cannot be exported.")
+            fn = getattr(torch, assign.value.identifier)
+            self._program.append((assign.variable, fn, tuple(args)))
+        self.register_buffer("constants", torch.tensor(constants, dtype=dtype))
+
+    @property
+    def circuit(self) -> pyq.QuantumCircuit:
+        return self._native[0]
+
+    @property
+    def observable(self) -> pyq.Observable | None:
+        return self._native[1]
+
+    def to(self, *args: Any, **kwargs: Any) -> ExportedModel:
+        for native in self._native:
+            if native is not None:
+                native.to(*args, **kwargs)
+        return cast(ExportedModel, super().to(*args, **kwargs))
+
+    @classmethod
+    def from_interface(
+        cls,
+        interface: Interface,
+        observable: list[InputType] | InputType | None = None,
+    ) -> ExportedModel:
+        """
+        Packages the circuit, embedding, initial state and observable of an interface.
+
+        :param interface: the pyqtorch `Interface` of the compiled model
+        :param observable: observables of the expectation values. Default is the interface
+            observable; without any, the module returns the final state
+        :return: the `ExportedModel`
+        """
+        native_observable = (
+            interface.native_observable(observable)
+            if observable is not None or interface.observable is not None
+            else None
+        )
+        return cls(
+            circuit=interface.circuit,
+            init_state=interface.init_state,
+            assignments=interface.embedding.assignments,
+            input_names=list(interface.embedding.param_buffer.fparams),
+            vparams=interface.vparams,
+            observable=native_observable,
+            dtype=interface._dtype,
+        )
+
+    def example_inputs(self, batch_size: int = 1) -> tuple[torch.Tensor, ...]:
+        """Random inputs of the given batch size, to trace or export the module with."""
+
+        return tuple(
+            torch.rand(batch_size, dtype=self.constants.dtype, device=self.constants.device)
+            for _ in self.input_names
+        )
+
+    def forward(self, *inputs: torch.Tensor) -> torch.Tensor:
+        if len(inputs) != len(self.input_names):
+            raise ValueError(f"Expected the inputs {list(self.input_names)}, got {len(inputs)}.")
+
+        values: dict[str, torch.Tensor] = dict(self.vparams.items())
+        values.update(zip(self.input_names, inputs))
+        for variable, fn, args in self._program:
+            values[variable] = fn(
+                *(self.constants[arg] if isinstance(arg, int) else values[arg] for arg in args)
+            )
+
+        state = self.circuit.run(self.init_state, values)
+        if self.observable is None:
+            return state
+        return self.observable.expectation(state, values)
+
+    def extra_repr(self) -> str:
+        return f"input_names={self.input_names}, num_assignments={len(self._program)}"
+
+
+def export(
+    interface: Interface,
+    observable: list[InputType] | InputType | None = None,
+    method: str | None = None,
+    batch_size: int = 1,
+    **options: Any,
+) -> Module | Any:
+    """
+    Exports a compiled pyqtorch model as a standalone module.
+
+    Ex:
+
+    ```
+    interface = compile_to_backend(model, "pyqtorch")
+    program = export(interface, observable=Z(0), method="export")
+    expvals = program.module()(x0, x1)
+    ```
+
+    Args:
+        interface (Interface): the pyqtorch `Interface` of the compiled model
+        observable (list[InputType] | InputType | None): observables of the expectation
+            values. Default is the interface observable; without any, the module returns
+            the final state
+        method (str | None): `None` returns the eager `ExportedModel`; `"trace"` uses
+            `torch.jit.trace`, `"export"` uses `torch.export.export` and `"compile"` uses
+            `torch.compile`
+        batch_size (int): batch size of the example inputs used by `"trace"` and
+            `"export"`. Exported programs only accept this batch size unless dynamic
+            shapes are passed in `options`
+        options: keyword arguments forwarded to the torch function
+
+    Returns:
+        The `ExportedModel`, the traced `ScriptModule`, the `ExportedProgram` or the
+        compiled module.
+    """
+
+    module = ExportedModel.from_interface(interface, observable)
+    match method:
+        case None:
+            return module
+        case "trace":
+            return torch.jit.trace(module, module.example_inputs(batch_size), **options)
+        case "export":
+            return torch.export.export(module, module.example_inputs(batch_size), **options)
+        case "compile":
+            return torch.compile(module, **options)
+        case _:
+            raise NotImplementedError(f"Export method '{method}' not implemented.")
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 from logging import getLogger
+from pathlib import Path
+from threading import Lock
 from typing import Any, Counter, Iterable, Literal, cast
 
+import numpy as np
 import pyqtorch as pyq
 import torch
-from pyqtorch.utils import DiffMode
+from pyqtorch.utils import DiffMode, counts_to_orderedcounter
 from torch.nn import ParameterDict
 
 from qadence2_platforms.abstracts import (
     AbstractInterface,
+    OutputEnum,
     RunEnum,
 )
 from qadence2_platforms.backends.utils import InputType
+from qadence2_platforms.executor import ExecutionPolicy, execution_scope
+from qadence2_platforms.instrumentation import stage
+from qadence2_platforms.utils.memory import MemoryEstimate
+from qadence2_platforms.utils.sampling import (
+    DistributionCache,
+    StreamingSampler,
+    parameters_key,
+)
+from qadence2_platforms.utils.shared_memory import ArrayHandle, export_array
 
 from .embedding import Embedding
 from .functions import parse_native_observables
@@ -20,6 +33,134 @@ from .register import RegisterInterface
 
 logger = getLogger(__name__)
 
+Precision = Literal["double", "single"]
+
+# number of shots of `sample` when not given, as in pyqtorch
+DEFAULT_SHOTS = 1000
+
+# complex (states and operators) and real (parameters) dtypes of each precision
+PRECISION_DTYPES: dict[str, tuple[torch.dtype, torch.dtype]] = {
+    "double": (torch.complex128, torch.float64),
+    "single": (torch.complex64, torch.float32),
+}
+
+
+def precision_dtypes(precision: Precision) -> tuple[torch.dtype, torch.dtype]:
+    """
+    Gets the torch dtypes of a precision mode.
+
+    :param precision: `"double"` (complex128/float64) or `"single"` (complex64/float32)
+    :return: the complex dtype of the states and operators, and the real dtype of the
+        parameters
+    """
+    if precision not in PRECISION_DTYPES:
+        raise ValueError(f"precision must be one of {list(PRECISION_DTYPES)}, got '{precision}'.")
+    return PRECISION_DTYPES[precision]
+
+
+class InputBinding:
+    """
+    Inputs of an `Interface` validated and cast to its precision once, to be reused across
+    calls. The binding owns its input tensors and updates them in place, so repeated calls
+    with same-shaped inputs skip the name checks, the dtype conversions, the merge with the
+    trainable parameters and, for `expectation`, the observable parsing.
+
+    It is created with `Interface.bind` and passed as `values` to `run`, `sample` or
+    `expectation`. Gradients flow to the trainable parameters as usual; updating an input
+    with a tensor requiring grad also records the copy in the graph. Bindings are placed
+    on the interface device and precision, so they must be recreated after `Interface.to`.
+
+    interface (Interface): the interface the inputs were validated against
+    inputs (dict[str, torch.Tensor]): the bound inputs, as passed to the embedding by
+        `run` and `sample`
+    values (dict[str, torch.Tensor]): the trainable parameters and the bound inputs, as
+        passed to the circuit by `expectation`
+    state (torch.Tensor): the initial state of the calls
+    observable (torch.nn.Module | None): the parsed native observable, if any
+    """
+
+    __slots__ = ("interface", "inputs", "values", "state", "observable")
+
+    def __init__(
+        self,
+        interface: Interface,
+        values: dict[str, torch.Tensor | float],
+        state: torch.Tensor | None = None,
+        observable: list[InputType] | InputType | None = None,
+    ) -> None:
+        expected = interface.embedding.param_buffer.fparams.keys()
+        missing = expected - values.keys()
+        if missing:
+            raise ValueError(f"Missing values for the inputs {sorted(missing)}.")
+        self._check_names(values, expected)
+
+        self.interface = interface
+        self.inputs: dict[str, torch.Tensor] = dict()
+        for name, value in values.items():
+            value = torch.as_tensor(value)
+            buffer = torch.empty_like(value, dtype=interface._dtype, device=interface.device)
+            self.inputs[name] = buffer.copy_(value)
+        self.values: dict[str, torch.Tensor] = {**interface.vparams, **self.inputs}
+
+        self.state = (
+            torch.empty_like(state, dtype=interface._complex_dtype, device=interface.device).copy_(
+                state
+            )
+            if state is not None
+            else interface.init_state
+        )
+
+        self.observable = None
+        if observable is not None or interface.observable is not None:
+            self.observable = interface.native_observable(observable)
+
+    @staticmethod
+    def _check_names(values: dict[str, Any], expected: Iterable[str]) -> None:
+        unknown = values.keys() - expected
+        if unknown:
+            raise ValueError(
+                f"Unknown inputs {sorted(unknown)}; trainable parameters are taken from the "
+                "interface and must not be bound."
+            )
+
+    def update(
+        self,
+        values: dict[str, torch.Tensor | float] | None = None,
+        state: torch.Tensor | None = None,
+    ) -> InputBinding:
+        """
+        Copies new values into the bound tensors, without allocating new ones. The shapes
+        must match the bound ones; create a new binding to change the batch size.
+
+        :param values: dictionary with some or all of the bound inputs
+        :param state: a new initial state, if the binding was created with one
+        :return: the binding itself
+        """
+        values = values or dict()
+        self._check_names(values, self.inputs.keys())
+        for name, value in values.items():
+            buffer = self.inputs[name]
+            if isinstance(value, torch.Tensor):
+                if value.shape != buffer.shape:
+                    raise ValueError(
+                        f"Input '{name}' is bound with shape {tuple(buffer.shape)}, "
+                        f"got {tuple(value.shape)}."
+                    )
+                buffer.copy_(value)
+            else:
+                buffer.fill_(value)
+
+        if state is not None:
+            if self.state is self.interface.init_state:
+                raise ValueError("The binding uses the interface initial state; bind a state.")
+            if state.shape != self.state.shape:
+                raise ValueError(
+                    f"The state is bound with shape {tuple(self.state.shape)}, "
+                    f"got {tuple(state.shape)}."
+                )
+            self.state.copy_(state)
+        return self
+
 
 class Interface(
     AbstractInterface[
@@ -31,7 +172,20 @@ class Interface(
         torch.Tensor,
     ],
 ):
-    """A class holding register, embedding, circuit, native backends and optional observable."""
+    """
+    A class holding register, embedding, circuit, native backends and optional observable.
+
+    An interface can be shared by several threads: the `run`, `sample` and `expectation`
+    calls keep their state local and do not modify the interface, and the lazily parsed
+    observable is guarded by a lock, and parsed again when `observable` is reassigned.
+    Methods changing the interface (`to`) and input bindings must not be used
+    concurrently. The number of torch intra-op threads of the calls is set by an
+    `ExecutionPolicy`, given to the interface or to each call.
+
+    The distributions of the final states are cached per resolved parameter set (values,
+    trainable parameters and initial state) in `distribution_cache`, so sampling the same
+    parameters again only draws new shots, without simulating the circuit.
+    """
 
     def __init__(
         self,
@@ -40,24 +194,114 @@ class Interface(
         circuit: pyq.QuantumCircuit,
         vparams: dict[str, torch.Tensor] = None,
         observable: list[InputType] | InputType | None = None,
+        precision: Precision = "double",
+        policy: ExecutionPolicy | None = None,
     ) -> None:
         super().__init__()
+        self.precision = precision
+        self.policy = policy
+        self._complex_dtype, self._dtype = precision_dtypes(precision)
         self.register = register
         self.init_state: torch.Tensor = (
             circuit.state_from_bitstring(register.init_state)
             if register.init_state is not None
             else circuit.init_state()
-        ).to(dtype=torch.complex128)
+        ).to(dtype=self._complex_dtype)
         self.embedding = embedding
         self.circuit = circuit
-        self.observable = observable
         self.vparams = ParameterDict(vparams)
-        self._dtype = torch.float64
+        # native version of `observable`, parsed on the first expectation call
+        self._native_observable: torch.nn.Module | None = None
+        self._lock = Lock()
+        self.observable = observable
+        self.distribution_cache = DistributionCache()
 
     @property
     def info(self) -> dict[str, Any]:
         return {"num_qubits": self.register.n_qubits}
 
+    @property
+    def device(self) -> torch.device:
+        return self.init_state.device
+
+    @property
+    def observable(self) -> list[InputType] | InputType | None:
+        return self._observable
+
+    @observable.setter
+    def observable(self, observable: list[InputType] | InputType | None) -> None:
+        # the cached native observable is parsed again from the new one
+        with self._lock:
+            self._observable = observable
+            self._native_observable = None
+
+    def to(
+        self,
+        device: torch.device | str | None = None,
+        dtype: torch.dtype | None = None,
+    ) -> Interface:
+        """
+        Moves the circuit, the embedding, the initial state, the trainable parameters and
+        the parsed observable to a device and/or precision, in place. The trainable
+        parameters keep their identity, so existing optimizers remain valid.
+
+        The `meta` device allocates no data: calls then only propagate the shapes, which
+        is useful to check a model and its inputs before running it. The data is lost, so
+        a meta interface cannot be moved back; compile the model again instead.
+
+        :param device: the target device, ex: `"cpu"`, `"cuda:0"` or `"meta"`
+        :param dtype: the target precision, as its complex (states and operators) or real
+            (parameters) dtype, ex: `torch.complex64` or `torch.float32` for `"single"`
+        :return: the interface itself
+        """
+        if dtype is not None:
+            precision = next(
+                (name for name, dtypes in PRECISION_DTYPES.items() if dtype in dtypes), None
+            )
+            if precision is None:
+                raise ValueError(f"No precision with the dtype '{dtype}'.")
+            self.precision = precision  # type: ignore [assignment]
+            self._complex_dtype, self._dtype = precision_dtypes(precision)  # type: ignore [arg-type]
+        device = torch.device(device) if device is not None else self.device
+
+        self.circuit.to(device=device, dtype=self._complex_dtype)
+        self.embedding.to(device=device, dtype=self._dtype)
+        self.init_state = self.init_state.to(device=device, dtype=self._complex_dtype)
+        for param in self.vparams.values():
+            moved = torch.nn.Parameter(
+                param.detach().to(device=device, dtype=self._dtype), param.requires_grad
+            )
+            if param.grad is not None:
+                moved.grad = param.grad.to(device=device, dtype=self._dtype)
+            # swapping keeps the parameter objects, unlike setting `data` across devices
+            torch.utils.swap_tensors(param, moved)
+        if self._native_observable is not None:
+            self._native_observable.to(device=device, dtype=self._complex_dtype)
+        return self
+
+    def native_observable(
+        self, observable: list[InputType] | InputType | None = None
+    ) -> torch.nn.Module:
+        """
+        Parses observables into a native pyqtorch observable, on the interface device and
+        precision. The interface observable is parsed once and cached.
+
+        :param observable: a list of observables. Default is the interface observable
+        :return: the native observable
+        """
+        if observable is not None:
+            return parse_native_observables(observable).to(  # type: ignore [arg-type]
+                device=self.device, dtype=self._complex_dtype
+            )
+        if self.observable is None:
+            raise ValueError("Observable must not be None for expectation run.")
+        with self._lock:
+            if self._native_observable is None:
+                self._native_observable = parse_native_observables(
+                    self.observable  # type: ignore [arg-type]
+                ).to(device=self.device, dtype=self._complex_dtype)
+        return self._native_observable
+
     @property
     def sequence(self) -> pyq.QuantumCircuit:
         return self.circuit
@@ -74,14 +318,40 @@ class Interface(
     def draw(self, values: dict[str, Any]) -> None:
         raise NotImplementedError("PyQTorch currently does not support drawing the circuit")
 
+    def bind(
+        self,
+        values: dict[str, torch.Tensor | float] | None = None,
+        state: torch.Tensor | None = None,
+        observable: list[InputType] | InputType | None = None,
+    ) -> InputBinding:
+        """
+        Validates and casts the inputs once, for repeated calls in tight loops.
+
+        Ex:
+
+        ```
+        binding = interface.bind({"x": x0}, observable=Z(0))
+        for x in data:
+            loss = interface.expectation(binding.update({"x": x})).sum()
+        ```
+
+        :param values: dictionary with all the (non-trainable) inputs of the model
+        :param state: an initial state to copy into the binding, if any
+        :param observable: observables to parse once for the `expectation` calls
+        :return: the `InputBinding` to pass as `values`
+        """
+        return InputBinding(self, values or dict(), state=state, observable=observable)
+
     def _run(
         self,
         run_type: RunEnum,
-        values: dict[str, torch.Tensor] | None = None,
+        values: dict[str, torch.Tensor] | InputBinding | None = None,
         state: torch.Tensor | None = None,
         shots: int | None = None,
         observable: list[InputType] | InputType | None = None,
         diff_mode: DiffMode = None,
+        policy: ExecutionPolicy | None = None,
+        seed: int | np.random.Generator | None = None,
         **_: Any,
     ) -> Any:
         """
@@ -95,81 +365,129 @@ class Interface(
         methods.
 
         :param run_type: str option as `run`, `sample` or `expectation`
-        :param values: dictionary of user-input parameters
+        :param values: dictionary of user-input parameters, or an `InputBinding` created
+            by `bind`
         :param callback: callback function to be used internally, if applicable
         :param state: a tensor containing the desired state to perform the execution from
         :param shots: number of shots, if applicable (`sample` only)
         :param observable: a list of observables, if applicable (`expectation` only)
-        :return: a tensor or list of values (`sample` only) of the calculated state
+        :param policy: the execution policy of the call. Default is the interface policy
+        :param seed: seed or generator of the shots (`sample` only)
+        :return: a tensor of the calculated state or, for `sample`, the `StreamingSampler`
+            holding the drawn shots
         """
 
         def set_dtype(data: dict[str, torch.Tensor] | None) -> dict[str, torch.Tensor] | None:
             if data is None:
                 return None
-            return {k: v.to(dtype=self._dtype) for k, v in data.items()}
-
-        inputs: dict[str, torch.Tensor] = set_dtype(values) or dict()
-        state = state.to(dtype=torch.complex128) if state is not None else self.init_state
-
-        match run_type:
-            case RunEnum.RUN:
-                return pyq.run(
-                    circuit=self.circuit,
-                    state=state,
-                    values=inputs,
-                    embedding=self.embedding,
-                )
-            case RunEnum.SAMPLE:
-                return pyq.sample(
-                    circuit=self.circuit,
-                    state=state,
-                    values=inputs,
-                    n_shots=shots,
-                    embedding=self.embedding,
-                )
-            case RunEnum.EXPECTATION:
-                if observable is not None or self.observable is not None:
-                    return pyq.expectation(
-                        circuit=self.circuit,
-                        state=state,
-                        values={**self.vparams, **inputs},
-                        observable=parse_native_observables(observable or self.observable),  # type: ignore [arg-type]
-                        embedding=self.embedding,
-                        diff_mode=diff_mode,
-                    )
-                raise ValueError("Observable must not be None for expectation run.")
-            case _:
-                raise NotImplementedError(f"Run type '{run_type}' not implemented.")
+            return {k: v.to(device=self.device, dtype=self._dtype) for k, v in data.items()}
+
+        native_observable = None
+        if isinstance(values, InputBinding):
+            # fast path: the values are already validated, cast and merged
+            if values.interface is not self:
+                raise ValueError("The input binding was created by another interface.")
+            inputs = values.inputs
+            params = values.values
+            if observable is None:
+                native_observable = values.observable
+        else:
+            inputs = set_dtype(values) or dict()
+            params = None
+        if state is not None:
+            state = state.to(device=self.device, dtype=self._complex_dtype)
+        else:
+            state = values.state if isinstance(values, InputBinding) else self.init_state
+
+        with (
+            execution_scope(policy or self.policy),
+            stage(
+                f"interface.{run_type.name.lower()}",
+                num_qubits=self.register.n_qubits,
+                num_gates=len(self.circuit.operations),
+            ),
+        ):
+            match run_type:
+                case RunEnum.RUN:
+                    with stage("circuit.run"):
+                        return pyq.run(
+                            circuit=self.circuit,
+                            state=state,
+                            values=inputs,
+                            embedding=self.embedding,
+                        )
+                case RunEnum.SAMPLE:
+                    sampler = self._distribution(inputs, state).spawn(seed)
+                    if shots:
+                        with stage("circuit.sample", shots=shots):
+                            sampler.sample(shots)
+                    return sampler
+                case RunEnum.EXPECTATION:
+                    if native_observable is None and (
+                        observable is not None or self.observable is not None
+                    ):
+                        with stage("observables.parse"):
+                            native_observable = self.native_observable(observable)
+                    if native_observable is not None:
+                        with stage("circuit.expectation", diff_mode=diff_mode):
+                            return pyq.expectation(
+                                circuit=self.circuit,
+                                state=state,
+                                values=params if params is not None else {**self.vparams, **inputs},
+                                observable=native_observable,
+                                embedding=self.embedding,
+                                diff_mode=diff_mode,
+                            )
+                    raise ValueError("Observable must not be None for expectation run.")
+                case _:
+                    raise NotImplementedError(f"Run type '{run_type}' not implemented.")
 
     def run(
         self,
-        values: dict[str, torch.Tensor] | None = None,
+        values: dict[str, torch.Tensor] | InputBinding | None = None,
         state: torch.Tensor | None = None,
+        output: OutputEnum = OutputEnum.NATIVE,
+        output_dir: str | Path | None = None,
         **kwargs: Any,
-    ) -> torch.Tensor:
-        return self._run(RunEnum.RUN, values=values, state=state, **kwargs)
+    ) -> torch.Tensor | ArrayHandle:
+        """
+        Computes the final state.
+
+        :param values: dictionary of user-input parameters, or an `InputBinding`
+        :param state: a tensor containing the desired state to perform the execution from
+        :param output: `NATIVE` returns the tensor, `SHARED_MEMORY` and `MEMMAP` store the
+            state data (detached from the graph) and return a handle to it, which other
+            processes can attach to without copying
+        :param output_dir: directory of the file for the `MEMMAP` output mode
+        :return: the final state tensor or a handle to its data
+        """
+        result = self._run(RunEnum.RUN, values=values, state=state, **kwargs)
+        if output == OutputEnum.NATIVE:
+            return cast(torch.Tensor, result)
+        return export_array(result.detach().cpu().numpy(), output, output_dir)
 
     def sample(
         self,
-        values: dict[str, torch.Tensor] | None = None,
+        values: dict[str, torch.Tensor] | InputBinding | None = None,
         shots: int | None = None,
         state: torch.Tensor | None = None,
         **kwargs: Any,
     ) -> list[Counter]:
-        return cast(
-            list,
-            self._run(
-                RunEnum.SAMPLE,
-                values=values,
-                shots=shots,
-                state=state,
-                **kwargs,
-            ),
+        sampler = self._run(
+            RunEnum.SAMPLE,
+            values=values,
+            shots=DEFAULT_SHOTS if shots is None else shots,
+            state=state,
+            **kwargs,
         )
+        return [
+            counts_to_orderedcounter(torch.from_numpy(counts), self.register.n_qubits)
+            for counts in cast(StreamingSampler, sampler).counts
+        ]
 
     def expectation(
         self,
-        values: dict[str, torch.Tensor] | None = None,
+        values: dict[str, torch.Tensor] | InputBinding | None = None,
         observable: list[InputType] | InputType | None = None,
         state: torch.Tensor | None = None,
         diff_mode: DiffMode = DiffMode.AD,
@@ -184,5 +502,119 @@ class Interface(
             **kwargs,
         )
 
+    def sampler(
+        self,
+        values: dict[str, torch.Tensor] | InputBinding | None = None,
+        state: torch.Tensor | None = None,
+        seed: int | np.random.Generator | None = None,
+        **kwargs: Any,
+    ) -> StreamingSampler:
+        """
+        Returns a sampler of the final state distribution, to draw large numbers of shots
+        in bounded-size chunks or individual shots (see `StreamingSampler`). The final
+        state is only computed if the distribution is not in `distribution_cache`.
+
+        :param values: dictionary of user-input parameters, or an `InputBinding`
+        :param state: a tensor containing the desired state to perform the execution from
+        :param seed: seed or generator of the draws
+        :return: the `StreamingSampler` of the final state distribution, one per batch
+            element, with an empty histogram
+        """
+        sampler = self._run(
+            RunEnum.SAMPLE, values=values, state=state, shots=0, seed=seed, **kwargs
+        )
+        return cast(StreamingSampler, sampler)
+
+    def _distribution(
+        self, inputs: dict[str, torch.Tensor], state: torch.Tensor
+    ) -> StreamingSampler:
+        # the embedding reads the trainable parameters of its buffer, unless given as inputs
+        values = {**self.embedding.param_buffer.vparams, **inputs}
+        key = parameters_key(values, state, self.precision, str(self.device))
+        sampler = self.distribution_cache.get(key)
+        if sampler is None:
+            with torch.no_grad(), stage("circuit.run"):
+                final_state = pyq.run(
+                    circuit=self.circuit, state=state, values=inputs, embedding=self.embedding
+                )
+                probabilities = final_state.abs().pow(2).reshape(2**self.register.n_qubits, -1).T
+            sampler = StreamingSampler(probabilities.cpu().numpy())
+            self.distribution_cache.put(key, sampler)
+        return sampler
+
+    def memory_estimate(
+        self,
+        values: dict[str, torch.Tensor] | InputBinding | None = None,
+        run_type: RunEnum = RunEnum.RUN,
+        observable: list[InputType] | InputType | None = None,
+        shots: int | None = None,
+        state: torch.Tensor | None = None,
+        diff_mode: DiffMode = DiffMode.AD,
+        **_: Any,
+    ) -> MemoryEstimate:
+        """
+        Estimates the peak memory of a `run`, `sample` or `expectation` call, without
+        running it. The batch size is taken from `values` and `state`.
+
+        When gradients are tracked (autograd enabled and inputs or trainable parameters
+        requiring them), the intermediate state of every gate is kept for the backward
+        pass, which usually dominates the memory.
+
+        :param values: dictionary of user-input parameters
+        :param run_type: the kind of call: `run`, `sample` or `expectation`
+        :param observable: list of observables, if applicable
+        :param shots: number of shots, if applicable (`sample` only)
+        :param state: the initial state of the call, if any
+        :param diff_mode: the differentiation mode of the call (`expectation` only)
+        :return: the `MemoryEstimate` of the call
+        """
+        if isinstance(values, InputBinding):
+            state = values.state if state is None else state
+            values = values.values
+        values = values or dict()
+        batch_sizes = [v.numel() for v in values.values() if isinstance(v, torch.Tensor)]
+        if state is not None:
+            batch_sizes.append(state.shape[-1])
+        batch_size = max(batch_sizes, default=1)
+
+        itemsize = self.init_state.element_size()
+        state_bytes = 2**self.register.n_qubits * batch_size * itemsize
+
+        requires_grad = torch.is_grad_enabled() and (
+            any(isinstance(v, torch.Tensor) and v.requires_grad for v in values.values())
+            or (
+                run_type == RunEnum.EXPECTATION
+                and diff_mode == DiffMode.AD
+                and any(p.requires_grad for p in self.vparams.values())
+            )
+        )
+        num_gates = len(self.circuit.operations)
+        # initial, current and next states, plus one state per gate for the backward pass
+        num_states = 3 + (num_gates if requires_grad else 0)
+
+        operators = sum(
+            4 ** len(op.qubit_support) * batch_size * itemsize for op in self.circuit.operations
+        )
+
+        num_observables = 0
+        if run_type == RunEnum.EXPECTATION:
+            obs = observable or self.observable
+            num_observables = len(obs) if isinstance(obs, list) else 1
+        # each observable term is applied to a copy of the state
+        observables = (num_observables + 1) * state_bytes if num_observables else 0
+
+        workspace = 0
+        if run_type == RunEnum.SAMPLE:
+            # probabilities of the final state and the drawn shots
+            workspace = 2**self.register.n_qubits * batch_size * 8 + (shots or 0) * 8
+
+        return MemoryEstimate(
+            state=state_bytes,
+            num_states=num_states,
+            operators=operators,
+            observables=observables,
+            workspace=workspace,
+        )
+
     def __call__(self, *args: Any, **kwargs: Any) -> torch.Tensor:
         return self.run(*args, **kwargs)
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-from typing import cast
+from typing import Any, cast
 
 from qadence2_ir.types import Model
 
+from qadence2_platforms.instrumentation import stage
 from qadence2_platforms.utils.module_importer import module_loader
 
 from .abstracts import AbstractInterface as Interface
 
 
-def compile_to_backend(model: Model, backend: str) -> Interface:
+def compile_to_backend(model: Model, backend: str, **options: Any) -> Interface:
     """
     Function that gets a `Model` (Qadence IR) and a backend name, and.
 
@@ -18,8 +19,16 @@ def compile_to_backend(model: Model, backend: str) -> Interface:
 
     :param model: (Model) qadence IR
     :param backend: (str) the backend to be used to execute the Model
+    :param options: backend-specific compilation options, ex: `precision="single"` for
+        the `pyqtorch` backend
     :return: (Interface) interface instance of the chosen backend
     """
 
-    plat = module_loader(backend)
-    return cast(Interface, plat.compile_to_backend(model))
+    with stage(
+        "compile",
+        backend=backend,
+        num_qubits=model.register.num_qubits,
+        num_instructions=len(model.instructions),
+    ):
+        plat = module_loader(backend)
+        return cast(Interface, plat.compile_to_backend(model, **options))
@@ -0,0 +1,510 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+from qadence2_ir.types import Model
+
+from qadence2_platforms.abstracts import AbstractInterface, RunEnum
+from qadence2_platforms.utils.module_importer import module_loader
+from qadence2_platforms.utils.shared_memory import SharedArrayHandle
+
+logger = getLogger(__name__)
+
+# compiled interfaces held by each worker process, keyed by model hash
+_WORKER_INTERFACES: dict[str, AbstractInterface] = dict()
+
+_RUN_METHODS = {
+    RunEnum.RUN: "run",
+    RunEnum.SAMPLE: "sample",
+    RunEnum.EXPECTATION: "expectation",
+}
+
+# torch's intra-op thread count is process-global: calls applying a policy share it and
+# calls with a different thread count wait until it is released
+_POLICY_CONDITION = threading.Condition()
+_POLICY_STATE: dict[str, Any] = {"num_threads": None, "previous": None, "users": 0}
+_POLICY_LOCAL = threading.local()
+
+
+@dataclass(frozen=True)
+class ExecutionPolicy:
+    """
+    Execution settings of the interface calls.
+
+    num_threads (int | None): number of torch intra-op threads used by each call.
+        `None` keeps the current setting
+    """
+
+    num_threads: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.num_threads is not None and self.num_threads < 1:
+            raise ValueError(f"num_threads must be positive, got {self.num_threads}.")
+
+
+@contextmanager
+def execution_scope(policy: ExecutionPolicy | None) -> Iterator[None]:
+    """
+    Applies an execution policy within a `with` block.
+
+    Since `torch.set_num_threads` is process-global, concurrent scopes with the same
+    thread count run together, while a scope with a different count waits for them to
+    finish instead of changing the count under their feet. The previous count is
+    restored when the last scope exits. Nested scopes in the same thread keep the
+    outermost policy. Nothing is done if torch is not imported.
+
+    Args:
+        policy (ExecutionPolicy | None): the policy to apply, if any
+    """
+
+    torch = sys.modules.get("torch")
+    nested = getattr(_POLICY_LOCAL, "depth", 0) > 0
+    if policy is None or policy.num_threads is None or torch is None or nested:
+        yield
+        return
+
+    with _POLICY_CONDITION:
+        _POLICY_CONDITION.wait_for(
+            lambda: _POLICY_STATE["users"] == 0
+            or _POLICY_STATE["num_threads"] == policy.num_threads
+        )
+        if _POLICY_STATE["users"] == 0:
+            _POLICY_STATE["previous"] = torch.get_num_threads()
+            _POLICY_STATE["num_threads"] = policy.num_threads
+            torch.set_num_threads(policy.num_threads)
+        _POLICY_STATE["users"] += 1
+
+    _POLICY_LOCAL.depth = 1
+    try:
+        yield
+    finally:
+        _POLICY_LOCAL.depth = 0
+        with _POLICY_CONDITION:
+            _POLICY_STATE["users"] -= 1
+            if _POLICY_STATE["users"] == 0:
+                torch.set_num_threads(_POLICY_STATE["previous"])
+                _POLICY_STATE["num_threads"] = None
+            _POLICY_CONDITION.notify_all()
+
+
+def model_hash(model: Model) -> str:
+    """
+    Computes a stable hash of an IR model, to be used as key for compiled models.
+
+    Args:
+        model (Model): the IR model
+
+    Returns:
+        The hexadecimal digest of the model.
+    """
+
+    return hashlib.sha256(repr(model).encode()).hexdigest()
+
+
+class _SharedResult:
+    """A result whose array data was moved into shared memory by a worker process."""
+
+    def __init__(self, kind: str, handle: SharedArrayHandle, meta: Any = None) -> None:
+        self.kind = kind
+        self.handle = handle
+        self.meta = meta
+
+    @classmethod
+    def pack(cls, result: Any) -> Any:
+        torch = sys.modules.get("torch")
+        qutip = sys.modules.get("qutip")
+
+        if torch is not None and isinstance(result, torch.Tensor):
+            return cls("torch", SharedArrayHandle.from_array(result.detach().cpu().numpy()))
+        if qutip is not None and isinstance(result, qutip.Qobj):
+            return cls("qobj", SharedArrayHandle.from_array(result.full()), result.dims)
+        if isinstance(result, np.ndarray):
+            return cls("numpy", SharedArrayHandle.from_array(result))
+        return result
+
+    def unpack(self) -> Any:
+        array = self.handle.to_numpy()
+        match self.kind:
+            case "torch":
+                import torch
+
+                return torch.from_numpy(array)
+            case "qobj":
+                import qutip
+
+                return qutip.Qobj(array, dims=self.meta)
+            case _:
+                return array
+
+
+def _init_worker(backend: str, models: dict[str, Model]) -> None:
+    module = module_loader(backend)
+    for key, model in models.items():
+        _WORKER_INTERFACES[key] = module.compile_to_backend(model)
+
+
+def _execute(
+    key: str,
+    run_type: RunEnum,
+    values: dict[str, Any] | None,
+    kwargs: dict[str, Any],
+    shared: bool,
+) -> Any:
+    interface = _WORKER_INTERFACES[key]
+    result = getattr(interface, _RUN_METHODS[run_type])(values=values, **kwargs)
+    return _SharedResult.pack(result) if shared else result
+
+
+def _resolve(future: Future) -> Any:
+    result = future.result()
+    return result.unpack() if isinstance(result, _SharedResult) else result
+
+
+def _resolving_future(future: Future) -> Future:
+    """
+    Wraps the future of a job, so that the results sent through shared memory are read
+    and their blocks released as soon as the job is done, whether or not the caller
+    asks for the result.
+    """
+
+    resolved: Future = Future()
+
+    def resolve(done: Future) -> None:
+        if done.cancelled():
+            resolved.cancel()
+            return
+        try:
+            result = _resolve(done)
+        except BaseException as error:
+            outcome, value = resolved.set_exception, error
+        else:
+            outcome, value = resolved.set_result, result
+        try:
+            outcome(value)
+        except InvalidStateError:
+            # the caller cancelled the job meanwhile; the block is released anyway
+            pass
+
+    resolved.add_done_callback(lambda f: f.cancelled() and future.cancel())
+    future.add_done_callback(resolve)
+    return resolved
+
+
+class SimulationPool:
+    """
+    A pool of warm worker processes holding compiled backend interfaces.
+
+    Each worker imports the backend and compiles the registered models once, when it
+    starts. Jobs only carry the model key and the parameter values, and array results
+    (state vectors) are sent back through shared memory instead of being pickled. They
+    are copied out of it, and the block released, as soon as each job is done.
+
+    Results already exported by the interfaces (e.g. `run` with
+    `output=OutputEnum.SHARED_MEMORY`) are returned as handles, so the caller can
+    attach to the states without any copy. The handles stay valid after the pool is
+    shut down, until the caller releases them.
+
+    Notice: trainable parameters are initialized independently by each worker when
+    compiling; pass them in `values` to pin their values across workers.
+
+    Ex:
+
+    ```
+    with SimulationPool("pyqtorch", num_workers=4) as pool:
+        key = pool.register(model)
+        states = pool.map(key, RunEnum.RUN, [{"x": torch.rand(1)} for _ in range(100)])
+    ```
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        num_workers: int | None = None,
+        mp_context: str | None = None,
+        shared_results: bool = True,
+    ) -> None:
+        """
+        Args:
+            backend (str): the backend name, as given to `compile_to_backend`
+            num_workers (int | None): number of worker processes. Default is the number
+                of CPUs
+            mp_context (str | None): multiprocessing start method, ex: `"spawn"`. Default
+                is the platform's default
+            shared_results (bool): whether to send array results back through shared
+                memory. Default is `True`
+        """
+
+        self._backend = backend
+        self._num_workers = num_workers or multiprocessing.cpu_count()
+        self._mp_context = multiprocessing.get_context(mp_context) if mp_context else None
+        self._shared_results = shared_results
+        self._models: dict[str, Model] = dict()
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def models(self) -> dict[str, Model]:
+        return self._models
+
+    def register(self, model: Model) -> str:
+        """
+        Registers a model to be compiled by the workers. Registering a new model after
+        the workers started restarts them, so models should preferably be registered
+        before submitting jobs.
+
+        Args:
+            model (Model): the IR model
+
+        Returns:
+            The model key to be used when submitting jobs.
+        """
+
+        key = model_hash(model)
+        if key not in self._models:
+            self._models[key] = model
+            if self._executor is not None:
+                logger.info("restarting workers to compile a newly registered model.")
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        return key
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._num_workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(self._backend, self._models),
+            )
+        return self._executor
+
+    def warmup(self) -> None:
+        """Starts all the workers, so they import the backend and compile the models."""
+
+        executor = self._get_executor()
+        futures = [executor.submit(int) for _ in range(self._num_workers)]
+        for future in futures:
+            future.result()
+
+    def submit(
+        self,
+        key: str,
+        run_type: RunEnum,
+        values: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Submits a job to the pool.
+
+        Args:
+            key (str): the model key returned by `register`
+            run_type (RunEnum): whether to `run`, `sample` or compute the `expectation`
+            values (dict[str, Any] | None): the parameter values
+            kwargs: extra arguments given to the interface method, ex: `shots`
+
+        Returns:
+            A future whose result is the interface method output, with the array results
+            already read from shared memory.
+        """
+
+        if key not in self._models:
+            raise KeyError(f"model '{key}' is not registered in the pool.")
+
+        future = self._get_executor().submit(
+            _execute, key, run_type, values, kwargs, self._shared_results
+        )
+        return _resolving_future(future)
+
+    @staticmethod
+    def result(future: Future) -> Any:
+        """
+        Waits for a submitted job and returns its result, as `future.result()`.
+
+        Args:
+            future (Future): the future returned by `submit`
+
+        Returns:
+            The job result.
+        """
+
+        return future.result()
+
+    def map(
+        self,
+        key: str,
+        run_type: RunEnum,
+        values: Iterable[dict[str, Any] | None],
+        **kwargs: Any,
+    ) -> list[Any]:
+        """
+        Runs a sweep over parameter values and gathers the results in order.
+
+        Args:
+            key (str): the model key returned by `register`
+            run_type (RunEnum): whether to `run`, `sample` or compute the `expectation`
+            values (Iterable[dict[str, Any] | None]): the parameter values of each job
+            kwargs: extra arguments given to the interface method, ex: `shots`
+
+        Returns:
+            The list of results, in the same order as `values`.
+        """
+
+        futures = [self.submit(key, run_type, vals, **kwargs) for vals in values]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> SimulationPool:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.shutdown()
+
+
+def _execute_in_scope(
+    policy: ExecutionPolicy,
+    interface: AbstractInterface,
+    run_type: RunEnum,
+    values: dict[str, Any] | None,
+    kwargs: dict[str, Any],
+) -> Any:
+    with execution_scope(policy):
+        return getattr(interface, _RUN_METHODS[run_type])(values=values, **kwargs)
+
+
+class ThreadPoolRunner:
+    """
+    A pool of threads running the calls of compiled interfaces shared between them.
+
+    The cores are partitioned across the concurrent calls: each call runs with
+    `num_threads` torch intra-op threads, `num_cores // num_workers` by default, so the
+    workers do not oversubscribe the cores as they would with torch's default of one
+    thread per core each. Heavy torch and NumPy operations release the GIL, so the
+    calls do run in parallel.
+
+    The interfaces can be shared by the workers: their calls do not modify them, and
+    their lazy caches are guarded by locks. Methods changing an interface (ex: `to`) and
+    input bindings must not be used concurrently.
+
+    Ex:
+
+    ```
+    with ThreadPoolRunner(num_workers=4) as runner:
+        expvals = runner.map(interface, RunEnum.EXPECTATION, batches, observable=Z(0))
+    ```
+    """
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        num_threads: int | None = None,
+        num_cores: int | None = None,
+    ) -> None:
+        """
+        Args:
+            num_workers (int | None): number of concurrent calls. Default is the number
+                of cores
+            num_threads (int | None): intra-op threads of each call. Default is the
+                number of cores divided by the number of workers
+            num_cores (int | None): number of cores to partition. Default is the number
+                of CPUs available to the process
+        """
+
+        self._num_cores = num_cores or _available_cores()
+        self._num_workers = num_workers or self._num_cores
+        self.policy = ExecutionPolicy(num_threads or max(1, self._num_cores // self._num_workers))
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def num_cores(self) -> int:
+        return self._num_cores
+
+    def submit(
+        self,
+        interface: AbstractInterface,
+        run_type: RunEnum,
+        values: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Submits a call to the pool.
+
+        Args:
+            interface (AbstractInterface): the compiled interface
+            run_type (RunEnum): whether to `run`, `sample` or compute the `expectation`
+            values (dict[str, Any] | None): the parameter values
+            kwargs: extra arguments given to the interface method, ex: `shots`
+
+        Returns:
+            A future whose result is the interface method output.
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._num_workers)
+        return self._executor.submit(
+            _execute_in_scope, self.policy, interface, run_type, values, kwargs
+        )
+
+    def map(
+        self,
+        interface: AbstractInterface,
+        run_type: RunEnum,
+        values: Iterable[dict[str, Any] | None],
+        **kwargs: Any,
+    ) -> list[Any]:
+        """
+        Runs a sweep over parameter values and gathers the results in order.
+
+        Args:
+            interface (AbstractInterface): the compiled interface
+            run_type (RunEnum): whether to `run`, `sample` or compute the `expectation`
+            values (Iterable[dict[str, Any] | None]): the parameter values of each call
+            kwargs: extra arguments given to the interface method, ex: `shots`
+
+        Returns:
+            The list of results, in the same order as `values`.
+        """
+
+        futures = [self.submit(interface, run_type, vals, **kwargs) for vals in values]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> ThreadPoolRunner:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.shutdown()
+
+
+def _available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# sinks receiving the stage records; instrumentation is disabled while it is empty
+_SINKS: list[Sink] = []
+
+# innermost running stage, used to nest the stages of a call
+_CURRENT_STAGE: ContextVar[Stage | None] = ContextVar("current_stage", default=None)
+
+
+class Stage:
+    """
+    A timed section of a compilation or execution call, such as the sequence build or
+    the emulator solve. It is created by `stage` and sent to the active sinks when it
+    starts and when it ends.
+
+    name (str): the stage name, ex: `"emulator.solve"`
+    attributes (dict[str, Any]): sizes and settings of the stage, ex: `num_qubits`
+    parent (Stage | None): the stage it is nested into, if any
+    start_ns (int): wall-clock start time, in nanoseconds since the epoch
+    duration_ns (int): duration of the stage, in nanoseconds
+    error (str | None): name of the exception raised inside the stage, if any
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "parent",
+        "start_ns",
+        "duration_ns",
+        "error",
+        "_t0",
+        "_token",
+    )
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.parent: Stage | None = None
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """Duration of the stage, in seconds."""
+
+        return self.duration_ns * 1e-9
+
+    @property
+    def path(self) -> str:
+        """Names of the enclosing stages and this one, joined by `/`."""
+
+        return self.name if self.parent is None else f"{self.parent.path}/{self.name}"
+
+    def set(self, **attributes: Any) -> None:
+        """Adds attributes known only while the stage runs, ex: the number of gates."""
+
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> Stage:
+        self.parent = _CURRENT_STAGE.get()
+        self._token = _CURRENT_STAGE.set(self)
+        self.start_ns = time.time_ns()
+        for sink in _SINKS:
+            sink.on_start(self)
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._t0
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _CURRENT_STAGE.reset(self._token)
+        for sink in _SINKS:
+            sink.on_end(self)
+
+
+class _NullStage:
+    """Stage returned while instrumentation is disabled; it does nothing."""
+
+    __slots__ = ()
+
+    def set(self, **_: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NullStage:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, **attributes: Any) -> Stage | _NullStage:
+    """
+    Creates a timed stage to be used as a context manager. While no sink is active, a
+    shared no-op object is returned, so disabled instrumentation costs one function
+    call. Attributes must therefore be cheap to compute (ex: `len` of a list).
+
+    Ex:
+
+    ```
+    with stage("emulator.solve", num_qubits=n) as s:
+        result = simulation.run()
+        s.set(num_states=len(result.states))
+    ```
+
+    Args:
+        name (str): the stage name
+        attributes: sizes and settings of the stage
+
+    Returns:
+        The stage context manager.
+    """
+
+    if not _SINKS:
+        return _NULL_STAGE
+    return Stage(name, attributes)
+
+
+def enabled() -> bool:
+    """Whether any sink is active."""
+
+    return bool(_SINKS)
+
+
+def add_sink(sink: Sink) -> None:
+    """Activates a sink, enabling the instrumentation."""
+
+    if sink not in _SINKS:
+        _SINKS.append(sink)
+
+
+def remove_sink(sink: Sink) -> None:
+    """Deactivates a sink. The instrumentation is disabled when no sink is left."""
+
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+@contextmanager
+def instrument(*sinks: Sink) -> Iterator[tuple[Sink, ...]]:
+    """
+    Activates the given sinks within a `with` block.
+
+    Ex:
+
+    ```
+    with instrument(MemorySink()) as (sink,):
+        interface.run(values)
+    print(sink.summary())
+    ```
+
+    Args:
+        sinks: the sinks to activate
+
+    Returns:
+        The activated sinks.
+    """
+
+    for sink in sinks:
+        add_sink(sink)
+    try:
+        yield sinks
+    finally:
+        for sink in sinks:
+            remove_sink(sink)
+
+
+class Sink(ABC):
+    """Receives the stages emitted by the instrumented code."""
+
+    def on_start(self, stage: Stage) -> None:
+        """Called when a stage starts. Its duration is not known yet."""
+        pass
+
+    @abstractmethod
+    def on_end(self, stage: Stage) -> None:
+        """Called when a stage ends."""
+        pass
+
+
+class LoggingSink(Sink):
+    """Logs each stage duration and attributes."""
+
+    def __init__(self, log: logging.Logger | None = None, level: int = logging.INFO) -> None:
+        """
+        Args:
+            log (logging.Logger | None): the logger to write to. Default is this module's
+                logger
+            level (int): the logging level. Default is `logging.INFO`
+        """
+
+        self._logger = log or logger
+        self._level = level
+
+    def on_end(self, stage: Stage) -> None:
+        self._logger.log(
+            self._level,
+            "%s: %.3f ms %s%s",
+            stage.path,
+            stage.duration_ns * 1e-6,
+            stage.attributes,
+            f" ({stage.error})" if stage.error else "",
+        )
+
+
+class MemorySink(Sink):
+    """Keeps the ended stages in memory and aggregates their durations."""
+
+    def __init__(self) -> None:
+        self.stages: list[Stage] = []
+
+    def on_end(self, stage: Stage) -> None:
+        self.stages.append(stage)
+
+    def clear(self) -> None:
+        self.stages.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Aggregates the durations by stage name.
+
+        Returns:
+            A dictionary with the `count` and the `total`, `mean`, `min` and `max`
+            durations (in seconds) of each stage name.
+        """
+
+        durations: dict[str, list[float]] = dict()
+        for s in self.stages:
+            durations.setdefault(s.name, []).append(s.duration)
+
+        return {
+            name: {
+                "count": len(values),
+                "total": sum(values),
+                "mean": sum(values) / len(values),
+                "min": min(values),
+                "max": max(values),
+            }
+            for name, values in durations.items()
+        }
+
+
+class OpenTelemetrySink(Sink):
+    """
+    Exports the stages as OpenTelemetry spans, nested as the stages are. It requires
+    the `opentelemetry-api` package; exporters are configured through the OpenTelemetry
+    SDK as usual.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        """
+        Args:
+            tracer (opentelemetry.trace.Tracer | None): the tracer creating the spans.
+                Default is the global tracer provider's one
+        """
+
+        try:
+            from opentelemetry import trace
+        except ImportError as err:
+            raise ImportError(
+                "`OpenTelemetrySink` requires the `opentelemetry-api` package."
+            ) from err
+
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer(__name__)
+        self._spans: dict[int, Any] = dict()
+
+    def on_start(self, stage: Stage) -> None:
+        parent = self._spans.get(id(stage.parent)) if stage.parent is not None else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        self._spans[id(stage)] = self._tracer.start_span(
+            stage.name, context=context, start_time=stage.start_ns
+        )
+
+    def on_end(self, stage: Stage) -> None:
+        span = self._spans.pop(id(stage), None)
+        if span is None:
+            return
+
+        for key, value in stage.attributes.items():
+            if value is not None:
+                span.set_attribute(
+                    key, value if isinstance(value, (bool, int, float, str)) else str(value)
+                )
+        if stage.error is not None:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, stage.error))
+        span.end(end_time=stage.start_ns + stage.duration_ns)
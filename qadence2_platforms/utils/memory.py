@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import ctypes
+import os
+import sys
+import threading
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from qadence2_platforms.instrumentation import Sink, Stage
+
+
+@dataclass(frozen=True)
+class MemoryEstimate:
+    """
+    Predicted peak memory of an interface call, in bytes, split by what holds it. The
+    values are estimates of the dominant allocations (states and operators), meant to
+    admit or reject jobs before running them, not exact figures.
+
+    state (int): size of a single state (vector or density matrix)
+    num_states (int): number of states held at once, including the stored trajectory
+    operators (int): size of the native operators, ex: hamiltonian or gate matrices
+    observables (int): size of the native observables and their intermediate results
+    workspace (int): temporary buffers used by the solver or the sampling
+    """
+
+    state: int
+    num_states: int
+    operators: int = 0
+    observables: int = 0
+    workspace: int = 0
+
+    @property
+    def trajectory(self) -> int:
+        """Size of all the states held at once."""
+
+        return self.state * self.num_states
+
+    @property
+    def total(self) -> int:
+        """Estimated peak memory of the call."""
+
+        return self.trajectory + self.operators + self.observables + self.workspace
+
+    def fits(self, available: int | None = None, margin: float = 0.8) -> bool:
+        """
+        Checks whether the call is expected to fit in memory.
+
+        Args:
+            available (int | None): the memory budget in bytes. Default is the memory
+                currently available on the system
+            margin (float): fraction of the budget that can be used. Default is `0.8`
+
+        Returns:
+            `True` if the estimated total is within the budget, or if the available
+            memory cannot be determined.
+        """
+
+        available = available if available is not None else available_memory()
+        if available is None:
+            return True
+        return self.total <= available * margin
+
+    def as_dict(self) -> dict[str, int]:
+        return {**asdict(self), "trajectory": self.trajectory, "total": self.total}
+
+    def __str__(self) -> str:
+        return (
+            f"MemoryEstimate(total={format_bytes(self.total)}, "
+            f"state={format_bytes(self.state)} x {self.num_states}, "
+            f"operators={format_bytes(self.operators)}, "
+            f"observables={format_bytes(self.observables)}, "
+            f"workspace={format_bytes(self.workspace)})"
+        )
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def available_memory() -> int | None:
+    """
+    Gets the memory currently available on the system.
+
+    Returns:
+        The available memory in bytes, or `None` if it cannot be determined on this
+        platform.
+    """
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def max_rss() -> int:
+    """Peak resident memory of the process so far, in bytes (`0` if unknown)."""
+
+    try:
+        import resource
+    except ImportError:
+        # not available on Windows
+        return 0
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and in kilobytes elsewhere
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+
+class _MallInfo2(ctypes.Structure):
+    _fields_ = [
+        (name, ctypes.c_size_t)
+        for name in (
+            "arena",
+            "ordblks",
+            "smblks",
+            "hblks",
+            "hblkhd",
+            "usmblks",
+            "fsmblks",
+            "uordblks",
+            "fordblks",
+            "keepcost",
+        )
+    ]
+
+
+def _load_mallinfo2() -> Any:
+    # glibc 2.33+ only
+    try:
+        mallinfo2 = ctypes.CDLL(None).mallinfo2
+    except (OSError, AttributeError, TypeError):
+        return None
+    mallinfo2.restype = _MallInfo2
+    return mallinfo2
+
+
+_mallinfo2 = _load_mallinfo2()
+
+
+def heap_in_use() -> int | None:
+    """
+    Gets the memory currently allocated through `malloc`, which holds the NumPy arrays
+    and the torch CPU tensors.
+
+    Returns:
+        The allocated memory in bytes, or `None` if it cannot be read on this platform
+        (it is read from glibc's `mallinfo2`).
+    """
+
+    if _mallinfo2 is None:
+        return None
+    info = _mallinfo2()
+    return int(info.uordblks + info.hblkhd)
+
+
+def current_rss() -> int | None:
+    """
+    Gets the current resident memory of the process.
+
+    Returns:
+        The resident memory in bytes, or `None` if it cannot be read on this platform
+        (it is read from `/proc`, on Linux).
+    """
+
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class MemorySampler:
+    """
+    Samples the memory of the process in a background thread, to measure the peak of a
+    call including the allocations `tracemalloc` does not see, ex: torch tensors. It
+    reads the memory allocated through `malloc` where glibc reports it (see
+    `heap_in_use`), or else the resident memory, which only grows when the allocator
+    maps new pages, so memory reused from blocks freed earlier is not counted. Peaks
+    shorter than the sampling interval can be missed, unless they raise the process
+    high-water mark (see `max_rss`).
+
+    interval (float): the time between two samples, in seconds
+    """
+
+    def __init__(self, interval: float = 1e-3) -> None:
+        self.interval = interval
+        self._probe: Callable[[], int | None] = (
+            heap_in_use if _mallinfo2 is not None else current_rss
+        )
+        self._start = 0
+        self._start_max_rss = 0
+        self._peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        memory = self._probe()
+        if memory is None:
+            return
+        self._start = self._peak = memory
+        self._start_max_rss = max_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, self._probe() or 0)
+
+    def stop(self) -> int:
+        """
+        Stops the sampling.
+
+        Returns:
+            The peak memory since `start`, on top of the memory used before it, in
+            bytes (`0` if it cannot be measured on this platform).
+        """
+
+        if self._thread is None:
+            return 0
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        peak = max(self._peak, self._probe() or 0)
+        end_max_rss = max_rss()
+        if self._probe is current_rss and end_max_rss > self._start_max_rss:
+            # the call raised the high-water mark, which catches the shortest peaks
+            peak = max(peak, end_max_rss)
+        return max(peak - self._start, 0)
+
+
+def _cuda() -> Any:
+    # only if torch was already imported by a backend and uses a GPU
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available() and torch.cuda.is_initialized():
+        return torch.cuda
+    return None
+
+
+@dataclass(frozen=True)
+class MemoryRecord:
+    """
+    Actual memory of a tracked call.
+
+    name (str): the stage name of the call, ex: `"interface.run"`
+    attributes (dict[str, Any]): the stage attributes, ex: `num_qubits`
+    peak (int): peak of the memory traced by `tracemalloc` during the call, on top of
+        the memory allocated before it, in bytes. It covers NumPy and QuTiP data, but
+        not torch tensors, which use their own allocator
+    sampled_peak (int): peak memory of the process during the call, on top of the
+        memory used before it, in bytes (see `MemorySampler`). It accounts for the
+        allocations on the CPU, including torch tensors; `0` where it cannot be measured
+    device_peak (int): peak of the memory allocated by torch on the current CUDA device
+        during the call, on top of the memory allocated before it, in bytes; `0`
+        without a GPU
+    max_rss (int): peak resident memory of the process at the end of the call, in bytes.
+        It is a high-water mark over the lifetime of the process, not of the call
+    """
+
+    name: str
+    attributes: dict[str, Any]
+    peak: int
+    sampled_peak: int
+    device_peak: int
+    max_rss: int
+
+
+class MemoryTracker(Sink):
+    """
+    Instrumentation sink recording the peak memory of each top-level call, i.e.
+    `compile_to_backend` and the interface `run`, `sample` and `expectation` calls:
+    the Python allocations traced by `tracemalloc`, the process memory sampled in the
+    background, covering the torch tensors of the PyQTorch backend, and the memory
+    allocated by torch on the GPU. Tracing the allocations slows the calls down, so it
+    is meant to be enabled on demand.
+
+    The calls can run concurrently, ex: through a `ThreadPoolRunner`. The memory is
+    measured for the whole process, so the peaks of overlapping calls include the
+    allocations of each other and are upper bounds of their own.
+
+    Ex:
+
+    ```
+    with instrument(MemoryTracker()) as (tracker,):
+        interface.run(values)
+    print(tracker.records[-1].sampled_peak)
+    ```
+    """
+
+    def __init__(self, interval: float = 1e-3) -> None:
+        """
+        Args:
+            interval (float): the time between two samples of the process memory, in
+                seconds. Default is `1e-3`
+        """
+
+        self.records: list[MemoryRecord] = []
+        self._interval = interval
+        self._started_tracing = False
+        # baselines and sampler of each running top-level stage, by `id(stage)`
+        self._running: dict[int, tuple[int, int, MemorySampler]] = dict()
+        self._lock = threading.Lock()
+
+    def on_start(self, stage: Stage) -> None:
+        if stage.parent is not None:
+            return
+        sampler = MemorySampler(self._interval)
+        with self._lock:
+            cuda = _cuda()
+            if not self._running:
+                # the peaks are global, they are only reset when no other call is tracked
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                tracemalloc.reset_peak()
+                if cuda is not None:
+                    cuda.reset_peak_memory_stats()
+            baseline, _ = tracemalloc.get_traced_memory()
+            device_baseline = cuda.memory_allocated() if cuda is not None else 0
+            self._running[id(stage)] = (baseline, device_baseline, sampler)
+        sampler.start()
+
+    def on_end(self, stage: Stage) -> None:
+        if stage.parent is not None:
+            return
+        with self._lock:
+            state = self._running.pop(id(stage), None)
+        if state is None:
+            return
+        baseline, device_baseline, sampler = state
+        sampled_peak = sampler.stop()
+        with self._lock:
+            _, peak = tracemalloc.get_traced_memory()
+            cuda = _cuda()
+            device_peak = cuda.max_memory_allocated() - device_baseline if cuda else 0
+            self.records.append(
+                MemoryRecord(
+                    stage.name,
+                    dict(stage.attributes),
+                    max(peak - baseline, 0),
+                    sampled_peak,
+                    max(device_peak, 0),
+                    max_rss(),
+                )
+            )
+            if not self._running and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def clear(self) -> None:
+        self.records.clear()
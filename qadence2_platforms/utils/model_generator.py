@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+from qadence2_ir.types import (
+    Alloc,
+    AllocQubits,
+    Assign,
+    Call,
+    Load,
+    Model,
+    QuInstruct,
+    Support,
+)
+
+# functions available both on the PyQTorch embedding (torch) and the analog sequence
+# builder (numpy)
+CHAIN_CALLS = ("mul", "add", "sin", "cos")
+
+# offset added to the end of the assignment chains, so the encoded angles are positive
+# and above the minimal pulse duration of the analog devices
+ANGLE_OFFSET = 1.0
+
+
+def _rng(seed: int | np.random.Generator | None) -> np.random.Generator:
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def assign_chain(
+    rng: np.random.Generator,
+    prefix: str,
+    sources: list[str],
+    length: int,
+) -> tuple[list[Assign], str]:
+    """
+    Creates a chain of SSA assignments, each one applying a random function to the
+    previous result and, eventually, to one of the `sources` variables. The chain
+    always ends with a positive offset, so its result can be used as an angle.
+
+    Args:
+        rng (np.random.Generator): the random generator
+        prefix (str): prefix of the assigned variables names, ex: `"%0_"`
+        sources (list[str]): names of the variables the chain can load
+        length (int): number of assignments, at least 1
+
+    Returns:
+        The list of `Assign` instructions and the name of the last assigned variable.
+    """
+
+    instructions: list[Assign] = []
+    previous = Load(sources[int(rng.integers(len(sources)))])
+
+    for k in range(length - 1):
+        fn = CHAIN_CALLS[int(rng.integers(len(CHAIN_CALLS)))]
+        match fn:
+            case "mul":
+                call = Call(fn, float(rng.uniform(0.1, 2.0)), previous)
+            case "add":
+                call = Call(fn, previous, Load(sources[int(rng.integers(len(sources)))]))
+            case _:
+                call = Call(fn, previous)
+        instructions.append(Assign(f"{prefix}{k}", call))
+        previous = Load(f"{prefix}{k}")
+
+    name = f"{prefix}{length - 1}"
+    instructions.append(Assign(name, Call("add", ANGLE_OFFSET, previous)))
+    return instructions, name
+
+
+def hea(
+    num_qubits: int,
+    depth: int,
+    seed: int | np.random.Generator | None = None,
+    rotations: tuple[str, ...] = ("rx", "ry", "rz"),
+    entangle: bool = True,
+) -> Model:
+    """
+    Generates a hardware-efficient ansatz: each layer applies a random rotation from
+    `rotations` to every qubit, with its own trainable parameter, followed by a ladder
+    of `not` gates. The model has `depth * num_qubits` trainable inputs.
+
+    Args:
+        num_qubits (int): number of qubits
+        depth (int): number of layers
+        seed (int | np.random.Generator | None): seed or random generator
+        rotations (tuple[str, ...]): rotation gates to choose from
+        entangle (bool): whether to add the entangling ladders. Default is `True`
+
+    Returns:
+        The IR model.
+    """
+
+    rng = _rng(seed)
+    inputs: dict[str, Alloc] = dict()
+    instructions: list[Assign | QuInstruct] = []
+
+    for layer in range(depth):
+        for q in range(num_qubits):
+            param = f"theta_{layer}_{q}"
+            inputs[param] = Alloc(size=1, trainable=True)
+            gate = rotations[int(rng.integers(len(rotations)))]
+            instructions.append(QuInstruct(gate, Support(target=(q,)), Load(param)))
+
+        if entangle:
+            for q in range(num_qubits - 1):
+                instructions.append(QuInstruct("not", Support(target=(q + 1,), control=(q,))))
+
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits),
+        inputs=inputs,
+        instructions=instructions,
+        directives={"digital": True},
+    )
+
+
+def feature_map(
+    num_qubits: int,
+    num_features: int,
+    depth: int = 1,
+    chain_length: int = 1,
+    seed: int | np.random.Generator | None = None,
+    analog: bool = False,
+) -> Model:
+    """
+    Generates a feature map: each layer encodes the non-trainable features through
+    chains of `chain_length` random assignments.
+
+    In the digital version, every qubit gets its own chain and `ry` rotation, followed
+    by a ladder of `not` gates. In the analog version, each layer computes a single
+    chain, used by global `rx` and `ry` rotations, as supported by the analog backends.
+
+    Args:
+        num_qubits (int): number of qubits
+        num_features (int): number of non-trainable inputs
+        depth (int): number of layers. Default is `1`
+        chain_length (int): number of `Assign` instructions per chain. Default is `1`
+        seed (int | np.random.Generator | None): seed or random generator
+        analog (bool): whether to generate the analog version. Default is `False`
+
+    Returns:
+        The IR model.
+    """
+
+    rng = _rng(seed)
+    features = [f"x_{k}" for k in range(num_features)]
+    instructions: list[Assign | QuInstruct] = []
+
+    for layer in range(depth):
+        if analog:
+            chain, angle = assign_chain(rng, f"%{layer}_", features, chain_length)
+            instructions.extend(chain)
+            instructions.append(QuInstruct("rx", Support.target_all(), Load(angle)))
+            instructions.append(QuInstruct("ry", Support.target_all(), Load(angle)))
+            continue
+
+        for q in range(num_qubits):
+            chain, angle = assign_chain(rng, f"%{layer}_{q}_", features, chain_length)
+            instructions.extend(chain)
+            instructions.append(QuInstruct("ry", Support(target=(q,)), Load(angle)))
+        for q in range(num_qubits - 1):
+            instructions.append(QuInstruct("not", Support(target=(q + 1,), control=(q,))))
+
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits),
+        inputs={name: Alloc(size=1, trainable=False) for name in features},
+        instructions=instructions,
+        directives={} if analog else {"digital": True},
+    )
+
+
+def local_shift_schedule(
+    num_qubits: int,
+    num_pulses: int,
+    seed: int | np.random.Generator | None = None,
+    num_targets: int | None = None,
+) -> Model:
+    """
+    Generates an analog schedule alternating global `dyn_pulse`s and `local_pulse`s
+    applied through a detuning map on random targets with random shifts. Each pulse has
+    its own non-trainable duration and amplitude (or detuning) inputs.
+
+    The local pulses need a device with a DMM channel, such as the `fresnel1` backend.
+
+    Args:
+        num_qubits (int): number of qubits
+        num_pulses (int): number of global and local pulse pairs
+        seed (int | np.random.Generator | None): seed or random generator
+        num_targets (int | None): number of qubits with local shifts. Default is a random
+            number between 1 and `num_qubits`
+
+    Returns:
+        The IR model.
+    """
+
+    rng = _rng(seed)
+    num_targets = num_targets or int(rng.integers(1, num_qubits + 1))
+    targets = sorted(int(q) for q in rng.choice(num_qubits, size=num_targets, replace=False))
+    shifts = [float(s) for s in rng.uniform(0.1, 2 * np.pi, size=num_targets)]
+
+    inputs: dict[str, Alloc] = dict()
+    instructions: list[Assign | QuInstruct] = []
+
+    for k in range(num_pulses):
+        for name in (f"t_{k}", f"omega_{k}", f"delta_{k}", f"tl_{k}", f"dl_{k}"):
+            inputs[name] = Alloc(size=1, trainable=False)
+
+        instructions.append(
+            QuInstruct(
+                "dyn_pulse",
+                Support.target_all(),
+                Load(f"t_{k}"),
+                Load(f"omega_{k}"),
+                Load(f"delta_{k}"),
+                float(rng.uniform(0.0, 2 * np.pi)),
+            )
+        )
+        instructions.append(
+            QuInstruct("local_pulse", Support.target_all(), Load(f"tl_{k}"), Load(f"dl_{k}"))
+        )
+
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits),
+        inputs=inputs,
+        instructions=instructions,
+        directives={"local_targets": targets, "local_shifts": shifts},
+    )
+
+
+def piecewise_schedule(
+    num_qubits: int,
+    num_segments: int,
+    num_pulses: int = 1,
+    seed: int | np.random.Generator | None = None,
+) -> Model:
+    """
+    Generates an analog schedule made of `piecewise_pulse`s, each one with
+    `num_segments` linear ramps. The durations, amplitudes and detunings are
+    time-dependent (array) inputs, so the model is only supported by the `analog`
+    backend.
+
+    Args:
+        num_qubits (int): number of qubits
+        num_segments (int): number of ramps per pulse
+        num_pulses (int): number of piecewise pulses. Default is `1`
+        seed (int | np.random.Generator | None): seed or random generator
+
+    Returns:
+        The IR model.
+    """
+
+    rng = _rng(seed)
+    inputs: dict[str, Alloc] = dict()
+    instructions: list[Assign | QuInstruct] = []
+
+    for k in range(num_pulses):
+        inputs[f"durations_{k}"] = Alloc(size=num_segments, trainable=False)
+        inputs[f"omegas_{k}"] = Alloc(size=num_segments + 1, trainable=False)
+        inputs[f"deltas_{k}"] = Alloc(size=num_segments + 1, trainable=False)
+        instructions.append(
+            QuInstruct(
+                "piecewise_pulse",
+                Support.target_all(),
+                Load(f"durations_{k}"),
+                Load(f"omegas_{k}"),
+                Load(f"deltas_{k}"),
+                float(rng.uniform(0.0, 2 * np.pi)),
+            )
+        )
+
+    return Model(
+        register=AllocQubits(num_qubits=num_qubits),
+        inputs=inputs,
+        instructions=instructions,
+        directives={},
+    )
+
+
+def random_inputs(
+    model: Model,
+    seed: int | np.random.Generator | None = None,
+    low: float = 0.1,
+    high: float = 1.0,
+    include_trainable: bool = False,
+) -> dict[str, Any]:
+    """
+    Draws uniform random values for the model inputs. The default range keeps the
+    pulse durations, amplitudes and detunings of the generated analog schedules within
+    the devices' limits.
+
+    Args:
+        model (Model): the IR model
+        seed (int | np.random.Generator | None): seed or random generator
+        low (float): lower bound of the values. Default is `0.1`
+        high (float): upper bound of the values. Default is `1.0`
+        include_trainable (bool): whether to also draw the trainable inputs. Default is
+            `False`
+
+    Returns:
+        A dictionary with a float for each scalar input and a NumPy array for each
+        time-dependent input.
+    """
+
+    rng = _rng(seed)
+    values: dict[str, Any] = dict()
+    for name, alloc in model.inputs.items():
+        if alloc.is_trainable and not include_trainable:
+            continue
+        draw = rng.uniform(low, high, size=alloc.size)
+        values[name] = float(draw[0]) if alloc.size == 1 else draw
+    return values
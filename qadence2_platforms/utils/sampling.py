@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Iterator, Mapping, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# shots drawn per chunk by default
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# distributions kept per interface by default
+DEFAULT_CACHE_SIZE = 8
+
+
+class StreamingSampler:
+    """
+    Draws shots from a fixed probability distribution in bounded-size chunks, keeping a
+    running histogram.
+
+    Each chunk is drawn as a histogram (a multinomial draw) rather than as individual
+    shots, so the memory is bounded by the number of outcomes whatever the number of
+    shots. Sampling can stop early, once the standard error of the estimated
+    probabilities reaches a precision target. Individual shots, ex: for bootstrapping,
+    are drawn by `draw` in O(shots log(num_outcomes)) from the cumulative distribution,
+    computed once.
+
+    Ex:
+
+    ```
+    sampler = interface.sampler(values)
+    for chunk in sampler.stream(10**8, precision=1e-4):
+        ...
+    print(sampler.num_shots, sampler.counters())
+    ```
+
+    probabilities (np.ndarray): the distributions, of shape `[batch_size, num_outcomes]`
+    outcomes (list[str]): the bitstring of each outcome
+    cumulative (np.ndarray): the cumulative distributions, used by `draw`
+    counts (np.ndarray): the running histogram, of the same shape as `probabilities`
+    num_shots (int): number of shots drawn so far, for each batch element
+    """
+
+    def __init__(
+        self,
+        probabilities: ArrayLike,
+        outcomes: Sequence[str] | None = None,
+        seed: int | np.random.Generator | None = None,
+    ) -> None:
+        """
+        Args:
+            probabilities (ArrayLike): the probabilities of the outcomes, of shape
+                `[num_outcomes]` or `[batch_size, num_outcomes]`. They are normalized
+            outcomes (Sequence[str] | None): the bitstring of each outcome. Default is
+                the binary representation of the outcome index, with the first qubit as
+                the most significant bit
+            seed (int | np.random.Generator | None): seed or generator of the draws
+        """
+
+        probabilities = np.atleast_2d(np.asarray(probabilities, dtype=np.float64))
+        probabilities = np.clip(probabilities, 0.0, None)
+        self.probabilities = probabilities / probabilities.sum(axis=-1, keepdims=True)
+
+        num_outcomes = self.probabilities.shape[-1]
+        if outcomes is None:
+            width = max(1, int(num_outcomes - 1).bit_length())
+            outcomes = [np.binary_repr(i, width=width) for i in range(num_outcomes)]
+        elif len(outcomes) != num_outcomes:
+            raise ValueError(f"Expected {num_outcomes} outcomes, got {len(outcomes)}.")
+        self.outcomes = list(outcomes)
+        self.cumulative = np.cumsum(self.probabilities, axis=-1)
+
+        self.counts = np.zeros(self.probabilities.shape, dtype=np.int64)
+        self.num_shots = 0
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def standard_error(self) -> float:
+        """
+        Largest standard error of the estimated probabilities, `sqrt(p (1 - p) / N)` with
+        the estimates `p` of the running histogram (`inf` before any shot).
+        """
+
+        if self.num_shots == 0:
+            return float("inf")
+        estimates = self.counts / self.num_shots
+        return float(np.sqrt(np.max(estimates * (1 - estimates)) / self.num_shots))
+
+    def stream(
+        self,
+        shots: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        precision: float | None = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Draws shots chunk by chunk, adding them to the running histogram.
+
+        Args:
+            shots (int): the maximum number of shots to draw
+            chunk_size (int): the number of shots of each chunk
+            precision (float | None): target of `standard_error`; sampling stops after
+                the first chunk reaching it. If `None`, all the shots are drawn
+
+        Returns:
+            An iterator over the histogram of each chunk, of shape
+            `[batch_size, num_outcomes]`.
+        """
+
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+
+        remaining = shots
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            chunk = self._rng.multinomial(size, self.probabilities)
+            self.counts += chunk
+            self.num_shots += size
+            remaining -= size
+            yield chunk
+            if precision is not None and self.standard_error <= precision:
+                return
+
+    def sample(
+        self,
+        shots: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        precision: float | None = None,
+    ) -> np.ndarray:
+        """
+        Draws shots until `shots` or the `precision` target is reached.
+
+        Args:
+            shots (int): the maximum number of shots to draw
+            chunk_size (int): the number of shots of each chunk
+            precision (float | None): target of `standard_error`. If `None`, all the
+                shots are drawn
+
+        Returns:
+            The running histogram.
+        """
+
+        for _ in self.stream(shots, chunk_size=chunk_size, precision=precision):
+            pass
+        return self.counts
+
+    def draw(self, shots: int) -> np.ndarray:
+        """
+        Draws individual shots, without adding them to the running histogram.
+
+        Args:
+            shots (int): the number of shots
+
+        Returns:
+            The outcome indices of the shots, of shape `[batch_size, shots]`.
+        """
+
+        uniform = self._rng.random((len(self.probabilities), shots))
+        # the cumulative sums may end slightly below 1
+        uniform *= self.cumulative[:, -1:]
+        indices = np.stack(
+            [np.searchsorted(cdf, u, side="right") for cdf, u in zip(self.cumulative, uniform)]
+        )
+        return np.minimum(indices, self.probabilities.shape[-1] - 1)
+
+    def spawn(self, seed: int | np.random.Generator | None = None) -> StreamingSampler:
+        """
+        Creates a sampler of the same distribution, sharing its arrays, with an empty
+        histogram.
+
+        Args:
+            seed (int | np.random.Generator | None): seed or generator of the draws
+
+        Returns:
+            The new `StreamingSampler`.
+        """
+
+        sampler = copy.copy(self)
+        sampler.counts = np.zeros_like(self.counts)
+        sampler.num_shots = 0
+        sampler._rng = np.random.default_rng(seed)
+        return sampler
+
+    def counters(self) -> list[Counter]:
+        """The running histogram as bitstring counters, one per batch element."""
+
+        return [
+            Counter({self.outcomes[i]: int(counts[i]) for i in np.flatnonzero(counts)})
+            for counts in self.counts
+        ]
+
+    def reset(self) -> None:
+        """Clears the running histogram."""
+
+        self.counts[:] = 0
+        self.num_shots = 0
+
+
+def parameters_key(values: Mapping[str, Any], *extra: Any) -> str:
+    """
+    Computes a digest of resolved parameter values, to be used as cache key.
+
+    Args:
+        values (Mapping[str, Any]): the parameter values: numbers, arrays or tensors
+        extra: other objects distinguishing the calls: tensors by their data, other
+            objects by their `repr`
+
+    Returns:
+        The hexadecimal digest.
+    """
+
+    digest = hashlib.sha1()
+    for name in sorted(values):
+        digest.update(name.encode())
+        _update_digest(digest, values[name])
+    for item in extra:
+        _update_digest(digest, item)
+    return digest.hexdigest()
+
+
+def _update_digest(digest: Any, value: Any) -> None:
+    if hasattr(value, "detach"):
+        value = value.detach().cpu().numpy()
+    if isinstance(value, (np.ndarray, np.generic, int, float, complex)):
+        array = np.ascontiguousarray(value)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+
+class DistributionCache:
+    """
+    A thread-safe LRU cache of samplers, keyed by resolved parameter sets (see
+    `parameters_key`). Interfaces use it to sample the same circuit and parameters
+    repeatedly without simulating it again.
+
+    maxsize (int): the maximum number of distributions kept; `0` disables the cache
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._samplers: OrderedDict[str, StreamingSampler] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> StreamingSampler | None:
+        with self._lock:
+            sampler = self._samplers.get(key)
+            if sampler is not None:
+                self._samplers.move_to_end(key)
+            return sampler
+
+    def put(self, key: str, sampler: StreamingSampler) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._samplers[key] = sampler
+            self._samplers.move_to_end(key)
+            while len(self._samplers) > self.maxsize:
+                self._samplers.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samplers.clear()
+
+    def __len__(self) -> int:
+        return len(self._samplers)
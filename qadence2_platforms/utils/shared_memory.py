@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from qadence2_platforms.abstracts import OutputEnum
+
+
+def _untracked_shared_memory(name: str | None = None, size: int = 0) -> SharedMemory:
+    """
+    Creates or attaches to a shared memory block without registering it with the
+    resource tracker of the process. Before Python 3.13, the tracker unlinks the blocks
+    a process created or attached to when it exits, ex: a pool worker, while the blocks
+    handed over through `SharedArrayHandle` are owned by their receiver.
+    """
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, create=name is None, size=size, track=False)
+
+    shm = SharedMemory(name=name, create=name is None, size=size)
+    # the blocks are only tracked on POSIX systems, by their name with a leading slash
+    if os.name == "posix":
+        resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+    return shm
+
+
+class SharedArray:
+    """
+    An array attached to a shared memory block or a memory-mapped file. The views it
+    gives share the underlying memory, so no data is copied. The object must be kept
+    alive (and not closed) while its views are in use.
+    """
+
+    def __init__(self, array: np.ndarray, owner: Any = None) -> None:
+        self._array = array
+        self._owner = owner
+
+    def numpy(self) -> np.ndarray:
+        """Returns a NumPy view of the shared data."""
+
+        return self._array
+
+    def torch(self) -> Any:
+        """Returns a torch tensor view of the shared data."""
+
+        import torch
+
+        return torch.from_numpy(self._array)
+
+    def close(self) -> None:
+        """Detaches from the shared data. Views must not be used afterwards."""
+
+        self._array = None  # type: ignore [assignment]
+        if isinstance(self._owner, SharedMemory):
+            self._owner.close()
+        self._owner = None
+
+    def __enter__(self) -> SharedArray:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class ArrayHandle(ABC):
+    """
+    Lightweight, picklable reference to an array stored outside of the process memory.
+    Handles can be sent to other processes, which attach to the data without copying it.
+    """
+
+    shape: tuple[int, ...]
+    dtype: str
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+    @abstractmethod
+    def attach(self) -> SharedArray:
+        """
+        Attaches to the stored array without copying it.
+
+        Returns:
+            A `SharedArray` giving NumPy or torch views of the data.
+        """
+        pass
+
+    @abstractmethod
+    def release(self) -> None:
+        """Frees the stored data. Attached arrays must be closed beforehand."""
+        pass
+
+    def to_numpy(self, release: bool = True) -> np.ndarray:
+        """
+        Reads the stored array into a local NumPy array.
+
+        Args:
+            release (bool): whether to free the stored data after reading it. Default
+                is `True`
+
+        Returns:
+            A NumPy array with a copy of the stored data.
+        """
+
+        shared = self.attach()
+        try:
+            array = shared.numpy().copy()
+        finally:
+            shared.close()
+            if release:
+                self.release()
+        return array
+
+
+@dataclass(frozen=True)
+class SharedArrayHandle(ArrayHandle):
+    """
+    Reference to an array stored in a shared memory block. It is used to hand state
+    vectors over between processes without serializing their data.
+
+    name (str): the name of the shared memory block
+    shape (tuple[int, ...]): the shape of the array
+    dtype (str): the array data type, ex: `"complex128"`
+    """
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> SharedArrayHandle:
+        """
+        Copies an array into a new shared memory block. The block is not tracked by the
+        current process, so it outlives it, ex: when created by a pool worker, and must
+        be released by the receiver (see `release` and `to_numpy`). On Windows, the
+        system frees the block once no process has it open.
+
+        Args:
+            array (np.ndarray): the array to share
+
+        Returns:
+            The handle to the shared array.
+        """
+
+        array = np.ascontiguousarray(array)
+        shm = _untracked_shared_memory(size=max(array.nbytes, 1))
+        try:
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        finally:
+            shm.close()
+        return cls(name=shm.name, shape=array.shape, dtype=array.dtype.str)
+
+    def attach(self) -> SharedArray:
+        shm = _untracked_shared_memory(self.name)
+        return SharedArray(np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf), shm)
+
+    def release(self) -> None:
+        # tracked while attached here, as `unlink` unregisters the block
+        shm = SharedMemory(name=self.name)
+        shm.close()
+        shm.unlink()
+
+
+@dataclass(frozen=True)
+class MemmapArrayHandle(ArrayHandle):
+    """
+    Reference to an array stored in a memory-mapped file. Unlike shared memory blocks,
+    the data can be larger than the available RAM and survives process restarts.
+
+    path (str): path of the file holding the raw array data
+    shape (tuple[int, ...]): the shape of the array
+    dtype (str): the array data type, ex: `"complex128"`
+    """
+
+    path: str
+    shape: tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def from_array(
+        cls, array: np.ndarray, directory: str | Path | None = None
+    ) -> MemmapArrayHandle:
+        """
+        Writes an array into a new memory-mapped file.
+
+        Args:
+            array (np.ndarray): the array to store
+            directory (str | Path | None): directory of the file. Default is the system
+                temporary directory
+
+        Returns:
+            The handle to the memory-mapped array.
+        """
+
+        array = np.ascontiguousarray(array)
+        path = Path(directory or tempfile.gettempdir()) / f"q2p_{uuid.uuid4().hex}.bin"
+        mmap = np.memmap(path, dtype=array.dtype, mode="w+", shape=array.shape)
+        mmap[...] = array
+        mmap.flush()
+        del mmap
+        return cls(path=str(path), shape=array.shape, dtype=array.dtype.str)
+
+    def attach(self) -> SharedArray:
+        mmap = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=self.shape)
+        return SharedArray(mmap)
+
+    def release(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def export_array(
+    array: np.ndarray,
+    output: OutputEnum,
+    directory: str | Path | None = None,
+) -> np.ndarray | ArrayHandle:
+    """
+    Exports an array according to the requested output mode.
+
+    Args:
+        array (np.ndarray): the array to export
+        output (OutputEnum): `NATIVE` returns the array itself, `SHARED_MEMORY` and
+            `MEMMAP` store it and return a handle to it
+        directory (str | Path | None): directory of the file for the `MEMMAP` mode
+
+    Returns:
+        The array itself or a handle to it.
+    """
+
+    match output:
+        case OutputEnum.NATIVE:
+            return array
+        case OutputEnum.SHARED_MEMORY:
+            return SharedArrayHandle.from_array(array)
+        case OutputEnum.MEMMAP:
+            return MemmapArrayHandle.from_array(array, directory)
+        case _:
+            raise NotImplementedError(f"Output mode '{output}' not implemented.")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 from typing import Callable
 
 import numpy as np
@@ -8,14 +9,19 @@ import torch
 
 from qadence2_expressions import compile_to_model, parameter, RX, reset_ir_options, Expression
 
+from pulser import Register
 from pyqtorch.utils import OrderedCounter
 from qadence2_ir.types import Model
 
 from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.backends._base_analog.sequence import clear_detuning_maps, detuning_map
 from qadence2_platforms.backends.fresnel1 import compile_to_backend as fresnel1_compile
+from qadence2_platforms.backends.fresnel1.compiler import DEFAULT_COMPILER
+from qadence2_platforms.backends.fresnel1.compiler import Compiler as Fresnel1Compiler
 from qadence2_platforms.backends.fresnel1.interface import Interface as Fresnel1Interface
 from qadence2_platforms.backends.pyqtorch import compile_to_backend as pyq_compile
 from qadence2_platforms.backends.pyqtorch.interface import Interface as PyQInterface
+from qadence2_platforms.utils.model_generator import local_shift_schedule, random_inputs
 
 N_SHOTS = 2_000
 ATOL = 0.05 * N_SHOTS
@@ -46,7 +52,9 @@ def test_pyq_expr_compilation(operator: Callable, angle: float | Expression, val
 def test_fresnel1_compiler(model1: Model, fresnel1_interface1: Fresnel1Interface) -> None:
     interface = fresnel1_compile(model1)
     fparams = {"x": 1.0}
-    assert fresnel1_interface1.info == interface.info
+    info, expected = dict(fresnel1_interface1.info), dict(interface.info)
+    assert np.array_equal(info.pop("interaction_matrix"), expected.pop("interaction_matrix"))
+    assert info == expected
     assert fresnel1_interface1.sequence.register == interface.sequence.register
     assert fresnel1_interface1.sequence.device == interface.sequence.device
     assert fresnel1_interface1.parameters() == interface.parameters()
@@ -55,3 +63,83 @@ def test_fresnel1_compiler(model1: Model, fresnel1_interface1: Fresnel1Interface
         np.array(list(interface.sample(fparams, shots=N_SHOTS).values())),
         atol=ATOL,
     )
+
+
+def test_incremental_compiler() -> None:
+    model = local_shift_schedule(3, 2, seed=0)
+    values = random_inputs(model, seed=0)
+    compiler = Fresnel1Compiler()
+
+    def check(interface: Fresnel1Interface) -> None:
+        reference = fresnel1_compile(copy.deepcopy(model))
+        assert np.allclose(interface.run(values).full(), reference.run(values).full())
+
+    first = compiler.compile(model)
+    check(first)
+    assert compiler.reused == frozenset()
+    tables = compiler.tables
+    state = first.run(values).full()
+
+    model.directives["local_shifts"] = [0.5, 1.0, 1.5]
+    second = compiler.compile(model)
+    check(second)
+    assert compiler.reused == {"register", "instructions"}
+    assert all(t is u for t, u in zip(compiler.tables, tables, strict=True))
+    # each sequence declares its own variables
+    variables = first.sequence.declared_variables
+    assert variables.keys() == second.sequence.declared_variables.keys()
+    assert all(v is not second.sequence.declared_variables[k] for k, v in variables.items())
+    assert np.allclose(first.run(values).full(), state)
+
+    model.register.qubit_positions = [(0, 0), (1, 0), (-1, 0)]
+    check(compiler.compile(model))
+    assert compiler.reused == {"instructions"}
+
+    model.instructions = model.instructions + model.instructions[:2]
+    check(compiler.compile(model))
+    assert compiler.reused == {"register", "instructions"}
+    assert compiler.tables[0] is tables[0] and len(compiler.tables) == 2
+
+    model.instructions = model.instructions[1:]
+    check(compiler.compile(model))
+    assert compiler.reused == {"register"}
+    assert len(compiler.tables) == 1
+
+    model.inputs = dict()
+    with pytest.raises(ValueError, match="Undeclared inputs"):
+        compiler.compile(model)
+
+
+def test_compile_to_backend_reuse() -> None:
+    model = local_shift_schedule(3, 2, seed=0)
+    model.directives["enable_digital_analog"] = True
+    DEFAULT_COMPILER.clear()
+
+    with pytest.warns(SyntaxWarning, match="digital"):
+        fresnel1_compile(model)
+    assert DEFAULT_COMPILER.reused == frozenset()
+
+    model.directives["local_shifts"] = [0.5, 1.0, 1.5]
+    # the directives are checked even though the register is reused
+    with pytest.warns(SyntaxWarning, match="digital"):
+        compile_to_backend(model, "fresnel1")
+    assert DEFAULT_COMPILER.reused == {"register", "instructions"}
+
+
+def test_detuning_map_cache() -> None:
+    register = Register.from_coordinates([(0, 0), (5, 0), (0, 5)], prefix="q")
+    clear_detuning_maps()
+
+    targets = ["q0", "q1", "q2"]
+    shifts = [0.5, 1.0, 1.5]
+    dmm = detuning_map(register, targets, shifts)
+    reference = register.define_detuning_map({q: s / (2 * np.pi) for q, s in zip(targets, shifts)})
+    assert np.allclose(dmm.weights, reference.weights)
+    assert np.allclose(dmm.trap_coordinates, reference.trap_coordinates)
+
+    assert detuning_map(register, targets, np.array(shifts)) is dmm
+    assert detuning_map(register, targets, [0.5, 1.0, 1.0]) is not dmm
+    assert detuning_map(register, targets).weights == (1.0, 1.0, 1.0)
+
+    other = Register.from_coordinates([(0, 0), (6, 0), (0, 6)], prefix="q")
+    assert detuning_map(other, targets, shifts) is not dmm
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+import torch
+from qadence2_expressions import Z
+
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import feature_map, hea
+
+
+def test_interface_to_dtype() -> None:
+    model = feature_map(3, 2, depth=2, chain_length=3, seed=0)
+    double = compile_to_backend(model, "pyqtorch")
+    single = compile_to_backend(model, "pyqtorch")
+    params = list(single.vparams.values())
+
+    assert single.to(dtype=torch.complex64) is single
+    assert single.precision == "single"
+    assert single.init_state.dtype == torch.complex64
+    assert list(single.vparams.values()) == params
+
+    values = {k: torch.rand(4) for k in model.inputs}
+    state = single.run(values)
+    assert state.dtype == torch.complex64
+    assert torch.allclose(state.to(torch.complex128), double.run(values), atol=1e-5)
+
+    buffer = single.embedding.param_buffer
+    assert buffer.dtype == torch.float32
+    assert all(p.dtype == torch.float32 and p.is_leaf for p in buffer.vparams.values())
+    assert buffer.to(device="cpu") is buffer and buffer.dtype == torch.float32
+
+    single.to(dtype=torch.float64)
+    assert single.run(values).dtype == torch.complex128
+    assert buffer.dtype == torch.float64
+    with pytest.raises(ValueError):
+        single.to(dtype=torch.float16)
+
+
+def test_interface_to_meta() -> None:
+    model = hea(3, 2, seed=0)
+    interface = compile_to_backend(model, "pyqtorch")
+    interface.observable = [Z(0), Z(1) * Z(2)]
+    expected = interface.expectation()
+    interface.to("meta")
+
+    assert interface.device == torch.device("meta")
+    assert all(p.is_meta for p in interface.vparams.values())
+    assert all(p.is_meta for p in interface.embedding.param_buffer.vparams.values())
+
+    state = interface.run({k: torch.rand(5) for k in model.inputs})
+    assert state.is_meta and state.shape == (2, 2, 2, 5)
+    expectation = interface.expectation()
+    assert expectation.is_meta and expectation.shape == expected.shape
+    assert interface.bind().state.is_meta
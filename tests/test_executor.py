@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+import qutip
+import torch
+from qadence2_expressions import Z
+from qadence2_ir.types import Model
+
+from qadence2_platforms.abstracts import OutputEnum, RunEnum
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.executor import (
+    ExecutionPolicy,
+    SimulationPool,
+    ThreadPoolRunner,
+    execution_scope,
+    model_hash,
+)
+from qadence2_platforms.instrumentation import Sink, Stage, instrument
+from qadence2_platforms.utils.shared_memory import (
+    ArrayHandle,
+    MemmapArrayHandle,
+    SharedArrayHandle,
+)
+
+
+def test_shared_array_handle() -> None:
+    array = np.arange(8, dtype=np.complex128).reshape(2, 4)
+    handle = SharedArrayHandle.from_array(array)
+    assert handle.nbytes == array.nbytes
+    assert np.array_equal(handle.to_numpy(), array)
+
+
+def test_pyq_simulation_pool(model1: Model) -> None:
+    interface = compile_to_backend(model1, "pyqtorch")
+    values = [{"x": torch.tensor([v])} for v in (0.1, 0.5, 0.9)]
+
+    with SimulationPool("pyqtorch", num_workers=2) as pool:
+        key = pool.register(model1)
+        assert key == model_hash(model1)
+        pool.warmup()
+        states = pool.map(key, RunEnum.RUN, values)
+        (sample,) = pool.result(pool.submit(key, RunEnum.SAMPLE, values[0], shots=100))
+
+    assert sum(sample.values()) == 100
+    for vals, state in zip(values, states):
+        assert isinstance(state, torch.Tensor)
+        assert torch.allclose(state, interface.run(values=vals))
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="requires /dev/shm")
+def test_pool_futures_release_shared_memory(model1: Model) -> None:
+    interface = compile_to_backend(model1, "pyqtorch")
+    values = [{"x": torch.tensor([v])} for v in (0.1, 0.5, 0.9)]
+    blocks = set(Path("/dev/shm").iterdir())
+
+    with SimulationPool("pyqtorch", num_workers=2) as pool:
+        key = pool.register(model1)
+        futures = [pool.submit(key, RunEnum.RUN, vals) for vals in values]
+        # a job whose result is never read
+        pool.submit(key, RunEnum.RUN, values[0])
+        states = [future.result() for future in futures]
+
+    assert set(Path("/dev/shm").iterdir()) <= blocks
+    for vals, state in zip(values, states):
+        assert isinstance(state, torch.Tensor)
+        assert torch.allclose(state, interface.run(values=vals))
+
+
+def test_fresnel1_simulation_pool(model1: Model) -> None:
+    interface = compile_to_backend(model1, "fresnel1")
+
+    with SimulationPool("fresnel1", num_workers=1) as pool:
+        key = pool.register(model1)
+        (state,) = pool.map(key, RunEnum.RUN, [{"x": 1.0}])
+
+    assert isinstance(state, qutip.Qobj)
+    assert abs(state.overlap(interface.run(values={"x": 1.0}))) ** 2 > 0.999
+
+
+def test_pyq_run_output_handles(model1: Model, tmp_path: Path) -> None:
+    interface = compile_to_backend(model1, "pyqtorch")
+    values = {"x": torch.tensor([0.3])}
+    expected = interface.run(values=values)
+
+    handle = interface.run(values=values, output=OutputEnum.SHARED_MEMORY)
+    assert isinstance(handle, SharedArrayHandle)
+    with handle.attach() as shared:
+        view = shared.torch()
+        assert torch.allclose(view, expected)
+        assert view.data_ptr() == shared.numpy().ctypes.data
+        del view
+    handle.release()
+
+    mmap_handle = interface.run(values=values, output=OutputEnum.MEMMAP, output_dir=tmp_path)
+    assert isinstance(mmap_handle, MemmapArrayHandle)
+    assert np.allclose(mmap_handle.to_numpy(), expected.detach().numpy())
+    assert not list(tmp_path.iterdir())
+
+
+def test_pool_returns_handles(model1: Model) -> None:
+    interface = compile_to_backend(model1, "fresnel1")
+
+    with SimulationPool("fresnel1", num_workers=1) as pool:
+        key = pool.register(model1)
+        (handle,) = pool.map(key, RunEnum.RUN, [{"x": 1.0}], output=OutputEnum.SHARED_MEMORY)
+
+    assert isinstance(handle, ArrayHandle)
+    with handle.attach() as shared:
+        state = qutip.Qobj(shared.numpy(), dims=[[2, 2], [1, 1]])
+        assert abs(state.overlap(interface.run(values={"x": 1.0}))) ** 2 > 0.999
+    handle.release()
+
+
+# run in a fresh interpreter, whose forked workers start their own resource tracker
+POOL_AFTER_SHUTDOWN = """
+import pickle, sys, time
+from qadence2_platforms.abstracts import OutputEnum, RunEnum
+from qadence2_platforms.executor import SimulationPool
+
+model, values = pickle.load(sys.stdin.buffer)
+pool = SimulationPool("pyqtorch", num_workers=1, mp_context="fork")
+key = pool.register(model)
+(handle,) = pool.map(key, RunEnum.RUN, [values], output=OutputEnum.SHARED_MEMORY)
+# states sent back through shared memory, only read after the workers exited
+packed = pool.submit(key, RunEnum.RUN, values)
+exported = pool.submit(key, RunEnum.RUN, values, output=OutputEnum.SHARED_MEMORY)
+packed.result()
+exported.result()
+pool.shutdown()
+time.sleep(0.5)
+state = pool.result(packed)
+exported_handle = pool.result(exported)
+with exported_handle.attach() as shared:
+    exported_state = shared.torch().clone()
+exported_handle.release()
+pickle.dump((handle, state.numpy(), exported_state.numpy()), sys.stdout.buffer)
+"""
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+def test_pool_handles_after_shutdown(model1: Model) -> None:
+    interface = compile_to_backend(model1, "pyqtorch")
+    values = {"x": torch.tensor([0.3])}
+    expected = interface.run(values=values).detach().numpy()
+
+    process = subprocess.run(
+        [sys.executable, "-c", POOL_AFTER_SHUTDOWN],
+        input=pickle.dumps((model1, values)),
+        capture_output=True,
+        check=True,
+    )
+    assert b"leaked shared_memory" not in process.stderr
+
+    # the block outlives the workers and the process of the pool
+    handle, state, exported_state = pickle.loads(process.stdout)
+    assert isinstance(handle, SharedArrayHandle)
+    assert np.allclose(handle.to_numpy(), expected)
+    assert np.allclose(state, expected)
+    assert np.allclose(exported_state, expected)
+
+
+def test_execution_scope() -> None:
+    previous = torch.get_num_threads()
+    policy = ExecutionPolicy(num_threads=previous + 1)
+    with execution_scope(policy):
+        assert torch.get_num_threads() == previous + 1
+        # nested scopes keep the outermost policy
+        with execution_scope(ExecutionPolicy(num_threads=previous + 2)):
+            assert torch.get_num_threads() == previous + 1
+    assert torch.get_num_threads() == previous
+
+    with pytest.raises(ValueError):
+        ExecutionPolicy(num_threads=0)
+
+
+def test_execution_scope_concurrency() -> None:
+    previous = torch.get_num_threads()
+    observed: list[tuple[int, int]] = []
+
+    def call(num_threads: int) -> None:
+        with execution_scope(ExecutionPolicy(num_threads=num_threads)):
+            for _ in range(5):
+                observed.append((num_threads, torch.get_num_threads()))
+                time.sleep(0.002)
+
+    threads = [threading.Thread(target=call, args=(1 + i % 2,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(observed) == 40
+    assert all(requested == actual for requested, actual in observed)
+    assert torch.get_num_threads() == previous
+
+
+def test_thread_pool_runner(model1: Model) -> None:
+    interface = compile_to_backend(model1, "pyqtorch")
+    interface.observable = Z(0)
+    values = [{"x": torch.rand(3)} for _ in range(8)]
+
+    with ThreadPoolRunner(num_workers=4, num_cores=8) as runner:
+        assert runner.policy.num_threads == 2
+        expectations = runner.map(interface, RunEnum.EXPECTATION, values)
+        states = runner.map(interface, RunEnum.RUN, values)
+
+    for vals, expectation, state in zip(values, expectations, states):
+        assert torch.allclose(expectation, interface.expectation(vals))
+        assert torch.allclose(state, interface.run(vals))
+
+
+def test_pyq_interface_policy(model1: Model) -> None:
+    previous = torch.get_num_threads()
+    interface = compile_to_backend(
+        model1, "pyqtorch", policy=ExecutionPolicy(num_threads=previous + 1)
+    )
+    observed: list[int] = []
+
+    with instrument(_ThreadsSink(observed)):
+        interface.run({"x": torch.rand(1)})
+        interface.run({"x": torch.rand(1)}, policy=ExecutionPolicy(num_threads=previous + 2))
+    assert observed == [previous + 1, previous + 2]
+    assert torch.get_num_threads() == previous
+
+
+class _ThreadsSink(Sink):
+    def __init__(self, observed: list[int]) -> None:
+        self.observed = observed
+
+    def on_end(self, stage: Stage) -> None:
+        if stage.name == "circuit.run":
+            self.observed.append(torch.get_num_threads())
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+import torch
+from qadence2_expressions import Z
+
+from qadence2_platforms.backends.pyqtorch.export import ExportedModel, export
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import feature_map, hea
+
+
+@pytest.mark.parametrize("method", [None, "trace", "export"])
+def test_export(method: str | None) -> None:
+    model = feature_map(3, 2, depth=2, chain_length=3, seed=0)
+    interface = compile_to_backend(model, "pyqtorch")
+    module = export(interface, observable=[Z(0) * Z(1)], method=method, batch_size=4)
+    if method == "export":
+        module = module.module()
+
+    x_0, x_1 = torch.rand(4), torch.rand(4)
+    expected = interface.expectation({"x_0": x_0, "x_1": x_1}, observable=[Z(0) * Z(1)])
+    assert torch.allclose(module(x_0, x_1), expected)
+
+    x_0 = torch.rand(4)
+    expected = interface.expectation({"x_0": x_0, "x_1": x_1}, observable=[Z(0) * Z(1)])
+    assert torch.allclose(module(x_0, x_1), expected)
+
+
+def test_exported_model() -> None:
+    model = feature_map(2, 1, seed=0)
+    interface = compile_to_backend(model, "pyqtorch")
+    module = ExportedModel.from_interface(interface)
+
+    assert module.input_names == ("x_0",)
+    assert {name for name, _ in module.named_buffers()} == {"init_state", "constants"}
+    x = torch.rand(3)
+    assert torch.allclose(module(x), interface.run({"x_0": x}))
+    with pytest.raises(ValueError):
+        module(x, x)
+    with pytest.raises(NotImplementedError):
+        export(interface, method="script")
+
+
+def test_exported_model_gradients() -> None:
+    interface = compile_to_backend(hea(2, 1, seed=0), "pyqtorch")
+    module = ExportedModel.from_interface(interface, observable=Z(0))
+
+    assert set(dict(module.named_parameters())) == {f"vparams.{p}" for p in interface.vparams}
+    module().sum().backward()
+    assert all(p.grad is not None for p in interface.vparams.values())
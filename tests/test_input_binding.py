@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import torch
+from qadence2_expressions import Z
+from qadence2_ir.types import Alloc, AllocQubits, Assign, Call, Load, Model, QuInstruct, Support
+
+from qadence2_platforms.backends.pyqtorch.interface import Interface as PyQInterface
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import hea
+
+
+def test_input_binding(pyq_interface1: PyQInterface) -> None:
+    x = torch.rand(4)
+    binding = pyq_interface1.bind({"x": x}, observable=Z(0) * Z(1))
+    buffer = binding.values["x"]
+
+    assert torch.allclose(pyq_interface1.run(binding), pyq_interface1.run({"x": x}))
+    assert torch.allclose(
+        pyq_interface1.expectation(binding),
+        pyq_interface1.expectation({"x": x}, observable=Z(0) * Z(1)),
+    )
+
+    y = torch.rand(4)
+    assert binding.update({"x": y}) is binding
+    assert binding.values["x"] is buffer
+    assert torch.allclose(pyq_interface1.run(binding), pyq_interface1.run({"x": y}))
+    assert torch.allclose(
+        pyq_interface1.expectation(binding, observable=Z(0)),
+        pyq_interface1.expectation({"x": y}, observable=Z(0)),
+    )
+
+    with pytest.raises(ValueError):
+        binding.update({"x": torch.rand(5)})
+    with pytest.raises(ValueError):
+        binding.update({"y": torch.rand(4)})
+    with pytest.raises(ValueError):
+        binding.update(state=pyq_interface1.init_state)
+    with pytest.raises(ValueError):
+        pyq_interface1.bind()
+
+
+def test_input_binding_state(pyq_interface1: PyQInterface) -> None:
+    x = torch.rand(1)
+    state = pyq_interface1.circuit.state_from_bitstring("01")
+    binding = pyq_interface1.bind({"x": x}, state=state)
+    assert torch.allclose(pyq_interface1.run(binding), pyq_interface1.run({"x": x}, state=state))
+
+    new_state = pyq_interface1.circuit.state_from_bitstring("11")
+    binding.update(state=new_state)
+    assert binding.state is not new_state
+    assert torch.allclose(
+        pyq_interface1.run(binding), pyq_interface1.run({"x": x}, state=new_state)
+    )
+
+
+def test_input_binding_trainable_parameters() -> None:
+    model = Model(
+        register=AllocQubits(num_qubits=2),
+        inputs={"x": Alloc(size=1, trainable=False), "th": Alloc(size=1, trainable=True)},
+        instructions=[
+            Assign("%0", Call("mul", 1.0, Load("th"))),
+            QuInstruct("ry", Support(target=(0,)), Load("%0")),
+            QuInstruct("rx", Support(target=(1,)), Load("x")),
+        ],
+        directives={"digital": True},
+    )
+    interface = compile_to_backend(model, "pyqtorch")
+    values = {"x": torch.rand(3)}
+    binding = interface.bind(values)
+
+    assert torch.allclose(interface.run(binding), interface.run(values))
+    assert np.allclose(
+        interface.sampler(binding).probabilities, interface.sampler(values).probabilities
+    )
+    assert interface.sample(binding, shots=100, seed=0) == interface.sample(
+        values, shots=100, seed=0
+    )
+    assert torch.allclose(
+        interface.expectation(binding, observable=Z(0)),
+        interface.expectation(values, observable=Z(0)),
+    )
+
+
+def test_input_binding_precision_and_grad() -> None:
+    interface = compile_to_backend(hea(3, 2, seed=0), "pyqtorch", precision="single")
+    binding = interface.bind(observable=Z(0))
+
+    assert all(v.dtype == torch.float32 for v in binding.values.values())
+    exp = interface.expectation(binding)
+    assert exp.dtype == torch.float32
+    exp.sum().backward()
+    assert all(p.grad is not None for p in interface.vparams.values())
+
+    other = compile_to_backend(hea(3, 2, seed=0), "pyqtorch")
+    with pytest.raises(ValueError):
+        other.run(binding)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import numpy as np
+import torch
+from pulser.register.register_layout import RegisterLayout
+from pulser.sequence.sequence import Sequence
+from qadence2_ir.types import Assign, Call, Load, Model, QuInstruct, Support
+
+from qadence2_platforms.backends._base_analog.sequence import from_instructions
+from qadence2_platforms.backends.fresnel1.sequence import Fresnel1
+from qadence2_platforms.backends.instructions import ASSIGN, QUANTUM, InstructionTable
+from qadence2_platforms.backends.pyqtorch.compiler import Compiler
+from qadence2_platforms.utils.model_generator import feature_map
+
+
+def test_instruction_table() -> None:
+    instructions = [
+        Assign("%0", Call("mul", 2.0, Load("x"))),
+        Assign("%1", Call("add", 1, Load("%0"), 1.0)),
+        QuInstruct("rx", Support.target_all(), Load("%1")),
+        QuInstruct("not", Support((1,), control=(0,))),
+        QuInstruct("rz", Support((0, 1)), 2.0, duration=1.0),
+    ]
+    table = InstructionTable(instructions)
+
+    assert len(table) == 5
+    assert table.kinds.tolist() == [ASSIGN, ASSIGN, QUANTUM, QUANTUM, QUANTUM]
+    assert table.names == ["mul", "add", "rx", "not", "rz"]
+    assert table.symbols == ["%0", "x", "%1"]
+    # the constants are deduplicated, keeping `1` and `1.0` apart
+    assert table.constants == [2.0, 1, 1.0]
+    assert table.outputs.tolist() == [0, 2, -1, -1, -1]
+    assert table.operands == ["%0", "x", "%1", 2.0, 1, 1.0]
+    assert table.attributes == {4: {"duration": 1.0}}
+    assert table.nbytes > 0
+
+    rows = list(table.rows())
+    assert rows[1] == (ASSIGN, 1, 2, (), (), (4, 0, 5))
+    assert rows[3] == (QUANTUM, 3, -1, (1,), (0,), ())
+    assert rows[4] == (QUANTUM, 4, -1, (0, 1), (), (3,))
+    assert table.to_instructions() == instructions
+
+
+def test_compile_from_table() -> None:
+    model = feature_map(4, 3, depth=3, chain_length=6, seed=1)
+    table = InstructionTable.from_model(model)
+    assert table.to_instructions() == model.instructions
+
+    circuit = Compiler().compile(model, table=table)
+    assert len(circuit.operations) == int(np.sum(table.kinds == QUANTUM))
+    assert [type(op) for op in circuit.operations] == [
+        type(op) for op in Compiler().compile(model).operations
+    ]
+    assert torch.is_tensor(circuit.init_state())
+
+
+def test_from_instructions_table(model1: Model, fresnel1_register1: RegisterLayout) -> None:
+    pulses = []
+    for instructions in (model1.instructions, InstructionTable.from_model(model1)):
+        seq = Sequence(fresnel1_register1, Fresnel1)
+        seq.declare_channel("global", "rydberg_global")
+        pulses.append(from_instructions(seq, model1.inputs, instructions))
+
+    assert [p.name for p in pulses[0]] == [p.name for p in pulses[1]]
+    assert [len(p.args) for p in pulses[0]] == [len(p.args) for p in pulses[1]]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+import torch
+from qadence2_expressions import Z
+from qadence2_ir.types import Model
+
+from qadence2_platforms.backends.fresnel1.interface import Interface as Fresnel1Interface
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.instrumentation import (
+    LoggingSink,
+    MemorySink,
+    OpenTelemetrySink,
+    enabled,
+    instrument,
+    stage,
+)
+
+
+def test_disabled_stage() -> None:
+    assert not enabled()
+    with stage("noop", num_qubits=2) as s:
+        s.set(num_gates=1)
+    assert stage("other") is s
+
+
+def test_stage_nesting_and_errors() -> None:
+    with instrument(MemorySink()) as (sink,):
+        assert enabled()
+        with stage("outer", size=1):
+            with stage("inner") as s:
+                s.set(size=2)
+        with pytest.raises(ValueError):
+            with stage("failing"):
+                raise ValueError()
+    assert not enabled()
+
+    inner, outer, failing = sink.stages
+    assert inner.path == "outer/inner"
+    assert inner.attributes == {"size": 2}
+    assert outer.parent is None and outer.duration >= inner.duration
+    assert failing.error == "ValueError"
+    assert sink.summary()["inner"]["count"] == 1
+
+
+def test_pyq_instrumentation(model1: Model, caplog: pytest.LogCaptureFixture) -> None:
+    with caplog.at_level(logging.INFO), instrument(MemorySink(), LoggingSink()) as (sink, _):
+        interface = compile_to_backend(model1, "pyqtorch")
+        interface.expectation({"x": torch.tensor(1.0)}, observable=Z(0) * Z(1))
+
+    paths = [s.path for s in sink.stages]
+    assert paths == [
+        "compile/compile.embedding",
+        "compile/compile.circuit",
+        "compile",
+        "interface.expectation/observables.parse",
+        "interface.expectation/circuit.expectation",
+        "interface.expectation",
+    ]
+    assert sink.stages[1].attributes == {"num_qubits": 2, "num_gates": 2}
+    assert "interface.expectation/circuit.expectation" in caplog.text
+
+
+def test_fresnel1_instrumentation(fresnel1_interface1: Fresnel1Interface) -> None:
+    with instrument(MemorySink()) as (sink,):
+        fresnel1_interface1.sample({"x": 1.0}, shots=10)
+
+    summary = sink.summary()
+    assert set(summary) == {
+        "sequence.build",
+        "emulator.setup",
+        "emulator.solve",
+        "results.sample",
+        "interface.sample",
+    }
+    assert sink.stages[-1].attributes["num_qubits"] == 2
+
+
+def test_opentelemetry_sink(model1: Model) -> None:
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    with instrument(OpenTelemetrySink(provider.get_tracer("test"))):
+        compile_to_backend(model1, "pyqtorch")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {"compile", "compile.embedding", "compile.circuit"}
+    assert spans["compile.circuit"].parent.span_id == spans["compile"].context.span_id
+    assert spans["compile"].attributes["backend"] == "pyqtorch"
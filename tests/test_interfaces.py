@@ -1,19 +1,31 @@
 from __future__ import annotations
 
 from collections import Counter
+from typing import Any
 
 import numpy as np
+import pytest
 import qutip
 import torch
 from pulser import Sequence as PulserSequence
+from pulser.noise_model import NoiseModel
 from pulser.register import RegisterLayout
 from qadence2_expressions import Z
-from qadence2_ir.types import Model
+from qadence2_ir.types import Alloc, AllocQubits, Load, Model, QuInstruct, Support
 
-from qadence2_platforms.backends.fresnel1.sequence import Fresnel1
+from qadence2_platforms.backends._base_analog.emulator import (
+    DEFAULT_EMULATOR_CONFIG,
+    EmulatorConfig,
+    _solver_options,
+    check_emulator_internals,
+    run_streaming,
+)
+from qadence2_platforms.backends._base_analog.subspace import PropagatorCache, independent_sets
 from qadence2_platforms.backends.fresnel1.interface import Interface as Fresnel1Interface
+from qadence2_platforms.backends.fresnel1.sequence import Fresnel1
 from qadence2_platforms.backends.pyqtorch.interface import Interface as PyQInterface
-
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import piecewise_schedule, random_inputs
 
 N_SHOTS = 4_000
 ATOL = 0.06 * N_SHOTS
@@ -36,12 +48,31 @@ def test_pyq_interface(model1: Model, pyq_interface1: PyQInterface) -> None:
     assert isinstance(run_obs, torch.Tensor)
 
 
+def test_pyq_observable_reassignment(pyq_interface1: PyQInterface) -> None:
+    fparams = {"x": torch.tensor(1.0)}
+    pyq_interface1.observable = Z(0)
+    single = pyq_interface1.expectation(fparams)
+    assert torch.allclose(single, pyq_interface1.expectation(fparams, observable=Z(0)))
+
+    pyq_interface1.observable = Z(0) * Z(1)
+    correlation = pyq_interface1.expectation(fparams)
+    expected = pyq_interface1.expectation(fparams, observable=Z(0) * Z(1))
+    assert torch.allclose(correlation, expected)
+    assert not torch.allclose(correlation, single)
+
+    pyq_interface1.observable = None
+    with pytest.raises(ValueError):
+        pyq_interface1.expectation(fparams)
+
+
 def test_fresnel1_interface(
     fresnel1_register1: RegisterLayout,
     fresnel1_sequence1: PulserSequence,
     fresnel1_interface1: Fresnel1Interface,
 ) -> None:
-    assert fresnel1_interface1.info == dict(device=Fresnel1, register=fresnel1_sequence1.register)
+    info = dict(fresnel1_interface1.info)
+    assert info.pop("interaction_matrix").shape == (2, 2)
+    assert info == dict(device=Fresnel1, register=fresnel1_sequence1.register)
 
     fparams = {"x": 1.0}
     run_res = fresnel1_interface1.run(fparams)
@@ -57,3 +88,200 @@ def test_fresnel1_interface(
     obs = Z(0) * Z(1)
     obs_res = fresnel1_interface1.expectation(fparams, shots=N_SHOTS, observable=obs)[0]
     assert all([(0.0 <= abs(k) <= 1.0) for k in obs_res])
+
+
+def test_fresnel1_emulator_config(fresnel1_interface1: Fresnel1Interface) -> None:
+    fparams = {"x": 1.0}
+    reference = fresnel1_interface1.run(fparams)
+
+    fast_config = EmulatorConfig(evaluation_times="Minimal", sampling_rate=0.5, atol=1e-6)
+    fast = fresnel1_interface1.run(fparams, emulator_config=fast_config)
+    assert abs(reference.overlap(fast)) ** 2 > 0.99
+
+    fresnel1_interface1.set_emulator_config(fast_config)
+    assert fresnel1_interface1.emulator_config == fast_config
+    sample = fresnel1_interface1.sample(fparams, shots=N_SHOTS)
+    assert sum(sample.values()) == N_SHOTS
+
+    assert EmulatorConfig(atol=1e-6, solver_options={"method": "bdf"}).run_options() == {
+        "atol": 1e-6,
+        "method": "bdf",
+    }
+
+
+def test_fresnel1_emulator_internals(
+    fresnel1_interface1: Fresnel1Interface, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # the streaming functions mirror `QutipEmulator.run` through its private attributes
+    simulation = fresnel1_interface1._build_emulator({"x": 1.0}, DEFAULT_EMULATOR_CONFIG)
+    check_emulator_internals(simulation)
+
+    options: dict = dict()
+    sesolve = qutip.sesolve
+
+    def capture(*args: Any, **kwargs: Any) -> Any:
+        options.update(kwargs["options"])
+        return sesolve(*args, **kwargs)
+
+    monkeypatch.setattr(qutip, "sesolve", capture)
+    reference = simulation.run()
+    options.pop("progress_bar")
+    assert _solver_options(simulation, dict()) == options
+
+    streamed = run_streaming(simulation, [], lambda t, vals: None)
+    assert type(streamed) is type(reference)
+    final, expected = streamed.get_final_state(), reference.get_final_state()
+    assert final.dims == expected.dims
+    assert np.allclose(final.full(), expected.full(), atol=1e-6)
+    assert sum(streamed.sample_final_state(N_SHOTS).values()) == N_SHOTS
+
+    monkeypatch.delattr(simulation, "_meas_basis")
+    with pytest.raises(RuntimeError):
+        check_emulator_internals(simulation)
+
+
+def test_fresnel1_streaming_callback(fresnel1_interface1: Fresnel1Interface) -> None:
+    fparams = {"x": 1.0}
+    obs = Z(0) + Z(1)
+    full = fresnel1_interface1.expectation(
+        fparams, observable=obs, emulator_config=EmulatorConfig(evaluation_times="Full")
+    )[0]
+
+    trace: list[tuple[float, complex]] = []
+    streamed = fresnel1_interface1.expectation(
+        fparams, observable=obs, callback=lambda t, vals: trace.append((t, vals[0]))
+    )[0]
+    assert len(trace) == len(full)
+    assert np.allclose([v for _, v in trace], full, atol=1e-4)
+    assert np.allclose(streamed[-1], full[-1], atol=1e-4)
+
+    final_state = fresnel1_interface1.run(fparams)
+    streamed_state = fresnel1_interface1.run(fparams, observable=obs, callback=lambda t, vals: None)
+    assert abs(final_state.overlap(streamed_state)) ** 2 > 0.999
+
+
+def test_fresnel1_expectation_stream(fresnel1_interface1: Fresnel1Interface) -> None:
+    fparams = {"x": 1.0}
+    obs = [Z(0) + Z(1), Z(0) * Z(1)]
+    full = fresnel1_interface1.expectation(
+        fparams, observable=obs, emulator_config=EmulatorConfig(evaluation_times="Full")
+    )
+
+    stream = fresnel1_interface1.expectation_stream(fparams, observable=obs)
+    streamed = np.array([vals for _, vals in stream]).T
+    assert streamed.shape == (2, len(full[0]))
+    assert np.allclose(streamed, np.real(full), atol=1e-4)
+
+    times, trace = fresnel1_interface1.expectation_trace(fparams, observable=obs, times=0.1)
+    assert trace.shape == (2, times.size)
+    assert times.size < len(full[0])
+    assert np.allclose(trace[:, -1], streamed[:, -1], atol=1e-4)
+
+    out = np.zeros((2, times.size))
+    _, filled = fresnel1_interface1.expectation_trace(fparams, observable=obs, times=0.1, out=out)
+    assert filled is out
+    assert np.allclose(out, trace)
+
+
+def test_fresnel1_interaction_matrix(fresnel1_interface1: Fresnel1Interface) -> None:
+    register = fresnel1_interface1.sequence.register
+    device = fresnel1_interface1.sequence.device
+    interactions = fresnel1_interface1.interaction_matrix
+
+    assert fresnel1_interface1.info["interaction_matrix"] is interactions
+    assert np.allclose(interactions, interactions.T) and np.all(np.diag(interactions) == 0)
+
+    coords = np.array([register.qubits[q].as_array() for q in register.qubit_ids])
+    distances = np.linalg.norm(coords[:, None] - coords[None], axis=-1)
+    pairs = np.triu_indices(len(coords), k=1)
+    assert np.allclose(interactions[pairs], device.interaction_coeff / distances[pairs] ** 6)
+
+    rabi_frequency = 2.0
+    radius = device.rydberg_blockade_radius(rabi_frequency)
+    graph = fresnel1_interface1.blockade_graph(rabi_frequency)
+    assert np.array_equal(graph[pairs], distances[pairs] <= radius)
+
+
+def test_blockade_subspace() -> None:
+    # the independent sets of a path of n vertices are counted by Fibonacci numbers
+    path = np.eye(6, k=1, dtype=bool) | np.eye(6, k=-1, dtype=bool)
+    assert len(independent_sets(path)) == 21
+
+    # a chain of atoms 5 µm apart, blockading their neighbours
+    model = piecewise_schedule(6, 2, seed=0)
+    interface = compile_to_backend(model, "analog")
+    values = random_inputs(model, seed=0)
+    config = EmulatorConfig(blockade_subspace=True)
+    subspace = interface.subspace_hamiltonian().subspace
+    assert len(subspace) == 21
+
+    full_state = interface.run(values)
+    state = interface.run(values, emulator_config=config)
+    assert state.dims == full_state.dims
+    assert abs(full_state.overlap(state)) ** 2 > 0.99
+
+    obs = [Z(0) + Z(1), Z(2) * Z(3)]
+    full = interface.expectation(values, observable=obs)
+    restricted = interface.expectation(values, observable=obs, emulator_config=config)
+    assert np.allclose([v[-1] for v in restricted], [v[-1] for v in full], atol=1e-2)
+
+    sample = interface.sample(values, shots=N_SHOTS, emulator_config=config)
+    assert sum(sample.values()) == N_SHOTS
+    assert set(sample) <= set(subspace.bitstrings())
+
+    with pytest.raises(NotImplementedError):
+        noisy = EmulatorConfig(blockade_subspace=True, noise=NoiseModel(dephasing_rate=0.1))
+        interface.run(values, emulator_config=noisy)
+
+
+def test_native_engine(fresnel1_interface1: Fresnel1Interface) -> None:
+    fparams = {"x": 1.0}
+    native = EmulatorConfig(engine="native")
+    reference = fresnel1_interface1.run(fparams)
+    state = fresnel1_interface1.run(fparams, emulator_config=native)
+    assert abs(reference.overlap(state)) ** 2 > 0.9999
+
+    obs = [Z(0) + Z(1), Z(0) * Z(1)]
+    full = fresnel1_interface1.expectation(fparams, observable=obs)
+    expectation = fresnel1_interface1.expectation(fparams, observable=obs, emulator_config=native)
+    assert np.allclose([v[-1] for v in expectation], [v[-1] for v in full], atol=1e-4)
+
+    sample = fresnel1_interface1.sample(fparams, shots=N_SHOTS, emulator_config=native)
+    assert sum(sample.values()) == N_SHOTS
+
+    with pytest.raises(NotImplementedError):
+        fresnel1_interface1.run(fparams, emulator_config=native, callback=lambda t, vals: None)
+    with pytest.raises(ValueError):
+        EmulatorConfig(engine="numpy")  # type: ignore
+
+
+def test_propagator_cache() -> None:
+    # repeated gate-like pulses, whose programmed plateaus are constant segments
+    model = Model(
+        register=AllocQubits(num_qubits=4),
+        inputs={"x": Alloc(size=1, trainable=False)},
+        instructions=[
+            QuInstruct(name, Support.target_all(), Load("x"))
+            for _ in range(3)
+            for name in ("rx", "ry")
+        ],
+        directives={},
+    )
+    interface = compile_to_backend(model, "analog")
+    interface.propagator_cache = PropagatorCache()
+    values = {"x": np.array([1.2])}
+    native = EmulatorConfig(engine="native", with_modulation=False)
+    cached = EmulatorConfig(engine="native", with_modulation=False, cache_propagators=True)
+
+    reference = interface.run(values, emulator_config=native)
+    # the plateaus are cached from their second occurrence, within the first run
+    first = interface.run(values, emulator_config=cached)
+    num_cached = len(interface.propagator_cache)
+    assert num_cached > 0
+    second = interface.run(values, emulator_config=cached)
+    assert len(interface.propagator_cache) == num_cached
+    for state in (first, second):
+        assert np.allclose(state.full(), reference.full())
+
+    interface.propagator_cache.clear()
+    assert len(interface.propagator_cache) == 0
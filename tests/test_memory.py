@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import torch
+from pulser.noise_model import NoiseModel
+from qadence2_expressions import Z
+
+from qadence2_platforms.abstracts import RunEnum
+from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+from qadence2_platforms.backends.fresnel1.interface import Interface as Fresnel1Interface
+from qadence2_platforms.backends.pyqtorch.interface import Interface as PyQInterface
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.executor import ThreadPoolRunner
+from qadence2_platforms.instrumentation import instrument
+from qadence2_platforms.utils.memory import MemoryEstimate, MemoryTracker
+from qadence2_platforms.utils.model_generator import hea
+
+
+def test_memory_estimate() -> None:
+    estimate = MemoryEstimate(state=16, num_states=10, operators=40, observables=20, workspace=8)
+    assert estimate.trajectory == 160
+    assert estimate.total == 228
+    assert estimate.as_dict()["total"] == 228
+    assert estimate.fits(available=300)
+    assert not estimate.fits(available=250)
+    assert estimate.fits(available=250, margin=1.0)
+
+
+def test_pyq_memory_estimate(pyq_interface1: PyQInterface) -> None:
+    values = {"x": torch.rand(5)}
+    run = pyq_interface1.memory_estimate(values)
+    assert run.state == 4 * 5 * 16
+    assert run.observables == 0
+
+    grad = pyq_interface1.memory_estimate({"x": torch.rand(5, requires_grad=True)})
+    assert grad.num_states == run.num_states + len(pyq_interface1.circuit.operations)
+
+    expectation = pyq_interface1.memory_estimate(
+        values, run_type=RunEnum.EXPECTATION, observable=[Z(0), Z(1)]
+    )
+    assert expectation.observables == 3 * run.state
+
+    sample = pyq_interface1.memory_estimate(values, run_type=RunEnum.SAMPLE, shots=100)
+    assert sample.workspace > 0
+
+
+def test_fresnel1_memory_estimate(fresnel1_interface1: Fresnel1Interface) -> None:
+    values = {"x": 1.0}
+    final = fresnel1_interface1.memory_estimate(values)
+    assert final.state == 4 * 16
+    assert final.num_states == 3
+
+    config = EmulatorConfig(evaluation_times="Full")
+    full = fresnel1_interface1.memory_estimate(values, emulator_config=config)
+    simulation = fresnel1_interface1._build_emulator(values, config)
+    assert abs(full.num_states - 1 - len(simulation.evaluation_times)) <= 1
+
+    noisy = fresnel1_interface1.memory_estimate(
+        values,
+        emulator_config=EmulatorConfig(noise=NoiseModel(dephasing_rate=0.1)),
+    )
+    assert noisy.state == 4 * final.state
+
+
+def test_memory_tracker(fresnel1_interface1: Fresnel1Interface) -> None:
+    values = {"x": 1.0}
+    with instrument(MemoryTracker()) as (tracker,):
+        fresnel1_interface1.run(values)
+        fresnel1_interface1.run(values, emulator_config=EmulatorConfig(evaluation_times="Full"))
+
+    final, full = tracker.records
+    assert final.name == full.name == "interface.run"
+    assert final.attributes["num_qubits"] == 2
+    assert 0 < final.peak < full.peak
+    assert full.max_rss > 0
+
+
+def test_memory_tracker_torch() -> None:
+    model = hea(12, 1, seed=0, entangle=False)
+    interface = compile_to_backend(model, "pyqtorch")
+    values = {name: torch.rand(64) for name in model.inputs}
+    state_size = 2**12 * 64 * 16
+
+    with instrument(MemoryTracker()) as (tracker,):
+        for _ in range(2):
+            interface.run(values=values)
+
+    assert len(tracker.records) == 2
+    for record in tracker.records:
+        # the states are torch tensors, which `tracemalloc` does not see
+        assert record.peak < state_size <= record.sampled_peak
+        assert record.device_peak == 0
+
+
+def test_memory_tracker_concurrent(fresnel1_interface1: Fresnel1Interface) -> None:
+    values = [{"x": x} for x in (0.7, 0.8, 0.9, 1.0, 1.1, 1.2)]
+    with instrument(MemoryTracker()) as (tracker,):
+        with ThreadPoolRunner(num_workers=3) as runner:
+            runner.map(fresnel1_interface1, RunEnum.RUN, values)
+
+    assert len(tracker.records) == len(values)
+    # the tracing lasts until the last call ends
+    assert all(record.peak > 0 for record in tracker.records)
+    assert not tracemalloc.is_tracing()
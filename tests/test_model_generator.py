@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+import qutip
+import torch
+from qadence2_ir.types import Assign, QuInstruct
+
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import (
+    feature_map,
+    hea,
+    local_shift_schedule,
+    piecewise_schedule,
+    random_inputs,
+)
+
+
+def test_generator_seeding() -> None:
+    assert repr(hea(3, 4, seed=1)) == repr(hea(3, 4, seed=1))
+    assert repr(hea(3, 4, seed=1)) != repr(hea(3, 4, seed=2))
+    assert repr(local_shift_schedule(4, 3, seed=1)) == repr(local_shift_schedule(4, 3, seed=1))
+
+    model = feature_map(3, 2, depth=2, chain_length=4, seed=1)
+    assert random_inputs(model, seed=0) == random_inputs(model, seed=0)
+
+
+def test_generator_scale() -> None:
+    model = feature_map(20, 5, depth=10, chain_length=8, seed=0)
+    assigns = [instr for instr in model.instructions if isinstance(instr, Assign)]
+    gates = [instr for instr in model.instructions if isinstance(instr, QuInstruct)]
+    assert len(model.inputs) == 5
+    assert len(assigns) == 20 * 10 * 8
+    assert len(gates) == 10 * (20 + 19)
+
+    model = hea(50, 40, seed=0)
+    assert len(model.instructions) == 40 * (50 + 49)
+    assert all(alloc.is_trainable for alloc in model.inputs.values())
+
+
+def test_generated_digital_models() -> None:
+    for model in (hea(3, 2, seed=0), feature_map(3, 2, depth=2, chain_length=5, seed=0)):
+        values = random_inputs(model, seed=0, include_trainable=True)
+        interface = compile_to_backend(model, "pyqtorch")
+        state = interface.run({k: torch.tensor([v]) for k, v in values.items()})
+        assert state.shape == torch.Size([2, 2, 2, 1])
+
+
+@pytest.mark.parametrize("backend", ["fresnel1", "analog"])
+def test_generated_analog_models(backend: str) -> None:
+    models = [feature_map(2, 2, depth=2, chain_length=5, seed=0, analog=True)]
+    if backend == "fresnel1":
+        models.append(local_shift_schedule(2, 2, seed=0))
+    else:
+        models.append(piecewise_schedule(2, 3, num_pulses=2, seed=0))
+
+    for model in models:
+        interface = compile_to_backend(model, backend)
+        state = interface.run(random_inputs(model, seed=0))
+        assert isinstance(state, qutip.Qobj)
+        assert state.shape == (4, 1)
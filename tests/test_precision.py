@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pytest
+import torch
+from qadence2_expressions import Z
+
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.utils.model_generator import feature_map, hea, random_inputs
+
+ATOL = 1e-5
+
+
+def test_single_precision_dtypes() -> None:
+    model = hea(3, 2, seed=0)
+    interface = compile_to_backend(model, "pyqtorch", precision="single")
+
+    assert interface.init_state.dtype == torch.complex64
+    assert all(p.dtype == torch.float32 for p in interface.vparams.values())
+    assert all(p.dtype == torch.float32 for p in interface.embedding.param_buffer.vparams.values())
+
+    values = {k: torch.rand(4, dtype=torch.float64) for k in model.inputs}
+    assert interface.run(values).dtype == torch.complex64
+    assert interface.expectation(values, observable=Z(0)).dtype == torch.float32
+
+    with pytest.raises(ValueError):
+        compile_to_backend(model, "pyqtorch", precision="half")
+
+
+def test_single_precision_accuracy() -> None:
+    model = feature_map(4, 3, depth=3, chain_length=6, seed=1)
+    double = compile_to_backend(model, "pyqtorch")
+    single = compile_to_backend(model, "pyqtorch", precision="single")
+
+    inputs = [random_inputs(model, seed=s) for s in range(5)]
+    values = {k: torch.tensor([vals[k] for vals in inputs]) for k in model.inputs}
+    obs = [Z(0) * Z(1), Z(2) * Z(3)]
+
+    state_double = double.run(values)
+    state_single = single.run(values)
+    assert torch.allclose(state_single.to(torch.complex128), state_double, atol=ATOL)
+
+    exp_double = double.expectation(values, observable=obs)
+    exp_single = single.expectation(values, observable=obs)
+    assert torch.allclose(exp_single.double(), exp_double, atol=ATOL)
+
+    grads = []
+    for interface, dtype in ((double, torch.float64), (single, torch.float32)):
+        x = values["x_0"].to(dtype).requires_grad_()
+        exp = interface.expectation({**values, "x_0": x}, observable=obs)
+        grads.append(torch.autograd.grad(exp.sum(), x)[0])
+    assert torch.allclose(grads[1].double(), grads[0], atol=1e-4)
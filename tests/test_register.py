@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pulser import AnalogDevice, Register
+
+from qadence2_platforms.backends._base_analog.register import RegisterTransform
+from qadence2_platforms.backends.analog.device_settings import AnalogSettings
+
+
+@pytest.mark.parametrize("grid", ["linear", "triangular", "square"])
+def test_batched_transform(grid: str) -> None:
+    rng = np.random.default_rng(0)
+    positions = rng.integers(-3, 4, size=(16, 5, 2))
+    if grid == "linear":
+        positions[..., 1] = 0
+
+    coords = RegisterTransform.transform(positions, grid, grid_scale=2.0)
+    assert coords.shape == positions.shape
+    for register, expected in zip(positions, coords):
+        transform = RegisterTransform(AnalogSettings, grid, 2.0, coords=register.tolist())
+        assert np.allclose(transform.coords, expected)
+
+
+def test_linear_transform() -> None:
+    transform = RegisterTransform(AnalogSettings, "linear", num_qubits=3)
+    assert np.allclose(transform.coords, [(-5, 0), (0, 0), (5, 0)])
+
+    coords = RegisterTransform.transform([[0, 1, 2], [0, 2, 4]], "linear")
+    assert np.allclose(coords[1], [(0, 0), (10, 0), (20, 0)])
+
+    with pytest.raises(ValueError):
+        RegisterTransform.transform([[(0, 0), (0, 1)]], "linear")
+    with pytest.raises(ValueError):
+        RegisterTransform.transform([[(0, 0), (0, 1)]], "hexagonal")  # type: ignore
+
+
+def test_check_min_distance() -> None:
+    rng = np.random.default_rng(0)
+    positions = rng.integers(-2, 3, size=(64, 4, 2))
+    coords = RegisterTransform.transform(positions, "square", grid_scale=1.0)
+
+    distances = RegisterTransform.min_distances(coords)
+    valid = RegisterTransform.check_min_distance(coords, AnalogDevice)
+    for register, distance, is_valid in zip(coords, distances, valid):
+        pairs = register[:, np.newaxis] - register[np.newaxis]
+        expected = np.sqrt((pairs**2).sum(-1))[np.triu_indices(len(register), k=1)].min()
+        assert np.isclose(distance, expected)
+        try:
+            AnalogDevice.validate_register(Register.from_coordinates(register))
+        except ValueError:
+            assert not is_valid
+        else:
+            assert is_valid
+    assert valid.any() and not valid.all()
+
+
+@pytest.mark.parametrize("grid_index", [False, True])
+def test_validate_registers(grid_index: bool) -> None:
+    rng = np.random.default_rng(0)
+    coords = RegisterTransform.transform(rng.integers(-5, 6, size=(64, 12, 2)), "square")
+    # registers of fewer atoms are padded
+    coords[:8, 8:] = np.nan
+    coords[8:16] *= 1.4
+
+    validation = AnalogSettings.validate_registers(coords, grid_index=grid_index)
+    assert validation.num_atoms[:8].tolist() == [8] * 8
+    for index, register in enumerate(coords):
+        register = register[~np.isnan(register).any(-1)]
+        try:
+            AnalogDevice.validate_register(Register.from_coordinates(register))
+        except ValueError:
+            assert not validation.valid[index] and validation.violations(index)
+        else:
+            assert validation.valid[index] and not validation.violations(index)
+
+        if not validation.min_distance[index]:
+            first, second = validation.closest_pairs[index]
+            distance = np.linalg.norm(register[first] - register[second])
+            assert np.isclose(distance, validation.closest_distances[index])
+    assert validation.valid.any() and not validation.min_distance.all()
+    assert not validation.radial_distance.all()
+
+    too_many = np.stack([np.arange(81) % 9, np.arange(81) // 9], axis=-1) * 6.0
+    validation = AnalogSettings.validate_registers(too_many[np.newaxis], grid_index=grid_index)
+    assert not validation.atom_number[0] and validation.min_distance[0]
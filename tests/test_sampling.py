@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import torch
+from pulser.noise_model import NoiseModel
+from qadence2_ir.types import Alloc, AllocQubits, Assign, Call, Load, Model, QuInstruct, Support
+
+from qadence2_platforms.backends._base_analog.emulator import EmulatorConfig
+from qadence2_platforms.backends.fresnel1.interface import Interface as Fresnel1Interface
+from qadence2_platforms.compiler import compile_to_backend
+from qadence2_platforms.instrumentation import MemorySink, instrument
+from qadence2_platforms.utils.sampling import DistributionCache, StreamingSampler, parameters_key
+
+
+def test_streaming_sampler() -> None:
+    probabilities = np.array([0.5, 0.25, 0.25, 0.0])
+    sampler = StreamingSampler(probabilities, seed=0)
+    assert sampler.outcomes == ["00", "01", "10", "11"]
+
+    chunks = list(sampler.stream(10_500, chunk_size=1000))
+    assert len(chunks) == 11
+    assert chunks[-1].sum() == 500
+    assert sampler.num_shots == 10_500
+    assert np.array_equal(sampler.counts, sum(chunks))
+    assert sampler.counts[0, 3] == 0
+    assert np.allclose(sampler.counts[0] / sampler.num_shots, probabilities, atol=0.02)
+
+    (counter,) = sampler.counters()
+    assert set(counter) == {"00", "01", "10"}
+    assert sum(counter.values()) == 10_500
+
+    sampler.reset()
+    counts = sampler.sample(10**9, chunk_size=10**4, precision=0.01)
+    assert sampler.num_shots < 10**9
+    assert sampler.standard_error <= 0.01
+    assert counts.sum() == sampler.num_shots
+
+    with pytest.raises(ValueError):
+        StreamingSampler(probabilities, outcomes=["0", "1"])
+
+
+def test_draw_and_spawn() -> None:
+    probabilities = np.array([[0.5, 0.25, 0.25, 0.0], [0.0, 0.0, 0.0, 1.0]])
+    sampler = StreamingSampler(probabilities, seed=0)
+
+    shots = sampler.draw(100_000)
+    assert shots.shape == (2, 100_000)
+    assert sampler.num_shots == 0
+    assert np.allclose(np.bincount(shots[0], minlength=4) / 100_000, probabilities[0], atol=0.01)
+    assert np.all(shots[1] == 3)
+
+    sampler.sample(10)
+    child = sampler.spawn(seed=1)
+    assert child.num_shots == 0 and not child.counts.any()
+    assert child.cumulative is sampler.cumulative
+    assert np.array_equal(child.draw(10), sampler.spawn(seed=1).draw(10))
+
+
+def test_distribution_cache() -> None:
+    values = {"x": torch.tensor([0.1, 0.2]), "y": 1.0}
+    key = parameters_key(values)
+    assert key == parameters_key(dict(reversed(values.items())))
+    assert key != parameters_key({**values, "y": 2.0})
+    assert key != parameters_key({**values, "x": torch.tensor([0.1, 0.3])})
+    assert key != parameters_key(values, "single")
+
+    cache = DistributionCache(maxsize=2)
+    samplers = [StreamingSampler([1.0, 0.0]) for _ in range(3)]
+    for i, sampler in enumerate(samplers):
+        cache.put(str(i), sampler)
+    assert len(cache) == 2
+    assert cache.get("0") is None and cache.get("2") is samplers[2]
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_pyq_sampler(model1: Model) -> None:
+    interface = compile_to_backend(model1, "pyqtorch")
+    values = {"x": torch.tensor([0.2, 0.8])}
+    sampler = interface.sampler(values, seed=1)
+
+    probabilities = interface.run(values).abs().pow(2).reshape(4, 2).T
+    assert np.allclose(sampler.probabilities, probabilities.numpy())
+
+    sampler.sample(10**7, chunk_size=10**6)
+    estimates = sampler.counts / sampler.num_shots
+    assert np.allclose(estimates, probabilities.numpy(), atol=1e-3)
+    assert len(sampler.counters()) == 2
+
+
+def test_fresnel1_sampler(fresnel1_interface1: Fresnel1Interface) -> None:
+    sampler = fresnel1_interface1.sampler({"x": 1.0}, seed=0)
+    (counter,) = sampler.counters()
+    assert not counter
+
+    sampler.sample(100_000, chunk_size=10_000)
+    (counter,) = sampler.counters()
+    reference = fresnel1_interface1.sample({"x": 1.0}, shots=100_000)
+    for bitstring, count in reference.items():
+        assert abs(counter[bitstring] - count) / 100_000 < 0.02
+
+    noise = NoiseModel(p_false_pos=0.01, p_false_neg=0.01, runs=1, samples_per_run=1)
+    with pytest.raises(NotImplementedError):
+        fresnel1_interface1.sampler({"x": 1.0}, emulator_config=EmulatorConfig(noise=noise))
+
+
+def test_cached_sampling(model1: Model, fresnel1_interface1: Fresnel1Interface) -> None:
+    pyq_interface = compile_to_backend(model1, "pyqtorch")
+    values = {"x": torch.tensor([0.2, 0.8])}
+    with instrument(MemorySink()) as (sink,):
+        first = pyq_interface.sample(values, shots=1000, seed=0)
+        assert pyq_interface.sample(values, shots=1000, seed=0) == first
+        pyq_interface.sampler(values).draw(1000)
+        pyq_interface.sample({"x": torch.tensor([0.3, 0.8])}, shots=1000)
+        fresnel1_interface1.sample({"x": 1.0}, shots=1000)
+        fresnel1_interface1.sampler({"x": 1.0}).sample(1000)
+
+    summary = sink.summary()
+    assert summary["circuit.run"]["count"] == 2
+    assert summary["emulator.solve"]["count"] == 1
+    assert len(pyq_interface.distribution_cache) == 2
+    assert sum(first[0].values()) == 1000
+
+
+def test_cache_key_trainable_parameters() -> None:
+    model = Model(
+        register=AllocQubits(num_qubits=1),
+        inputs={"x": Alloc(size=1, trainable=False), "theta": Alloc(size=1, trainable=True)},
+        instructions=[
+            Assign("%0", Call("mul", Load("theta"), Load("x"))),
+            QuInstruct("rx", Support(target=(0,)), Load("%0")),
+        ],
+        directives={"digital": True},
+    )
+    interface = compile_to_backend(model, "pyqtorch")
+    values = {"x": torch.tensor([1.0])}
+    theta = interface.embedding.param_buffer.vparams["theta"]
+    with torch.no_grad():
+        theta.fill_(0.5)
+    first = interface.sampler(values).probabilities
+    with torch.no_grad():
+        theta.fill_(1.5)
+    second = interface.sampler(values).probabilities
+
+    expected = interface.run(values).abs().pow(2).reshape(2, 1).T
+    assert np.allclose(second, expected.detach().numpy())
+    assert not np.allclose(first, second)
+    assert len(interface.distribution_cache) == 2
+
+
+def test_stochastic_noise_not_cached(fresnel1_interface1: Fresnel1Interface) -> None:
+    noise = NoiseModel(temperature=50.0, runs=2, samples_per_run=1)
+    config = EmulatorConfig(noise=noise)
+    assert config.stochastic
+    assert not EmulatorConfig(noise=NoiseModel(dephasing_rate=0.1)).stochastic
+
+    with instrument(MemorySink()) as (sink,):
+        fresnel1_interface1.sample({"x": 1.0}, shots=100, emulator_config=config)
+        fresnel1_interface1.sampler({"x": 1.0}, emulator_config=config).sample(100)
+
+    assert sink.summary()["emulator.solve"]["count"] == 2
+    assert len(fresnel1_interface1.distribution_cache) == 0